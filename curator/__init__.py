@@ -4,7 +4,9 @@ from .validators import *
 from .logtools import *
 from .utils import *
 from .indexlist import IndexList
-from .snapshotlist import SnapshotList
+from .snapshotlist import SnapshotList, snapshot_lists
+from .session import Session
+from .cache import IndexCache, SnapshotCatalog
 from .actions import *
 from .cli import *
 from .repomgrcli import *
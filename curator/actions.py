@@ -1,11 +1,21 @@
 from .exceptions import *
+from .defaults import settings
 from .utils import *
+import elasticsearch
+import fnmatch
 import logging
+import random
 import time
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
+try:
+    from queue import Empty, Queue
+except ImportError:
+    from Queue import Empty, Queue
 
 class Alias(object):
-    def __init__(self, name=None, extra_settings={}, **kwargs):
+    def __init__(self, name=None, extra_settings={}, max_actions=1000,
+        **kwargs):
         """
         Define the Alias object.
 
@@ -14,9 +24,15 @@ class Alias(object):
             more information see
             https://www.elastic.co/guide/en/elasticsearch/reference/current/indices-aliases.html
         :type extra_settings: dict, representing the settings.
+        :arg max_actions: The maximum number of `add` and `remove` statements
+            sent in one `update_aliases` request.  Larger updates are split,
+            and are no longer atomic.  Default is 1000.
         """
         if not name:
             raise MissingArgument('No value for "name" provided.')
+        if max_actions < 1:
+            raise ValueError(
+                'Invalid value for "max_actions": {0}.'.format(max_actions))
         #: Instance variable
         #: The strftime parsed version of `name`.
         self.name = parse_date_pattern(name)
@@ -30,8 +46,55 @@ class Alias(object):
         #: Instance variable.
         #: Any extra things to add to the alias, like filters, or routing.
         self.extra_settings = extra_settings
+        #: Instance variable.
+        #: The current settings of `name` on each index which has it, fetched
+        #: on first use by :mod:`curator.actions.Alias.members`
+        self.current = None
+        #: Instance variable.
+        #: The number of `add` or `remove` statements skipped because the
+        #: alias was already in the requested state.
+        self.unchanged = 0
+        #: Instance variable.
+        #: Internally accessible copy of `max_actions`
+        self.max_actions = max_actions
         self.loggit  = logging.getLogger('curator.actions.alias')
 
+    def members(self):
+        """
+        Return a dictionary of the indices which have alias `name`, with the
+        settings of the alias on each.  Only this alias is fetched, and only
+        once.
+        """
+        if self.current is None:
+            try:
+                response = self.client.indices.get_alias(name=self.name)
+            except elasticsearch.exceptions.NotFoundError:
+                response = {}
+            self.current = dict(
+                (index, response[index]['aliases'][self.name])
+                for index in response
+            )
+            self.loggit.debug(
+                'Alias {0} is on {1} indices'.format(
+                    self.name, len(self.current))
+            )
+        return self.current
+
+    def _settings(self):
+        """
+        Return `extra_settings` as the alias settings Elasticsearch reports.
+        """
+        wanted = {}
+        for key, value in self.extra_settings.items():
+            if key == 'routing':
+                wanted['index_routing'] = str(value)
+                wanted['search_routing'] = str(value)
+            elif key in ['index_routing', 'search_routing']:
+                wanted[key] = str(value)
+            else:
+                wanted[key] = value
+        return wanted
+
     def add(self, ilo, warn_if_no_indices=False):
         """
         Create `add` statements for each index in `ilo` for `alias`, then
@@ -56,7 +119,14 @@ class Alias(object):
             else:
                 # Re-raise the NoIndices so it will behave as before
                 raise NoIndices
+        current = self.members()
+        wanted = self._settings()
         for index in ilo.working_list():
+            if index in current and current[index] == wanted:
+                self.loggit.debug(
+                    'Index {0} already has alias {1}'.format(index, self.name))
+                self.unchanged += 1
+                continue
             self.loggit.debug(
                 'Adding index {0} to alias {1} with extra settings '
                 '{2}'.format(index, self.name, self.extra_settings)
@@ -88,24 +158,23 @@ class Alias(object):
             else:
                 # Re-raise the NoIndices so it will behave as before
                 raise NoIndices
-        aliases = self.client.indices.get_alias()
+        # Only fetch this alias, not every alias in the cluster
+        current = self.members()
         for index in ilo.working_list():
-            if index in aliases:
+            # Only remove if the index is associated with the alias
+            if index in current:
                 self.loggit.debug(
-                    'Index {0} in get_aliases output'.format(index))
-                # Only remove if the index is associated with the alias
-                if self.name in aliases[index]['aliases']:
-                    self.loggit.debug(
-                        'Removing index {0} from alias '
-                        '{1}'.format(index, self.name)
-                    )
-                    self.actions.append(
-                        { 'remove' : { 'index' : index, 'alias': self.name } })
-                else:
-                    self.loggit.debug(
-                        'Can not remove: Index {0} is not associated with alias'
-                        ' {1}'.format(index, self.name)
-                    )
+                    'Removing index {0} from alias '
+                    '{1}'.format(index, self.name)
+                )
+                self.actions.append(
+                    { 'remove' : { 'index' : index, 'alias': self.name } })
+            else:
+                self.loggit.debug(
+                    'Can not remove: Index {0} is not associated with alias'
+                    ' {1}'.format(index, self.name)
+                )
+                self.unchanged += 1
 
     def body(self):
         """
@@ -123,6 +192,10 @@ class Alias(object):
         Log what the output would be, but take no action.
         """
         self.loggit.info('DRY-RUN MODE.  No changes will be made.')
+        if not self.actions and self.unchanged:
+            self.loggit.info(
+                'DRY-RUN: alias: "{0}" is already up to date'.format(self.name))
+            return
         for item in self.body()['actions']:
             job = list(item.keys())[0]
             index = item[job]['index']
@@ -143,16 +216,58 @@ class Alias(object):
         """
         Run the API call `update_aliases` with the results of `body()`
         """
+        if not self.actions and self.unchanged:
+            self.loggit.info(
+                'Alias {0} is already up to date'.format(self.name))
+            return
         self.loggit.info('Updating aliases...')
         self.loggit.info('Alias actions: {0}'.format(self.body()))
+        # Requests which succeeded, in case a later one fails
+        applied = []
+        def update_aliases(actions):
+            with master_request(self.client):
+                self.client.indices.update_aliases(body={'actions': actions})
+            applied.append(actions)
         try:
-            self.client.indices.update_aliases(body=self.body())
+            if len(self.actions) <= self.max_actions:
+                update_aliases(self.actions)
+                return
+            self.loggit.warn(
+                '{0} alias actions will be sent in requests of {1}, so the '
+                'update is not atomic.  Indices are added to {2} before any '
+                'are removed.'.format(
+                    len(self.actions), self.max_actions, self.name)
+            )
+            for job in ['add', 'remove']:
+                actions = [a for a in self.actions if job in a]
+                if not actions:
+                    continue
+                execute_chunks(
+                    self.client, update_aliases,
+                    [
+                        actions[i:i + self.max_actions]
+                        for i in range(0, len(actions), self.max_actions)
+                    ],
+                    'update aliases of'
+                )
         except Exception as e:
+            if applied:
+                done = [a for actions in applied for a in actions]
+                self.loggit.error(
+                    '{0} of the requests updating alias {1} were applied '
+                    'before the failure, and are not undone.  Added: {2}.  '
+                    'Removed: {3}.'.format(
+                        len(applied), self.name,
+                        [a['add']['index'] for a in done if 'add' in a],
+                        [a['remove']['index'] for a in done if 'remove' in a]
+                    )
+                )
             report_failure(e)
 
 class Allocation(object):
     def __init__(self, ilo, key=None, value=None, allocation_type='require',
-        wait_for_completion=False, timeout=30,
+        wait_for_completion=False, timeout=None, wait_interval=9,
+        max_wait=None, max_relocating_shards=None,
         ):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
@@ -165,7 +280,16 @@ class Allocation(object):
         :arg wait_for_completion: Wait (or not) for the operation
             to complete before returning.  (default: `False`)
         :type wait_for_completion: bool
-        :arg timeout: Number of seconds to `wait_for_completion`
+        :arg timeout: Deprecated.  Use `max_wait` instead.
+        :arg wait_interval: Seconds to wait between completion checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to `wait_for_completion`, or
+            ``-1`` to wait indefinitely.  (default: `30`)
+        :arg max_relocating_shards: If set, move indices in rolling waves,
+            keeping no more than this many of their shards relocating at once.
+            Largest indices are moved first, and smaller ones fill any spare
+            room.  Rolling waves always wait for completion.  (default:
+            `None`)
 
         .. note::
             See:
@@ -194,12 +318,21 @@ class Allocation(object):
         bkey = 'index.routing.allocation.{0}.{1}'.format(allocation_type, key)
         self.body       = { bkey : value }
         #: Instance variable.
+        #: The `allocation_type`, `key` and `value` of the rule, used to check
+        #: where shards are placed during rolling waves
+        self.rule       = (allocation_type, key, value)
+        #: Instance variable.
         #: Internal reference to `wait_for_completion`
         self.wfc        = wait_for_completion
         #: Instance variable.
-        #: How long in seconds to `wait_for_completion` before returning with an
-        #: exception
-        self.timeout    = '{0}s'.format(timeout)
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: `max_wait`, or the deprecated `timeout`
+        self.max_wait = wait_limit(max_wait, timeout)
+        #: Instance variable.
+        #: Internally accessible copy of `max_relocating_shards`
+        self.max_relocating_shards = max_relocating_shards
 
     def do_dry_run(self):
         """
@@ -207,6 +340,195 @@ class Allocation(object):
         """
         show_dry_run(self.index_list, 'allocation', body=self.body)
 
+    def _put_settings(self, indices):
+        def put_settings(l):
+            with master_request(self.client):
+                self.client.indices.put_settings(
+                    index=to_csv(l), body=self.body
+                )
+        execute_chunks(
+            self.client, put_settings, chunk_index_list(indices),
+            'update settings of'
+        )
+
+    def _relocating(self, indices):
+        """
+        Return the number of shards of each of `indices` which are still
+        relocating or initializing.
+        """
+        active = {}
+        for l in chunk_index_list(indices):
+            health = self.client.cluster.health(
+                index=to_csv(l), level='indices')
+            for index in l:
+                info = health['indices'].get(index, {})
+                active[index] = (
+                    info.get('relocating_shards', 0) +
+                    info.get('initializing_shards', 0)
+                )
+        return active
+
+    def _eligible_nodes(self):
+        """
+        Return the ids of the nodes which satisfy the allocation rule in
+        `rule`.
+        """
+        allocation_type, key, value = self.rule
+        patterns = [v.strip() for v in str(value).split(',')]
+        nodes = self.client.nodes.info(
+            filter_path=settings.filter_paths()['node_attributes'])['nodes']
+        fields = {
+            '_name': 'name', '_host': 'host', '_ip': 'ip',
+            '_host_ip': 'ip', '_publish_ip': 'ip',
+        }
+        eligible = set()
+        for node_id, node in nodes.items():
+            if key in fields:
+                attr = node.get(fields[key])
+            else:
+                attr = node.get('attributes', {}).get(key)
+            matches = [
+                attr is not None and fnmatch.fnmatchcase(attr, p)
+                for p in patterns
+            ]
+            if allocation_type == 'require':
+                allowed = all(matches)
+            elif allocation_type == 'include':
+                allowed = any(matches)
+            else:
+                allowed = not any(matches)
+            if allowed:
+                eligible.add(node_id)
+        return eligible
+
+    def _misplaced(self, indices, eligible):
+        """
+        Return the number of shard copies of each of `indices` which are not
+        yet started on one of the `eligible` nodes.  Unassigned copies are
+        not moving, so they are not counted.
+        """
+        misplaced = dict((index, 0) for index in indices)
+        def request(l):
+            return self.client.cluster.state(
+                index=to_csv(l), metric='routing_table',
+                filter_path=settings.filter_paths()['shard_placement']
+            )
+        results = chunk_requests(
+            self.client, request, chunk_index_list(indices))
+        for result in results:
+            routing = result.get('routing_table', {}).get('indices', {})
+            for index in routing:
+                for copies in routing[index]['shards'].values():
+                    for copy in copies:
+                        if copy.get('state') == 'UNASSIGNED':
+                            continue
+                        if copy.get('state') != 'STARTED' or \
+                                not copy.get('node') in eligible:
+                            misplaced[index] += 1
+        return misplaced
+
+    def _settled(self, pending, in_flight, skipped, eligible):
+        """
+        Update `in_flight` with the number of shards each index still has
+        to move.  Return `True` once at least one index has finished, or
+        enough shards have finished for more of `pending` to be moved.
+
+        Shards which are throttled have not started to move yet, so an index
+        is only finished once every copy is started on an `eligible` node,
+        and no shards are relocating or initializing.
+        """
+        indices = list(in_flight)
+        active = self._relocating(indices)
+        misplaced = self._misplaced(indices, eligible)
+        finished = False
+        for index in indices:
+            left = max(active[index], misplaced[index])
+            if left:
+                in_flight[index] = left
+            else:
+                self.loggit.info('Finished relocating {0}'.format(index))
+                del in_flight[index]
+                finished = True
+        return finished or bool(self._next_wave(pending, in_flight, skipped)[0])
+
+    def _next_wave(self, pending, in_flight, skipped):
+        """
+        Return the indices from `pending` which fit in the relocation budget
+        left over by `in_flight`, and the updated `skipped` count.
+
+        Indices are taken in order.  When the next index is too big, smaller
+        ones behind it may still be moved, but only until `skipped` (shards
+        moved ahead of a waiting index) reaches `max_relocating_shards`.  An
+        index bigger than the whole budget is moved on its own.
+        """
+        budget = self.max_relocating_shards - sum(in_flight.values())
+        wave = []
+        waiting = False
+        for index in pending:
+            if waiting and skipped >= self.max_relocating_shards:
+                break
+            cost = self._shard_count(index)
+            fits = cost <= budget or not (in_flight or wave)
+            if fits:
+                wave.append(index)
+                budget -= cost
+                if waiting:
+                    skipped += cost
+                else:
+                    skipped = 0
+            else:
+                waiting = True
+        return wave, skipped
+
+    def _shard_count(self, index):
+        info = self.index_list.index_info[index]
+        return int(info['number_of_shards']) * (
+            1 + int(info['number_of_replicas']))
+
+    def _rolling(self):
+        """
+        Move `index_list.indices` in waves, submitting more indices as soon
+        as earlier ones finish relocating.  `max_wait` is a deadline for all
+        of the waves together.
+        """
+        self.index_list.load_data('metadata', 'stats')
+        info = self.index_list.index_info
+        pending = sorted(
+            self.index_list.indices,
+            key=lambda i: info[i]['size_in_bytes'], reverse=True
+        )
+        total = len(pending)
+        in_flight = {}
+        skipped = 0
+        eligible = self._eligible_nodes()
+        start = time.time()
+        while pending or in_flight:
+            wave, skipped = self._next_wave(pending, in_flight, skipped)
+            if wave:
+                self.loggit.info(
+                    'Relocating {0} ({1} bytes)'.format(
+                        wave, sum([info[i]['size_in_bytes'] for i in wave]))
+                )
+                self._put_settings(wave)
+                for index in wave:
+                    pending.remove(index)
+                    in_flight[index] = self._shard_count(index)
+            remaining = self.max_wait
+            if self.max_wait != -1:
+                remaining = max(self.max_wait - (time.time() - start), 0)
+            wait_for_it(
+                lambda: self._settled(pending, in_flight, skipped, eligible),
+                'shard relocation', wait_interval=self.wait_interval,
+                max_wait=remaining
+            )
+            done = total - len(pending) - len(in_flight)
+            minutes = (time.time() - start) / 60
+            self.loggit.info(
+                '{0} of {1} indices relocated in {2:.1f} minutes.  {3} '
+                'shards in flight.'.format(
+                    done, total, minutes, sum(in_flight.values()))
+            )
+
     def do_action(self):
         """
         Change allocation settings for indices in `index_list.indices` with the
@@ -221,27 +543,25 @@ class Allocation(object):
 
         self.loggit.info('Updating index setting {0}'.format(self.body))
         try:
+            if self.max_relocating_shards:
+                self._rolling()
+                return
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.put_settings(
-                    index=to_csv(l), body=self.body
+            self._put_settings(self.index_list.indices)
+            if self.wfc:
+                self.loggit.debug(
+                    'Waiting for shards to complete relocation for indices: '
+                    '{0}'.format(to_csv(self.index_list.indices))
+                )
+                wait_for_it(
+                    lambda: all([
+                        health_check(
+                            self.client, index=to_csv(l), relocating_shards=0)
+                        for l in index_lists
+                    ]),
+                    'shard relocation', wait_interval=self.wait_interval,
+                    max_wait=self.max_wait
                 )
-                if self.wfc:
-                    logger.debug(
-                        'Waiting for shards to complete relocation for indices:'
-                        ' {0}'.format(to_csv(l))
-                    )
-                    version = get_version(self.client)
-                    if version >= (5,1,0):
-                        self.client.cluster.health(index=to_csv(l),
-                            level='indices', wait_for_no_relocating_shards=True,
-                            timeout=self.timeout,
-                        )
-                    else:
-                        self.client.cluster.health(index=to_csv(l),
-                            level='indices', wait_for_relocating_shards=0,
-                            timeout=self.timeout,
-                        )
         except Exception as e:
             report_failure(e)
 
@@ -283,30 +603,36 @@ class Close(object):
             'Closing selected indices: {0}'.format(self.index_list.indices))
         try:
             index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
+            def close(l):
                 if self.delete_aliases:
                     self.loggit.info(
                         'Deleting aliases from indices before closing.')
                     self.loggit.debug('Deleting aliases from: {0}'.format(l))
                     try:
-                        self.client.indices.delete_alias(
-                            index=to_csv(l), name='_all')
+                        with master_request(self.client):
+                            self.client.indices.delete_alias(
+                                index=to_csv(l), name='_all')
                     except Exception as e:
                         self.loggit.warn(
                             'Some indices may not have had aliases.  Exception:'
                             ' {0}'.format(e)
                         )
+                # Flushes run on the data nodes, so they overlap with the
+                # close of another chunk
                 self.client.indices.flush(
                     index=to_csv(l), ignore_unavailable=True)
-                self.client.indices.close(
-                    index=to_csv(l), ignore_unavailable=True)
+                with master_request(self.client):
+                    self.client.indices.close(
+                        index=to_csv(l), ignore_unavailable=True)
+            execute_chunks(self.client, close, index_lists, 'close')
         except Exception as e:
             report_failure(e)
 
 class ClusterRouting(object):
     def __init__(
         self, client, routing_type=None, setting=None, value=None,
-        wait_for_completion=False, timeout=30,
+        wait_for_completion=False, timeout=None, wait_interval=9,
+        max_wait=None,
     ):
         """
         For now, the cluster routing settings are hardcoded to be ``transient``
@@ -324,7 +650,11 @@ class ClusterRouting(object):
         :arg wait_for_completion: Wait (or not) for the operation
             to complete before returning.  (default: `False`)
         :type wait_for_completion: bool
-        :arg timeout: Number of seconds to `wait_for_completion`
+        :arg timeout: Deprecated.  Use `max_wait` instead.
+        :arg wait_interval: Seconds to wait between completion checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to `wait_for_completion`, or
+            ``-1`` to wait indefinitely.  (default: `30`)
         """
         verify_client_object(client)
         #: Instance variable.
@@ -335,9 +665,11 @@ class ClusterRouting(object):
         #: Internal reference to `wait_for_completion`
         self.wfc     = wait_for_completion
         #: Instance variable.
-        #: How long in seconds to `wait_for_completion` before returning with an
-        #: exception
-        self.timeout = '{0}s'.format(timeout)
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: `max_wait`, or the deprecated `timeout`
+        self.max_wait = wait_limit(max_wait, timeout)
 
         if setting != 'enable':
             raise ValueError(
@@ -380,12 +712,13 @@ class ClusterRouting(object):
         try:
             self.client.cluster.put_settings(body=self.body)
             if self.wfc:
-                logger.debug(
+                self.loggit.debug(
                     'Waiting for shards to complete routing and/or rebalancing'
                 )
-                self.client.cluster.health(
-                    level='indices', wait_for_relocating_shards=0,
-                    timeout=self.timeout,
+                wait_for_it(
+                    lambda: health_check(self.client, relocating_shards=0),
+                    'shard routing and rebalancing',
+                    wait_interval=self.wait_interval, max_wait=self.max_wait
                 )
         except Exception as e:
             report_failure(e)
@@ -460,6 +793,9 @@ class DeleteIndices(object):
         #: Instance variable.
         #: String value of `master_timeout` + 's', for seconds.
         self.master_timeout = str(master_timeout) + 's'
+        #: Instance variable.
+        #: The indices which `do_action` has confirmed are deleted.
+        self.deleted        = []
         self.loggit         = logging.getLogger('curator.actions.delete_indices')
         self.loggit.debug('master_timeout value: {0}'.format(
             self.master_timeout))
@@ -485,27 +821,31 @@ class DeleteIndices(object):
             )
             return True
 
-    def __chunk_loop(self, chunk_list):
-        """
-        Loop through deletes 3 times to ensure they complete
-        :arg chunk_list: A list of indices pre-chunked so it won't overload the
-            URL size limit.
+    def _remaining(self, indices):
         """
-        working_list = chunk_list
-        for count in range(1, 4): # Try 3 times
-            for i in working_list:
-                self.loggit.info("---deleting index {0}".format(i))
-            self.client.indices.delete(
-                index=to_csv(working_list), master_timeout=self.master_timeout)
-            result = [ i for i in working_list if i in get_indices(self.client)]
-            if self._verify_result(result, count):
-                return
-            else:
-                working_list = result
-        self.loggit.error(
-            'Unable to delete the following indices after 3 attempts: '
-            '{0}'.format(result)
+        Return those of `indices` which still exist.  Only the named indices
+        are looked up, and the response is trimmed to their state, so the cost
+        depends on the number of indices checked rather than the cluster size.
+
+        :arg indices: A list of indices which have been deleted
+        :rtype: list
+        """
+        index_lists = chunk_index_list(indices)
+        responses = chunk_requests(
+            self.client,
+            lambda l: self.client.cluster.state(
+                index=to_csv(l), metric='metadata',
+                filter_path=settings.filter_paths()['index_state'],
+                ignore_unavailable=True, expand_wildcards='open,closed'
+            ),
+            index_lists
         )
+        remaining = []
+        for l, response in zip(index_lists, responses):
+            # With filter_path, the response is empty if no indices matched
+            found = response.get('metadata', {}).get('indices', {})
+            remaining.extend([i for i in l if i in found])
+        return remaining
 
     def do_dry_run(self):
         """
@@ -516,27 +856,88 @@ class DeleteIndices(object):
     def do_action(self):
         """
         Delete indices in `index_list.indices`
+
+        The deletes are sent with :mod:`curator.utils.execute_chunks`, but
+        without its retries.  A delete which fails may still have gone
+        through, so after every chunk has been tried, the indices which still
+        exist are looked up, and only those are deleted again, up to 3
+        attempts in all.
         """
         self.index_list.empty_list_check()
         self.loggit.info(
             'Deleting selected indices: {0}'.format(self.index_list.indices))
         try:
-            index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.__chunk_loop(l)
+            working_list = self.index_list.indices
+            def delete(l):
+                for i in l:
+                    self.loggit.info("---deleting index {0}".format(i))
+                with master_request(self.client):
+                    self.client.indices.delete(
+                        index=to_csv(l), master_timeout=self.master_timeout)
+            for count in range(1, 4):
+                error = None
+                try:
+                    execute_chunks(
+                        self.client, delete, chunk_index_list(working_list),
+                        'delete', retry_count=0
+                    )
+                except FailedExecution as e:
+                    # Failed deletes are found and retried by the check below
+                    error = e
+                result = self._remaining(working_list)
+                remaining = set(result)
+                self.deleted.extend(
+                    [i for i in working_list if i not in remaining])
+                if self._verify_result(result, count):
+                    return
+                else:
+                    working_list = result
+            self.loggit.error(
+                'Unable to delete the following indices after 3 attempts: '
+                '{0}'.format(result)
+            )
+            if error is not None:
+                raise FailedExecution(
+                    'Failed to delete {0} indices after 3 attempts.  '
+                    '{1}'.format(len(result), error)
+                )
         except Exception as e:
             report_failure(e)
 
 class ForceMerge(object):
-    def __init__(self, ilo, max_num_segments=None, delay=0):
+    def __init__(self, ilo, max_num_segments=None, delay=0,
+        max_concurrent_merges=1, max_merges_per_node=1, wait_interval=9,
+        max_wait=-1):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg max_num_segments: Number of segments per shard to forceMerge
-        :arg delay: Number of seconds to delay between forceMerge operations
+        :arg delay: Number of seconds to delay between forceMerge operations.
+            With `max_concurrent_merges`, the delay applies per node: the
+            nodes of a finished merge start no new merge until it has passed.
+        :arg max_concurrent_merges: Number of indices to forceMerge at once.
+            Default is 1, which merges one index at a time.
+        :arg max_merges_per_node: Number of indices with a shard on the same
+            node which may be forceMerged at once.  Only used if
+            `max_concurrent_merges` is greater than 1.
+        :arg wait_interval: If the connection is lost during a forceMerge,
+            seconds to wait between checks of the segment counts.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to check segment counts after
+            a lost connection, or ``-1`` to wait indefinitely
         """
         verify_index_list(ilo)
         if not max_num_segments:
             raise MissingArgument('Missing value for "max_num_segments"')
+        if max_concurrent_merges < 1:
+            raise ValueError(
+                'Invalid value for "max_concurrent_merges": {0}.'.format(
+                    max_concurrent_merges)
+            )
+        if max_merges_per_node < 1:
+            raise ValueError(
+                'Invalid value for "max_merges_per_node": {0}.'.format(
+                    max_merges_per_node)
+            )
         #: Instance variable.
         #: The Elasticsearch Client object derived from `ilo`
         self.client = ilo.client
@@ -549,6 +950,18 @@ class ForceMerge(object):
         #: Instance variable.
         #: Internally accessible copy of `delay`
         self.delay = delay
+        #: Instance variable.
+        #: Internally accessible copy of `max_concurrent_merges`
+        self.max_concurrent_merges = max_concurrent_merges
+        #: Instance variable.
+        #: Internally accessible copy of `max_merges_per_node`
+        self.max_merges_per_node = max_merges_per_node
+        #: Instance variable.
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: Internally accessible copy of `max_wait`
+        self.max_wait = max_wait
         self.loggit = logging.getLogger('curator.actions.forcemerge')
 
     def do_dry_run(self):
@@ -559,7 +972,146 @@ class ForceMerge(object):
             self.index_list, 'forcemerge',
             max_num_segments=self.max_num_segments,
             delay=self.delay,
+            max_concurrent_merges=self.max_concurrent_merges,
+            max_merges_per_node=self.max_merges_per_node,
+        )
+
+    def _merge(self, index_name):
+        """
+        forceMerge a single index, and return how long it took, in seconds.
+        """
+        self.loggit.info(
+            'forceMerging index {0} to {1} segments per shard.  '
+            'Please wait...'.format(index_name, self.max_num_segments)
         )
+        start = time.time()
+        try:
+            if not has_feature(self.client, 'forcemerge'):
+                self.client.indices.optimize(index=index_name,
+                    max_num_segments=self.max_num_segments)
+            else:
+                self.client.indices.forcemerge(index=index_name,
+                    max_num_segments=self.max_num_segments)
+        except elasticsearch.ConnectionError as e:
+            # The merge carries on in the cluster without the connection
+            self.loggit.warn(
+                'Lost connection during forceMerge of index {0}: {1}.  '
+                'Tracking segment counts instead.'.format(index_name, e)
+            )
+            wait_for_it(
+                lambda: segment_check(
+                    self.client, index_name, self.max_num_segments),
+                'forceMerge of index {0}'.format(index_name),
+                wait_interval=self.wait_interval, max_wait=self.max_wait
+            )
+        return time.time() - start
+
+    def _pause(self):
+        if self.delay > 0:
+            self.loggit.info(
+                'Pausing for {0} seconds before continuing...'.format(
+                    self.delay)
+            )
+            time.sleep(self.delay)
+
+    def _schedule(self, indices):
+        """
+        forceMerge `indices` with up to `max_concurrent_merges` in flight, and
+        no more than `max_merges_per_node` on any node holding a shard of the
+        indices being merged.  The next index in the list that fits is started
+        as soon as a merge finishes.  `delay` holds back only the nodes of the
+        finished merge, so merges on other nodes are not delayed.
+        """
+        shard_nodes = get_shard_nodes(self.client, indices)
+        pending = list(indices)
+        running = {}
+        node_merges = {}
+        # When each delayed node may start another merge
+        node_ready = {}
+        finished = Queue()
+        error = None
+        done = 0
+        def merge(index_name):
+            try:
+                finished.put((index_name, self._merge(index_name), None))
+            except Exception as e:
+                finished.put((index_name, None, e))
+        def fits(index_name, now):
+            return all(
+                node_merges.get(node, 0) < self.max_merges_per_node
+                and node_ready.get(node, 0) <= now
+                for node in shard_nodes[index_name]
+            )
+        def next_ready(now):
+            # Seconds until a delayed node of a pending index frees up
+            waits = [
+                node_ready[node] - now
+                for index_name in pending for node in shard_nodes[index_name]
+                if node_ready.get(node, 0) > now
+            ]
+            return min(waits) if waits else None
+        pool = ThreadPool(min(self.max_concurrent_merges, len(indices)))
+        try:
+            while pending or running:
+                while error is None and pending \
+                        and len(running) < self.max_concurrent_merges:
+                    now = time.time()
+                    ready = [i for i in pending if fits(i, now)]
+                    if not ready:
+                        break
+                    index_name = ready[0]
+                    pending.remove(index_name)
+                    for node in shard_nodes[index_name]:
+                        node_merges[node] = node_merges.get(node, 0) + 1
+                    running[index_name] = True
+                    pool.apply_async(merge, (index_name,))
+                wait = None
+                if pending and error is None:
+                    wait = next_ready(time.time())
+                if not running:
+                    if wait is None:
+                        break
+                    time.sleep(wait)
+                    continue
+                try:
+                    index_name, duration, e = finished.get(timeout=wait)
+                except Empty:
+                    continue
+                del running[index_name]
+                for node in shard_nodes[index_name]:
+                    node_merges[node] -= 1
+                if e is not None:
+                    self.loggit.error(
+                        'forceMerge of index {0} failed: {1}'.format(
+                            index_name, e)
+                    )
+                    error = error or e
+                    continue
+                done += 1
+                self.loggit.info(
+                    'forceMerged index {0} in {1:.1f} seconds.  {2} of {3} '
+                    'done, {4} running, {5} queued.'.format(
+                        index_name, duration, done, len(indices),
+                        len(running), len(pending)
+                    )
+                )
+                if pending and self.delay > 0:
+                    self.loggit.info(
+                        'Pausing for {0} seconds before the next forceMerge '
+                        'on the nodes of index {1}...'.format(
+                            self.delay, index_name)
+                    )
+                    for node in shard_nodes[index_name]:
+                        node_ready[node] = time.time() + self.delay
+        finally:
+            pool.terminate()
+        if error is not None:
+            raise error
+        if pending:
+            msg = 'Unable to schedule forceMerge of indices: {0}'.format(
+                pending)
+            self.loggit.error(msg)
+            raise FailedExecution(msg)
 
     def do_action(self):
         """
@@ -570,30 +1122,32 @@ class ForceMerge(object):
             max_num_segments=self.max_num_segments)
         self.loggit.info('forceMerging selected indices')
         try:
-            for index_name in self.index_list.indices:
-                self.loggit.info(
-                    'forceMerging index {0} to {1} segments per shard.  '
-                    'Please wait...'.format(index_name, self.max_num_segments)
-                )
-                if get_version(self.client) < (2, 1, 0):
-                    self.client.indices.optimize(index=index_name,
-                        max_num_segments=self.max_num_segments)
-                else:
-                    self.client.indices.forcemerge(index=index_name,
-                        max_num_segments=self.max_num_segments)
-                if self.delay > 0:
-                    self.loggit.info(
-                        'Pausing for {0} seconds before continuing...'.format(
-                            self.delay)
-                    )
-                    time.sleep(self.delay)
+            indices = self.index_list.indices
+            if self.max_concurrent_merges > 1 and len(indices) > 1:
+                self._schedule(indices)
+                return
+            for index_name in indices:
+                self._merge(index_name)
+                self._pause()
         except Exception as e:
             report_failure(e)
 
 class Open(object):
-    def __init__(self, ilo):
+    def __init__(self, ilo, batch_size=None, max_initializing_shards=0,
+        wait_interval=9, max_wait=-1):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
+        :arg batch_size: Number of indices to open at once.  The next batch is
+            opened once the shards of the previous batch have recovered.  By
+            default, all indices are opened at once.
+        :arg max_initializing_shards: With `batch_size`, the next batch is
+            opened once no more than this number of shards are initializing in
+            the cluster, and every primary shard of the previous batch is
+            active.  Default is 0.
+        :arg wait_interval: Seconds to wait between recovery checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to wait for the recovery of
+            each batch, or ``-1`` to wait indefinitely
         """
         verify_index_list(ilo)
         #: Instance variable.
@@ -602,13 +1156,64 @@ class Open(object):
         #: Instance variable.
         #: Internal reference to `ilo`
         self.index_list = ilo
+        #: Instance variable.
+        #: Internally accessible copy of `batch_size`
+        self.batch_size = batch_size
+        #: Instance variable.
+        #: Internally accessible copy of `max_initializing_shards`
+        self.max_initializing_shards = max_initializing_shards
+        #: Instance variable.
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: Internally accessible copy of `max_wait`
+        self.max_wait = max_wait
         self.loggit     = logging.getLogger('curator.actions.open')
 
     def do_dry_run(self):
         """
         Log what the output would be, but take no action.
         """
-        show_dry_run(self.index_list, 'open')
+        show_dry_run(self.index_list, 'open', batch_size=self.batch_size)
+
+    def _open(self, indices):
+        def open_indices(l):
+            with master_request(self.client):
+                self.client.indices.open(index=to_csv(l))
+        execute_chunks(
+            self.client, open_indices, chunk_index_list(indices), 'open')
+
+    def _shard_count(self, indices):
+        """
+        Return the number of primary and replica shards of `indices`.
+        """
+        count = 0
+        for index in indices:
+            info = self.index_list.index_info[index]
+            count += int(info['number_of_shards']) * (
+                1 + int(info['number_of_replicas']))
+        return count
+
+    def _recovered(self, batch):
+        """
+        Return `True` if every primary shard of `batch` is active, and no more
+        than `max_initializing_shards` are initializing in the cluster.
+        """
+        for l in chunk_index_list(batch):
+            health = self.client.cluster.health(
+                index=to_csv(l), level='cluster')
+            if health['status'] == 'red':
+                self.loggit.debug('Primary shards are still recovering')
+                return False
+        initializing = self.client.cluster.health(
+            level='cluster')['initializing_shards']
+        if initializing > self.max_initializing_shards:
+            self.loggit.debug(
+                '{0} shards are initializing, waiting for {1}'.format(
+                    initializing, self.max_initializing_shards)
+            )
+            return False
+        return True
 
     def do_action(self):
         """
@@ -618,20 +1223,58 @@ class Open(object):
         self.loggit.info(
             'Opening selected indices: {0}'.format(self.index_list.indices))
         try:
-            index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.open(index=to_csv(l))
+            if not self.batch_size:
+                self._open(self.index_list.indices)
+                return
+            self.index_list.load_data('metadata')
+            indices = self.index_list.indices
+            batches = [
+                indices[i:i + self.batch_size]
+                for i in range(0, len(indices), self.batch_size)
+            ]
+            start = time.time()
+            recovered = 0
+            for number, batch in enumerate(batches, 1):
+                self.loggit.info(
+                    'Opening batch {0} of {1}: {2}'.format(
+                        number, len(batches), batch)
+                )
+                self._open(batch)
+                wait_for_it(
+                    lambda: self._recovered(batch),
+                    'recovery of batch {0}'.format(number),
+                    wait_interval=self.wait_interval, max_wait=self.max_wait
+                )
+                recovered += self._shard_count(batch)
+                minutes = (time.time() - start) / 60
+                self.loggit.info(
+                    'Batch {0} of {1} recovered.  {2} shards in {3:.1f} '
+                    'minutes ({4:.1f} shards per minute).'.format(
+                        number, len(batches), recovered, minutes,
+                        recovered / minutes if minutes else float(recovered)
+                    )
+                )
         except Exception as e:
             report_failure(e)
 
 class Replicas(object):
-    def __init__(self, ilo, count=None, wait_for_completion=False, timeout=30):
+    def __init__(self, ilo, count=None, wait_for_completion=False,
+        timeout=None, wait_interval=9, max_wait=None, batch_size=None):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg count: The count of replicas per shard
         :arg wait_for_completion: Wait (or not) for the operation
             to complete before returning.  (default: `False`)
         :type wait_for_completion: bool
+        :arg timeout: Deprecated.  Use `max_wait` instead.
+        :arg wait_interval: Seconds to wait between completion checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to wait for every index to
+            be fully replicated, or ``-1`` to wait indefinitely.  (default:
+            `30`)
+        :arg batch_size: If set, no more than this many indices are waited
+            on at once.  Each index is updated as soon as there is room, and
+            Curator waits for all of them to complete.  (default: `None`)
         """
         verify_index_list(ilo)
         # It's okay for count to be zero
@@ -652,9 +1295,14 @@ class Replicas(object):
         #: Internal reference to `wait_for_completion`
         self.wfc        = wait_for_completion
         #: Instance variable.
-        #: How long in seconds to `wait_for_completion` before returning with an
-        #: exception
-        self.timeout    = '{0}s'.format(timeout)
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: `max_wait`, or the deprecated `timeout`
+        self.max_wait = wait_limit(max_wait, timeout)
+        #: Instance variable.
+        #: Internally accessible copy of `batch_size`
+        self.batch_size = batch_size
         self.loggit     = logging.getLogger('curator.actions.replicas')
 
     def do_dry_run(self):
@@ -663,6 +1311,75 @@ class Replicas(object):
         """
         show_dry_run(self.index_list, 'replicas', count=self.count)
 
+    def _put_settings(self, indices):
+        def put_settings(l):
+            with master_request(self.client):
+                self.client.indices.put_settings(index=to_csv(l),
+                    body={'number_of_replicas' : self.count})
+        execute_chunks(
+            self.client, put_settings, chunk_index_list(indices),
+            'update replicas of'
+        )
+
+    def _lag(self, indices):
+        """
+        Return the number of shard copies of each of `indices` which are not
+        yet active.  Indices which are green are not included.
+        """
+        lag = {}
+        for l in chunk_index_list(indices):
+            health = self.client.cluster.health(
+                index=to_csv(l), level='indices')
+            for index in l:
+                info = health['indices'].get(index)
+                if info is None or info['status'] == 'green':
+                    continue
+                lag[index] = max(
+                    info['number_of_shards'] *
+                    (1 + info['number_of_replicas']) - info['active_shards'],
+                    1
+                )
+        return lag
+
+    def _track(self):
+        """
+        Update the replica count of `index_list.indices`, keeping no more than
+        `batch_size` indices waiting at once, and wait for every index to be
+        green in a single polling loop.
+        """
+        pending = self.index_list.indices[:]
+        waiting = []
+        size = self.batch_size or len(pending)
+        start = time.time()
+        def fill():
+            room = size - len(waiting)
+            if pending and room > 0:
+                self._put_settings(pending[:room])
+                waiting.extend(pending[:room])
+                del pending[:room]
+        def check():
+            lag = self._lag(waiting)
+            for index in [i for i in waiting if i not in lag]:
+                waiting.remove(index)
+            if lag:
+                self.loggit.info(
+                    '{0} indices waiting for replication after {1:.1f} '
+                    'minutes.  Shard copies missing: {2}'.format(
+                        len(lag) + len(pending), (time.time() - start) / 60,
+                        ', '.join([
+                            '{0}: {1}'.format(i, lag[i]) for i in
+                            sorted(lag, key=lag.get, reverse=True)
+                        ])
+                    )
+                )
+            fill()
+            return not (pending or waiting)
+        fill()
+        wait_for_it(
+            check, 'replication', wait_interval=self.wait_interval,
+            max_wait=self.max_wait
+        )
+
     def do_action(self):
         """
         Update the replica count of indices in `index_list.indices`
@@ -678,34 +1395,36 @@ class Replicas(object):
             '{1}'.format(self.count, self.index_list.indices)
         )
         try:
-            index_lists = chunk_index_list(self.index_list.indices)
-            for l in index_lists:
-                self.client.indices.put_settings(index=to_csv(l),
-                    body={'number_of_replicas' : self.count})
-                if self.wfc and self.count > 0:
-                    logger.debug(
-                        'Waiting for shards to complete replication for '
-                        'indices: {0}'.format(to_csv(l))
-                    )
-                    self.client.cluster.health(
-                        index=to_csv(l), wait_for_status='green',
-                        timeout=self.timeout,
-                    )
+            if self.batch_size or (self.wfc and self.count > 0):
+                self.loggit.debug(
+                    'Waiting for shards to complete replication for '
+                    'indices: {0}'.format(to_csv(self.index_list.indices))
+                )
+                self._track()
+            else:
+                self._put_settings(self.index_list.indices)
         except Exception as e:
             report_failure(e)
 
 class DeleteSnapshots(object):
     def __init__(self, slo, retry_interval=120, retry_count=3):
         """
-        :arg slo: A :class:`curator.snapshotlist.SnapshotList` object
-        :arg retry_interval: Number of seconds to delay betwen retries. Default:
-            120 (seconds)
-        :arg retry_count: Number of attempts to make. Default: 3
-        """
-        verify_snapshot_list(slo)
+        :arg slo: A :class:`curator.snapshotlist.SnapshotList` object, or a
+            list of them, one per repository, as returned by
+            :mod:`curator.snapshotlist.snapshot_lists`
+        :arg retry_interval: Maximum number of seconds between checks for a
+            running snapshot. Default: 120 (seconds)
+        :arg retry_count: Number of `retry_interval` periods to wait for a
+            running snapshot to finish. Default: 3
+        """
+        slos = slo if isinstance(slo, list) else [slo]
+        if not slos:
+            raise NoSnapshots('No snapshot lists provided')
+        for each in slos:
+            verify_snapshot_list(each)
         #: Instance variable.
         #: The Elasticsearch Client object derived from `slo`
-        self.client         = slo.client
+        self.client         = slos[0].client
         #: Instance variable.
         #: Internally accessible copy of `retry_interval`
         self.retry_interval = retry_interval
@@ -713,11 +1432,14 @@ class DeleteSnapshots(object):
         #: Internally accessible copy of `retry_count`
         self.retry_count    = retry_count
         #: Instance variable.
-        #: Internal reference to `slo`
-        self.snapshot_list  = slo
+        #: Internal reference to `slo`, or to the first of several
+        self.snapshot_list  = slos[0]
         #: Instance variable.
-        #: The repository name derived from `slo`
-        self.repository     = slo.repository
+        #: All of the snapshot lists, one per repository
+        self.snapshot_lists = slos
+        #: Instance variable.
+        #: The repository name derived from `slo`, or from the first of several
+        self.repository     = slos[0].repository
         self.loggit = logging.getLogger('curator.actions.delete_snapshots')
 
     def do_dry_run(self):
@@ -725,42 +1447,113 @@ class DeleteSnapshots(object):
         Log what the output would be, but take no action.
         """
         logger.info('DRY-RUN MODE.  No changes will be made.')
-        mykwargs = {
-            'repository' : self.repository,
-            'retry_interval' : self.retry_interval,
-            'retry_count' : self.retry_count,
-        }
-        for snap in self.snapshot_list.snapshots:
-            logger.info('DRY-RUN: delete_snapshot: {0} with arguments: '
-                '{1}'.format(snap, mykwargs))
+        for slo in self.snapshot_lists:
+            mykwargs = {
+                'repository' : slo.repository,
+                'retry_interval' : self.retry_interval,
+                'retry_count' : self.retry_count,
+            }
+            for snap in slo.snapshots:
+                logger.info('DRY-RUN: delete_snapshot: {0} with arguments: '
+                    '{1}'.format(snap, mykwargs))
 
     def do_action(self):
         """
         Delete snapshots in `slo`
-        Retry up to `retry_count` times, pausing `retry_interval`
-        seconds between retries.
-        """
-        self.snapshot_list.empty_list_check()
-        self.loggit.info('Deleting selected snapshots')
-        if not safe_to_snap(
-            self.client, repository=self.repository,
-            retry_interval=self.retry_interval, retry_count=self.retry_count):
-                raise FailedExecution(
-                    'Unable to delete snapshot(s) because a snapshot is in '
-                    'state "IN_PROGRESS"')
+        If a snapshot is running, wait for up to `retry_count` times
+        `retry_interval` seconds, and start as soon as it is done.  Each
+        delete is sent as soon as the one before it returns.  With several
+        repositories, they are handled one after another in a single turn of
+        the snapshot queue, as a cluster only runs one snapshot deletion at a
+        time, and one report covers them all.
+        """
+        for slo in self.snapshot_lists:
+            slo.empty_list_check()
+        deletes = [
+            (slo.repository, s)
+            for slo in self.snapshot_lists for s in slo.snapshots
+        ]
+        self.loggit.info(
+            'Deleting {0} selected snapshots from {1} repositories'.format(
+                len(deletes), len(self.snapshot_lists))
+        )
+        done = dict((slo.repository, 0) for slo in self.snapshot_lists)
         try:
-            for s in self.snapshot_list.snapshots:
-                self.loggit.info('Deleting snapshot {0}...'.format(s))
-                self.client.snapshot.delete(
-                    repository=self.repository, snapshot=s)
+            with snapshot_queue(
+                    self.client,
+                    max_wait=self.retry_interval * self.retry_count,
+                    max_interval=self.retry_interval):
+                start = time.time()
+                reported = start
+                for count, (repository, s) in enumerate(deletes, 1):
+                    self.loggit.info(
+                        'Deleting snapshot {0} from repository {1}...'.format(
+                            s, repository)
+                    )
+                    self._delete(repository, s)
+                    done[repository] += 1
+                    if time.time() - reported >= 60 or count == len(deletes):
+                        reported = time.time()
+                        self.loggit.info(
+                            'Deleted {0} of {1} snapshots ({2:.1f} per '
+                            'minute)'.format(
+                                count, len(deletes),
+                                count * 60.0 / max(reported - start, 1)
+                            )
+                        )
+        except ActionTimeout:
+            raise FailedExecution(
+                'Unable to delete snapshot(s) because a snapshot is in '
+                'state "IN_PROGRESS"')
         except Exception as e:
             report_failure(e)
+        finally:
+            if len(done) > 1:
+                self.loggit.info(
+                    'Snapshots deleted per repository: {0}'.format(
+                        ', '.join(
+                            '{0}: {1}'.format(r, done[r]) for r in sorted(done))
+                    )
+                )
+
+    def _delete(self, repository, snapshot):
+        """
+        Delete `snapshot` from `repository`.  If Elasticsearch refuses because
+        another snapshot operation is running, such as a snapshot started by
+        another client since the queue was entered, wait for running snapshots
+        to finish, then retry after a random pause, doubling up to
+        `retry_interval` seconds.
+        Give up after `retry_count` retries.
+        """
+        for count in range(self.retry_count + 1):
+            try:
+                return self.client.snapshot.delete(
+                    repository=repository, snapshot=snapshot)
+            except elasticsearch.TransportError as e:
+                if (count == self.retry_count or
+                        not concurrent_snapshot_error(e)):
+                    raise
+                wait_for_snapshots(
+                    self.client,
+                    max_wait=self.retry_interval * self.retry_count,
+                    max_interval=self.retry_interval
+                )
+                # Jitter keeps competing clients from retrying in step
+                pause = random.uniform(
+                    0.5, 1) * min(2 ** count, self.retry_interval)
+                self.loggit.warn(
+                    'Another snapshot operation is running.  Retrying delete '
+                    'of snapshot {0} in {1:.1f} seconds'.format(
+                        snapshot, pause)
+                )
+                time.sleep(pause)
 
 class Snapshot(object):
     def __init__(self, ilo, repository=None, name=None,
                 ignore_unavailable=False, include_global_state=True,
-                partial=False, wait_for_completion=True,
-                skip_repo_fs_check=False):
+                partial=False, wait_for_completion=True, wait_interval=9,
+                max_wait=-1, skip_repo_fs_check=False, retry_interval=120,
+                retry_count=3):
         """
         :arg ilo: A :class:`curator.indexlist.IndexList` object
         :arg repository: The Elasticsearch snapshot repository to use
@@ -768,6 +1561,12 @@ class Snapshot(object):
         :arg wait_for_completion: Wait (or not) for the operation
             to complete before returning.  (default: `True`)
         :type wait_for_completion: bool
+        :arg wait_interval: Seconds to wait between completion checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to `wait_for_completion`, or
+            ``-1`` to wait indefinitely.  The snapshot is aborted if it
+            takes longer.
+
         :arg ignore_unavailable: Ignore unavailable shards/indices.
             (default: `False`)
         :type ignore_unavailable: bool
@@ -782,6 +1581,10 @@ class Snapshot(object):
             shared filesystems where intermittent timeouts can affect
             validation, but won't likely affect snapshot success.
         :type skip_repo_fs_check: bool
+        :arg retry_interval: Maximum number of seconds between checks for a
+            running snapshot. Default: 120 (seconds)
+        :arg retry_count: Number of `retry_interval` periods to wait for a
+            running snapshot to finish. Default: 3
         """
         verify_index_list(ilo)
         # Check here and don't bother with the rest of this if there are no
@@ -810,8 +1613,20 @@ class Snapshot(object):
         #: Internally accessible copy of `wait_for_completion`
         self.wait_for_completion = wait_for_completion
         #: Instance variable.
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: Internally accessible copy of `max_wait`
+        self.max_wait = max_wait
+        #: Instance variable.
         #: Internally accessible copy of `skip_repo_fs_check`
         self.skip_repo_fs_check  = skip_repo_fs_check
+        #: Instance variable.
+        #: Internally accessible copy of `retry_interval`
+        self.retry_interval      = retry_interval
+        #: Instance variable.
+        #: Internally accessible copy of `retry_count`
+        self.retry_count         = retry_count
         self.state               = None
 
         #: Instance variable.
@@ -871,18 +1686,36 @@ class Snapshot(object):
         """
         if not self.skip_repo_fs_check:
             test_repo_fs(self.client, self.repository)
-        if snapshot_running(self.client):
+        try:
+            with snapshot_queue(
+                    self.client,
+                    max_wait=self.retry_interval * self.retry_count,
+                    max_interval=self.retry_interval):
+                self.loggit.info('Creating snapshot "{0}" from indices: '
+                    '{1}'.format(self.name, self.index_list.indices)
+                )
+                # Poll for completion rather than holding the request open
+                self.client.snapshot.create(
+                    repository=self.repository, snapshot=self.name,
+                    body=self.body, wait_for_completion=False
+                )
+        except ActionTimeout:
             raise SnapshotInProgress('Snapshot already in progress.')
+        except Exception as e:
+            report_failure(e)
         try:
-            self.loggit.info('Creating snapshot "{0}" from indices: '
-                '{1}'.format(self.name, self.index_list.indices)
-            )
-            self.client.snapshot.create(
-                repository=self.repository, snapshot=self.name, body=self.body,
-                wait_for_completion=self.wait_for_completion
-            )
             if self.wait_for_completion:
-                self.report_state()
+                wait_for_it(
+                    lambda: snapshot_check(
+                        self.client, repository=self.repository,
+                        snapshot=self.name
+                    ),
+                    'snapshot {0}'.format(self.name),
+                    wait_interval=self.wait_interval, max_wait=self.max_wait,
+                    cancel=lambda: self.client.snapshot.delete(
+                        repository=self.repository, snapshot=self.name)
+                )
+                self.get_state()
             else:
                 self.loggit.warn(
                     '"wait_for_completion" set to {0}. '
@@ -896,8 +1729,9 @@ class Restore(object):
     def __init__(self, slo, name=None, indices=None, include_aliases=False,
                 ignore_unavailable=False, include_global_state=True,
                 partial=False, rename_pattern=None, rename_replacement=None,
-                extra_settings={}, wait_for_completion=True,
-                skip_repo_fs_check=False):
+                extra_settings={}, wait_for_completion=True, wait_interval=9,
+                max_wait=86400, skip_repo_fs_check=False,
+                newest_per_index=False):
         """
         :arg slo: A :class:`curator.snapshotlist.SnapshotList` object
         :arg name: Name of the snapshot to restore.  If no name is provided, it
@@ -906,6 +1740,11 @@ class Restore(object):
         :arg indices: A list of indices to restore.  If no indices are provided,
             it will restore all indices in the snapshot.
         :type indices: list
+        :arg newest_per_index: Restore each of `indices` from the newest
+            snapshot in `slo` which contains it, rather than restoring every
+            index from one snapshot.  `indices` may contain wildcard patterns.
+            Cannot be used with `name`. (default: `False`)
+        :type newest_per_index: bool
         :arg include_aliases: If set to `True`, restore aliases with the
             indices. (default: `False`)
         :type include_aliases: bool
@@ -932,6 +1771,10 @@ class Restore(object):
         :arg wait_for_completion: Wait (or not) for the operation
             to complete before returning.  (default: `True`)
         :type wait_for_completion: bool
+        :arg wait_interval: Seconds to wait between completion checks.  The
+            interval doubles after each check, up to 60 seconds.
+        :arg max_wait: Maximum number of seconds to `wait_for_completion`, or
+            ``-1`` to wait indefinitely.  (default: `86400`)
         :arg skip_repo_fs_check: Do not validate write access to repository on
             all cluster nodes before proceeding. (default: `False`).  Useful for
             shared filesystems where intermittent timeouts can affect
@@ -940,12 +1783,28 @@ class Restore(object):
         """
         self.loggit = logging.getLogger('curator.actions.snapshot')
         verify_snapshot_list(slo)
-        # Get the most recent snapshot.
-        most_recent = slo.most_recent()
-        self.loggit.debug('"most_recent" snapshot: {0}'.format(most_recent))
-        #: Instance variable.
-        #: Will use a provided snapshot name, or the most recent snapshot in slo
-        self.name = name if name else most_recent
+        if newest_per_index:
+            if name:
+                raise ConfigurationError(
+                    '"name" cannot be used with "newest_per_index"')
+            if not indices:
+                raise MissingArgument(
+                    '"newest_per_index" requires a value for "indices"')
+            #: Instance variable.
+            #: The snapshots to restore from, in order, and the indices to
+            #: restore from each.  **Type:** ``list()`` of tuples
+            self.restores = self._newest_per_index(slo, indices, partial)
+            self.name = self.restores[-1][0]
+        else:
+            # Get the most recent snapshot.
+            most_recent = slo.most_recent()
+            self.loggit.debug(
+                '"most_recent" snapshot: {0}'.format(most_recent))
+            #: Instance variable.
+            #: Will use a provided snapshot name, or the most recent snapshot
+            #: in slo
+            self.name = name if name else most_recent
+            self.restores = None
         # Stop here now, if it's not a successful snapshot.
         if slo.snapshot_info[self.name]['state'] == 'PARTIAL' \
             and partial == True:
@@ -966,11 +1825,21 @@ class Restore(object):
         #: `repository` derived from `slo`
         self.repository          = slo.repository
 
-        if indices:
+        if self.restores:
+            self.indices = [i for _, group in self.restores for i in group]
+        elif indices:
             self.indices = ensure_list(indices)
         else:
-            self.indices = slo.snapshot_info[self.name]['indices']
+            self.indices = slo.snapshot_indices(self.name)
+        if not self.restores:
+            self.restores = [(self.name, self.indices)]
         self.wfc                 = wait_for_completion
+        #: Instance variable.
+        #: Internally accessible copy of `wait_interval`
+        self.wait_interval = wait_interval
+        #: Instance variable.
+        #: Internally accessible copy of `max_wait`
+        self.max_wait = max_wait
         #: Instance variable version of ``rename_pattern``
         self.rename_pattern = rename_pattern if rename_replacement is not None \
             else ''
@@ -1014,13 +1883,38 @@ class Restore(object):
         # Populate the expected output index list.
         self._get_expected_output()
 
-    def _get_expected_output(self):
+    def _newest_per_index(self, slo, indices, partial):
+        """
+        Return the newest usable snapshot in `slo` for each index matching
+        `indices`, grouped by snapshot, oldest snapshot first.
+        """
+        states = ['SUCCESS', 'PARTIAL'] if partial else ['SUCCESS']
+        newest = slo.newest_snapshots(indices, states=states)
+        for entry in ensure_list(indices):
+            if not '*' in entry and not entry in newest:
+                self.loggit.warn(
+                    'No snapshot to restore index {0} from'.format(entry))
+        groups = {}
+        for index in sorted(newest):
+            groups.setdefault(newest[index], []).append(index)
+        if not groups:
+            raise NoIndices(
+                'No snapshot contains any of the indices {0}'.format(indices))
+        order = dict((s, p) for p, s in enumerate(slo.snapshot_order))
+        restores = sorted(groups.items(), key=lambda g: order[g[0]])
+        for snapshot, group in restores:
+            self.loggit.info(
+                'Restoring {0} indices from snapshot {1}'.format(
+                    len(group), snapshot)
+            )
+        return restores
+
+    def _renamed(self, indices):
         if not self.rename_pattern and not self.rename_replacement:
-            self.expected_output = self.indices
-            return # Don't stick around if we're not replacing anything
-        self.expected_output = []
-        for index in self.indices:
-            self.expected_output.append(
+            return indices
+        renamed = []
+        for index in indices:
+            renamed.append(
                 re.sub(
                     self.rename_pattern,
                     self.py_rename_replacement,
@@ -1028,8 +1922,12 @@ class Restore(object):
                 )
             )
             self.loggit.debug('index: {0} replacement: '
-                '{1}'.format(index, self.expected_output[-1])
+                '{1}'.format(index, renamed[-1])
             )
+        return renamed
+
+    def _get_expected_output(self):
+        self.expected_output = self._renamed(self.indices)
 
     def report_state(self):
         """
@@ -1037,7 +1935,7 @@ class Restore(object):
         This should only be done if ``wait_for_completion`` is `True`, and only
         after completing the restore.
         """
-        all_indices = get_indices(self.client)
+        all_indices = set(get_indices(self.client))
         found_count = 0
         missing = []
         for index in self.expected_output:
@@ -1059,28 +1957,30 @@ class Restore(object):
         Log what the output would be, but take no action.
         """
         logger.info('DRY-RUN MODE.  No changes will be made.')
-        logger.info(
-            'DRY-RUN: restore: Repository: {0} Snapshot name: {1} Arguments: '
-            '{2}'.format(
-                self.name, self.repository,
-                { 'wait_for_completion' : self.wfc, 'body' : self.body }
+        for name, indices in self.restores:
+            body = dict(self.body, indices=indices)
+            logger.info(
+                'DRY-RUN: restore: Repository: {0} Snapshot name: {1} '
+                'Arguments: {2}'.format(
+                    self.repository, name,
+                    { 'wait_for_completion' : self.wfc, 'body' : body }
+                )
             )
-        )
-
-        for index in self.indices:
-            if self.rename_pattern and self.rename_replacement:
-                replacement_msg = 'as {0}'.format(
-                    re.sub(
-                        self.rename_pattern,
-                        self.py_rename_replacement,
-                        index
+            for index in indices:
+                if self.rename_pattern and self.rename_replacement:
+                    replacement_msg = 'as {0}'.format(
+                        re.sub(
+                            self.rename_pattern,
+                            self.py_rename_replacement,
+                            index
+                        )
                     )
+                else:
+                    replacement_msg = ''
+                logger.info(
+                    'DRY-RUN: restore: Index {0} {1}'.format(
+                        index, replacement_msg)
                 )
-            else:
-                replacement_msg = ''
-            logger.info(
-                'DRY-RUN: restore: Index {0} {1}'.format(index, replacement_msg)
-            )
 
 
     def do_action(self):
@@ -1093,14 +1993,32 @@ class Restore(object):
             raise SnapshotInProgress(
                 'Cannot restore while a snapshot is in progress.')
         try:
-            self.loggit.info('Restoring indices "{0}" from snapshot: '
-                '{1}'.format(self.indices, self.name)
-            )
-            self.client.snapshot.restore(
-                repository=self.repository, snapshot=self.name, body=self.body,
-                wait_for_completion=self.wfc
-            )
+            for count, (name, indices) in enumerate(self.restores, 1):
+                self.loggit.info('Restoring indices "{0}" from snapshot: '
+                    '{1}'.format(indices, name)
+                )
+                # Poll for completion rather than holding the request open
+                self.client.snapshot.restore(
+                    repository=self.repository, snapshot=name,
+                    body=dict(self.body, indices=indices),
+                    wait_for_completion=False
+                )
+                # Only one restore can run at a time, so each one but the
+                # last must finish before the next can start.
+                if count < len(self.restores):
+                    wait_for_it(
+                        lambda: restore_check(
+                            self.client, self._renamed(indices)),
+                        'restore of snapshot {0}'.format(name),
+                        wait_interval=self.wait_interval,
+                        max_wait=self.max_wait
+                    )
             if self.wfc:
+                wait_for_it(
+                    lambda: restore_check(self.client, self.expected_output),
+                    'restore of snapshot {0}'.format(self.name),
+                    wait_interval=self.wait_interval, max_wait=self.max_wait
+                )
                 self.report_state()
             else:
                 self.loggit.warn(
@@ -1108,5 +2026,7 @@ class Restore(object):
                     'Remember to check for successful completion '
                     'manually.'.format(self.wfc)
                 )
+        except FailedRestore:
+            raise
         except Exception as e:
             report_failure(e)
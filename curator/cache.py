@@ -0,0 +1,355 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .defaults import settings
+from .utils import *
+
+class IndexCache(object):
+    def __init__(self, client, path=None, stats_ttl=300):
+        """
+        Keep index metadata and stats on disk between Curator runs, in one
+        file per cluster, named after its ``cluster_uuid``.
+
+        The first time cached data is used, the cluster state version and the
+        metadata version of every index are fetched in one small request.  If
+        the cluster state has not changed, all cached metadata is used.
+        Otherwise, only entries for indices whose metadata version is
+        unchanged are used.  Stats change without any metadata change, so
+        they are only used for `stats_ttl` seconds after they were fetched.
+        The cache is checked again only after
+        :mod:`curator.cache.IndexCache.invalidate` is called, as
+        :mod:`curator.session.Session.invalidate` does after each action.
+
+        Errors reading or writing the cache file are logged, and the data is
+        fetched from the cluster as if there were no cache.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg path: The cache directory.  Default is ``~/.curator/cache``
+        :arg stats_ttl: Seconds to use cached stats for, or ``0`` to never
+            cache stats
+        """
+        self.loggit = logging.getLogger('curator.cache')
+        #: Instance variable.
+        #: The Elasticsearch Client object
+        self.client = client
+        #: Instance variable.
+        #: The cache directory
+        self.path = os.path.expanduser(path or '~/.curator/cache')
+        #: Instance variable.
+        #: Internally accessible copy of `stats_ttl`
+        self.stats_ttl = stats_ttl
+        #: Instance variable.
+        #: The ``cluster_uuid`` of the cluster, or `None` until first read
+        self.cluster_uuid = None
+        #: Instance variable.
+        #: The cache contents.  ``state_uuid`` is the cluster state the
+        #: entries were last validated against, and ``indices`` holds the
+        #: metadata ``version`` and cached data groups of each index.
+        #: **Type:** ``dict()``
+        self.data = None
+        #: Instance variable.
+        #: The result of the last :mod:`curator.cache.IndexCache.validate`,
+        #: or `None` if the cache must be checked again before use.
+        self.validated = None
+        self.lock = threading.Lock()
+
+    def filename(self):
+        """
+        Return the path of the cache file of this cluster.
+        """
+        return os.path.join(self.path, '{0}.json'.format(self.cluster_uuid))
+
+    def _read(self):
+        try:
+            with open(self.filename(), 'r') as f:
+                data = json.load(f)
+            if not isinstance(data.get('indices'), dict):
+                raise ValueError('No indices in cache file')
+            self.loggit.debug(
+                'Read {0} cached indices from {1}'.format(
+                    len(data['indices']), self.filename())
+            )
+            return data
+        except (IOError, OSError, ValueError) as e:
+            self.loggit.debug('Not using cache file: {0}'.format(e))
+            return {'state_uuid': None, 'indices': {}}
+
+    def save(self):
+        """
+        Write the cache file, replacing it only once it is complete.
+        """
+        if self.data is None:
+            return
+        tmp = self.filename() + '.{0}.tmp'.format(os.getpid())
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            with open(tmp, 'w') as f:
+                json.dump(self.data, f)
+            # os.replace does not exist in Python 2
+            if hasattr(os, 'replace'):
+                os.replace(tmp, self.filename())
+            else:
+                os.rename(tmp, self.filename())
+        except (IOError, OSError) as e:
+            self.loggit.warn(
+                'Unable to write cache file {0}: {1}'.format(
+                    self.filename(), e)
+            )
+
+    def validate(self):
+        """
+        Drop cached entries for indices which were deleted, or whose metadata
+        changed, since they were cached.  Return `False` if the cluster does
+        not report a ``cluster_uuid``, in which case nothing is cached.
+        """
+        state = self.client.cluster.state(
+            metric='version,metadata',
+            filter_path=settings.filter_paths()['index_versions']
+        )
+        uuid = state.get('metadata', {}).get('cluster_uuid')
+        if not uuid or uuid == '_na_':
+            self.loggit.debug('No cluster_uuid.  Index data is not cached.')
+            return False
+        if self.data is None or uuid != self.cluster_uuid:
+            self.cluster_uuid = uuid
+            self.data = self._read()
+        if state.get('state_uuid') == self.data.get('state_uuid'):
+            self.loggit.debug('Cluster state unchanged since last cached')
+            return True
+        versions = dict(
+            (index, info.get('version'))
+            for index, info in state['metadata'].get('indices', {}).items()
+        )
+        cached = self.data['indices']
+        for index in list(cached.keys()):
+            if cached[index]['version'] != versions.get(index):
+                del cached[index]
+        for index in versions:
+            cached.setdefault(index, {'version': versions[index]})
+        self.data['state_uuid'] = state.get('state_uuid')
+        return True
+
+    def invalidate(self):
+        """
+        Check the cache against the cluster again before it is next used.
+        """
+        self.validated = None
+
+    def get(self, group, indices):
+        """
+        Return a dictionary of the cached `group` data of each of `indices`
+        which is still valid, and a list of the indices which must be fetched.
+
+        :arg group: ``metadata`` or ``stats``
+        :arg indices: A list of index names
+        :rtype: tuple
+        """
+        with self.lock:
+            if self.validated is None:
+                try:
+                    self.validated = self.validate()
+                except Exception as e:
+                    self.loggit.warn(
+                        'Unable to validate cached index data: {0}'.format(e))
+                    self.validated = False
+            if not self.validated:
+                return {}, indices
+            now = time.time()
+            found = {}
+            missing = []
+            for index in indices:
+                entry = self.data['indices'].get(index, {})
+                if group in entry and (
+                        group != 'stats' or
+                        now - entry['stats_time'] < self.stats_ttl):
+                    found[index] = entry[group]
+                else:
+                    missing.append(index)
+        self.loggit.debug(
+            'Using cached {0} of {1} indices, fetching {2}'.format(
+                group, len(found), len(missing))
+        )
+        return found, missing
+
+    def put(self, group, entries):
+        """
+        Cache the `group` data of each index in `entries`, and write the
+        cache file.
+
+        :arg group: ``metadata`` or ``stats``
+        :arg entries: A dictionary of data to cache, by index name
+        """
+        if group == 'stats' and not self.stats_ttl:
+            return
+        with self.lock:
+            if self.data is None:
+                return
+            now = time.time()
+            for index in entries:
+                # Indices created since validation are cached next time
+                if not index in self.data['indices']:
+                    continue
+                self.data['indices'][index][group] = entries[index]
+                if group == 'stats':
+                    self.data['indices'][index]['stats_time'] = now
+            self.save()
+
+class SnapshotCatalog(object):
+    def __init__(self, client, path=None):
+        """
+        Keep the name, state, and start and end times of every snapshot in
+        each repository in a local SQLite database, so that listing snapshots
+        does not read every snapshot in the repository.
+
+        Each time a repository is listed, only snapshot names and uuids are
+        fetched.  From Elasticsearch 5.5, this uses ``verbose=false``, which
+        only reads the repository index.  Snapshots which are no longer listed
+        are dropped, and only new snapshots, snapshots which were still
+        running, and snapshots which were replaced by another of the same name
+        (with a different ``uuid``) are fetched in full.  Clusters which do not
+        report a ``cluster_uuid`` are not cataloged.
+
+        :arg client: An :class:`elasticsearch.Elasticsearch` client object
+        :arg path: The cache directory.  Default is ``~/.curator/cache``
+        """
+        self.loggit = logging.getLogger('curator.cache')
+        #: Instance variable.
+        #: The Elasticsearch Client object
+        self.client = client
+        #: Instance variable.
+        #: The cache directory
+        self.path = os.path.expanduser(path or '~/.curator/cache')
+        #: Instance variable.
+        #: The path of the SQLite database
+        self.filename = os.path.join(self.path, 'snapshots.db')
+
+    def _connect(self):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        conn = sqlite3.connect(self.filename)
+        columns = [
+            row[1] for row in conn.execute('PRAGMA table_info(snapshots)')]
+        if columns and not 'uuid' in columns:
+            # Catalogs made before snapshot uuids were kept are rebuilt
+            self.loggit.debug('Rebuilding snapshot catalog {0}'.format(
+                self.filename))
+            with conn:
+                conn.execute('DROP TABLE snapshots')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            'cluster TEXT, repository TEXT, snapshot TEXT, uuid TEXT, '
+            'state TEXT, start_time_in_millis INTEGER, '
+            'end_time_in_millis INTEGER, '
+            'PRIMARY KEY (cluster, repository, snapshot))'
+        )
+        return conn
+
+    def _names(self, repository):
+        """
+        Return the name and ``uuid`` of all snapshots in `repository`, as a
+        list of tuples, and the full catalog entries too, if they had to be
+        fetched to get the names.
+        """
+        if has_feature(self.client, 'snapshot_names'):
+            snapshots = self.client.snapshot.get(
+                repository=repository, snapshot='_all',
+                filter_path='snapshots.snapshot,snapshots.uuid',
+                params={'verbose': 'false'}
+            ).get('snapshots', [])
+            return [(s['snapshot'], s.get('uuid')) for s in snapshots], None
+        snapshots = get_snapshot_data(
+            self.client, repository,
+            filter_path=settings.filter_paths()['snapshot_catalog']
+        )
+        return [(s['snapshot'], s.get('uuid')) for s in snapshots], snapshots
+
+    def snapshots(self, repository):
+        """
+        Bring the catalog of `repository` up to date, and return its
+        snapshots in repository order, as dictionaries with the keys
+        ``snapshot``, ``uuid``, ``state``, ``start_time_in_millis`` and
+        ``end_time_in_millis``.  Return `None` if the cluster does not report
+        a ``cluster_uuid``, in which case nothing is cataloged.
+
+        :arg repository: The Elasticsearch snapshot repository to use
+        :rtype: list
+        """
+        cluster = get_capabilities(self.client).get('cluster_uuid')
+        if not cluster or cluster == '_na_':
+            self.loggit.debug('No cluster_uuid.  Snapshots are not cataloged.')
+            return None
+        listing, fetched = self._names(repository)
+        names = [n for n, uuid in listing]
+        conn = self._connect()
+        try:
+            known = dict(
+                (row[0], (row[1], row[2])) for row in conn.execute(
+                    'SELECT snapshot, uuid, state FROM snapshots '
+                    'WHERE cluster = ? AND repository = ?',
+                    (cluster, repository)
+                )
+            )
+            listed = set(names)
+            deleted = [n for n in known if n not in listed]
+            # Running snapshots are fetched again until they finish, and
+            # snapshots deleted and taken again under the same name are
+            # fetched again
+            stale = [
+                n for n, uuid in listing
+                if not n in known or known[n][1] == 'IN_PROGRESS'
+                or uuid != known[n][0]
+            ]
+            self.loggit.debug(
+                'Snapshot catalog of {0}: {1} listed, {2} to fetch, {3} '
+                'deleted'.format(repository, len(names), len(stale),
+                    len(deleted))
+            )
+            if fetched is None and stale:
+                fetched = []
+                def get_snapshots(l):
+                    return get_snapshot(
+                        self.client, repository, to_csv(l),
+                        filter_path=settings.filter_paths()['snapshot_catalog']
+                    ).get('snapshots', [])
+                for response in chunk_requests(
+                        self.client, get_snapshots, chunk_index_list(stale)):
+                    fetched.extend(response)
+            stale = set(stale)
+            with conn:
+                conn.executemany(
+                    'DELETE FROM snapshots WHERE cluster = ? AND '
+                    'repository = ? AND snapshot = ?',
+                    [(cluster, repository, n) for n in deleted]
+                )
+                conn.executemany(
+                    'INSERT OR REPLACE INTO snapshots VALUES '
+                    '(?, ?, ?, ?, ?, ?, ?)',
+                    [
+                        (cluster, repository, s['snapshot'], s.get('uuid'),
+                            s.get('state'), s.get('start_time_in_millis'),
+                            s.get('end_time_in_millis'))
+                        for s in fetched or [] if s['snapshot'] in stale
+                    ]
+                )
+            rows = dict(
+                (row[0], row) for row in conn.execute(
+                    'SELECT snapshot, uuid, state, start_time_in_millis, '
+                    'end_time_in_millis FROM snapshots '
+                    'WHERE cluster = ? AND repository = ?',
+                    (cluster, repository)
+                )
+            )
+        finally:
+            conn.close()
+        return [
+            {
+                'snapshot': rows[n][0], 'uuid': rows[n][1],
+                'state': rows[n][2], 'start_time_in_millis': rows[n][3],
+                'end_time_in_millis': rows[n][4],
+            }
+            for n in names if n in rows
+        ]
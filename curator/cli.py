@@ -9,7 +9,8 @@ from .config_utils import process_config
 from .exceptions import *
 from .utils import *
 from .indexlist import IndexList
-from .snapshotlist import SnapshotList
+from .snapshotlist import SnapshotList, snapshot_lists
+from .session import Session
 from .actions import *
 from ._version import __version__
 
@@ -33,6 +34,10 @@ def process_action(client, config, **kwargs):
     Do the `action` in the configuration dictionary, using the associated args.
     Other necessary args may be passed as keyword arguments
 
+    If a :class:`curator.session.Session` is passed as the `session` keyword
+    argument, index data is shared with the other actions of the session, and
+    invalidated for the affected indices once the action is done.
+
     :arg config: An `action` dictionary.
     """
     logger = logging.getLogger(__name__)
@@ -47,14 +52,17 @@ def process_action(client, config, **kwargs):
     mykwargs = {}
 
     action_class = CLASS_MAP[action]
+    session = kwargs['session'] if 'session' in kwargs else None
+    # The indices this action acts on, for session invalidation
+    touched = []
 
     # Add some settings to mykwargs...
     if action == 'delete_indices':
         mykwargs['master_timeout'] = (
             kwargs['master_timeout'] if 'master_timeout' in kwargs else 30)
-    if action == 'allocation' or action == 'replicas':
-        # Setting the operation timeout to the client timeout
-        mykwargs['timeout'] = (
+    if action in ['allocation', 'cluster_routing', 'replicas']:
+        # Unless max_wait is set, wait no longer than the client timeout
+        mykwargs['max_wait'] = (
             kwargs['timeout'] if 'timeout' in kwargs else 30)
 
     ### Update the defaults with whatever came with opts, minus any Nones
@@ -66,21 +74,45 @@ def process_action(client, config, **kwargs):
         # Special behavior for this action, as it has 2 index lists
         logger.debug('Running "{0}" action'.format(action.upper()))
         action_obj = action_class(**mykwargs)
+        # Both filter chains run against forks of a single index list
+        patterns = set([
+            get_search_pattern(config[job].get('filters', []))
+            for job in ['add', 'remove'] if job in config
+        ])
+        if '_all' in patterns or not patterns:
+            pattern = '_all'
+        else:
+            pattern = ','.join(sorted(patterns))
+        ilo = (
+            session.index_list(search_pattern=pattern) if session
+            else IndexList(client, lazy=True, search_pattern=pattern)
+        )
         if 'add' in config:
             logger.debug('Adding indices to alias "{0}"'.format(opts['name']))
-            adds = IndexList(client)
+            adds = ilo.fork()
             adds.iterate_filters(config['add'])
+            touched.extend(adds.indices)
             action_obj.add(adds, warn_if_no_indices=opts['warn_if_no_indices'])
         if 'remove' in config:
             logger.debug(
                 'Removing indices from alias "{0}"'.format(opts['name']))
-            removes = IndexList(client)
+            removes = ilo.fork()
             removes.iterate_filters(config['remove'])
+            touched.extend(removes.indices)
             action_obj.remove(
                 removes, warn_if_no_indices= opts['warn_if_no_indices'])
     elif action in [ 'cluster_routing', 'create_index' ]:
         action_obj = action_class(client, **mykwargs)
-    elif action == 'delete_snapshots' or action == 'restore':
+    elif action == 'delete_snapshots':
+        logger.debug('Running "{0}"'.format(action))
+        # Each matching repository is listed and filtered separately
+        slo = snapshot_lists(
+            client, opts['repository'],
+            filters={'filters': config.get('filters', [])}
+        )
+        mykwargs.pop('repository')
+        action_obj = action_class(slo, **mykwargs)
+    elif action == 'restore':
         logger.debug('Running "{0}"'.format(action))
         slo = SnapshotList(client, repository=opts['repository'])
         slo.iterate_filters(config)
@@ -89,15 +121,34 @@ def process_action(client, config, **kwargs):
         action_obj = action_class(slo, **mykwargs)
     else:
         logger.debug('Running "{0}"'.format(action.upper()))
-        ilo = IndexList(client)
+        pattern = get_search_pattern(config.get('filters', []))
+        ilo = (
+            session.index_list(search_pattern=pattern) if session
+            else IndexList(client, lazy=True, search_pattern=pattern)
+        )
         ilo.iterate_filters(config)
+        touched = ilo.indices
         action_obj = action_class(ilo, **mykwargs)
     ### Do the action
     if 'dry_run' in kwargs and kwargs['dry_run'] == True:
         action_obj.do_dry_run()
     else:
         logger.debug('Doing the action here.')
-        action_obj.do_action()
+        try:
+            action_obj.do_action()
+        except Exception:
+            # The indices a failed action changed are unknown, so list them
+            # again instead of guessing
+            if session:
+                session.reset_listing()
+            raise
+        finally:
+            # Even a failed action may have changed some indices
+            if session:
+                if action == 'delete_indices':
+                    # Only forget the indices which are known to be gone
+                    touched = action_obj.deleted
+                session.invalidate(action, touched)
 
 @click.command()
 @click.option('--config',
@@ -120,6 +171,9 @@ def cli(config, dry_run, action_file):
     # Extract this and save it for later, in case there's no timeout_override.
     default_timeout = client_args.pop('timeout')
     logger.debug('default_timeout = {0}'.format(default_timeout))
+    # One client and one view of the cluster's indices for the whole run
+    session = Session(client_args)
+    session.default_timeout = default_timeout
     #########################################
     ### Start working on the actions here ###
     #########################################
@@ -160,11 +214,12 @@ def cli(config, dry_run, action_file):
         kwargs = {}
         kwargs['master_timeout'] = (
             client_args['timeout'] if client_args['timeout'] <= 300 else 300)
-        kwargs['dry_run'] = dry_run
         kwargs['timeout'] = client_args['timeout']
+        kwargs['dry_run'] = dry_run
+        kwargs['session'] = session
 
-        # Create a client object for each action...
-        client = get_client(**client_args)
+        # The client is created for the first action, and reused after that
+        client = session.get_client(timeout=client_args['timeout'])
         logger.debug('client is {0}'.format(type(client)))
         ##########################
         ### Process the action ###
@@ -202,4 +257,6 @@ def cli(config, dry_run, action_file):
                 else:
                     sys.exit(1)
         logger.info('Action ID: {0}, "{1}" completed.'.format(idx, action))
+    if session.client is not None:
+        log_response_sizes(session.client)
     logger.info('Job completed.')
@@ -34,6 +34,46 @@ def date_regex():
         'j' : '3',
     }
 
+# filter_path projections, which trim API responses down to the fields
+# Curator actually reads.  Keys are the data each one fetches.
+def filter_paths():
+    metadata = 'metadata.indices.*.'
+    return {
+        'index_names': '*.settings.index.number_of_shards',
+        'index_metadata': ','.join([
+            metadata + 'state',
+            metadata + 'settings.index.creation_date',
+            metadata + 'settings.index.number_of_shards',
+            metadata + 'settings.index.number_of_replicas',
+            metadata + 'settings.index.routing',
+        ]),
+        'index_state': metadata + 'state',
+        'index_versions': ','.join([
+            'version', 'state_uuid', 'metadata.cluster_uuid',
+            metadata + 'version',
+        ]),
+        'index_routing': '*.settings.index.routing',
+        'shard_nodes': 'routing_table.indices.*.shards.*.node',
+        'shard_placement': ','.join([
+            'routing_table.indices.*.shards.*.node',
+            'routing_table.indices.*.shards.*.state',
+        ]),
+        'node_attributes': ','.join([
+            'nodes.*.name', 'nodes.*.host', 'nodes.*.ip', 'nodes.*.attributes',
+        ]),
+        'shard_unassigned': ','.join([
+            'routing_table.indices.*.shards.*.primary',
+            'routing_table.indices.*.shards.*.unassigned_info.reason',
+        ]),
+        'snapshot_catalog': ','.join([
+            'snapshots.snapshot', 'snapshots.uuid', 'snapshots.state',
+            'snapshots.start_time_in_millis', 'snapshots.end_time_in_millis',
+        ]),
+        'snapshot_indices': 'snapshots.snapshot,snapshots.indices',
+        'segment_count': 'indices.*.total.segments.count',
+        'shard_segment_count': 'indices.*.shards.*.segments.count',
+    }
+
 # Actions
 
 def cluster_actions():
@@ -74,7 +114,7 @@ def index_filtertypes():
     ]
 
 def snapshot_filtertypes():
-    return ['age', 'count', 'none', 'pattern', 'state']
+    return ['age', 'count', 'indices', 'none', 'pattern', 'state']
 
 def all_filtertypes():
     return sorted(list(set(index_filtertypes() + snapshot_filtertypes())))
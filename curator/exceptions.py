@@ -34,7 +34,17 @@ class FailedExecution(CuratorException):
     Exception raised when an action fails to execute for some reason.
     """
 
+class FailedRestore(FailedExecution):
+    """
+    Exception raised when a shard of a restored index cannot be recovered
+    """
+
 class SnapshotInProgress(ActionError):
     """
     Exception raised when a snapshot is already in progress
     """
+
+class ActionTimeout(CuratorException):
+    """
+    Exception raised when an action does not complete within its ``max_wait``
+    """
@@ -9,7 +9,7 @@ from .exceptions import *
 from .utils import *
 
 class IndexList(object):
-    def __init__(self, client):
+    def __init__(self, client, lazy=False, session=None, search_pattern='_all'):
         verify_client_object(client)
         self.loggit = logging.getLogger('curator.indexlist')
         #: An Elasticsearch Client object
@@ -21,15 +21,93 @@ class IndexList(object):
         #: methods, as needed. **Type:** ``dict()``
         self.index_info = {}
         #: Instance variable.
-        #: The running list of indices which will be used by an Action class.
-        #: Populated at instance creation time. **Type:** ``list()``
-        self.indices = []
+        #: Indices marked not actionable, but not yet dropped from `indices`.
+        #: Marking is O(1); the list is compacted in a single pass the next
+        #: time `indices` is read. **Type:** ``set()``
+        self._removed = set()
+        self._indices = []
+        # The names in `_indices`, for has_index.  Built on first use.
+        self._members = None
         #: Instance variable.
         #: All indices in the cluster at instance creation time.
         #: **Type:** ``list()``
         self.all_indices = []
+        #: Instance variable.
+        #: If `True`, index metadata and stats are not fetched at instance
+        #: creation time, but only when a filter or action first needs them,
+        #: and only for the indices in `indices` at that moment.
+        #: **Type:** ``bool``
+        self.lazy = lazy
+        #: Instance variable.
+        #: The indices for which each group of data in `index_info` has
+        #: already been fetched.  Keys are the data groups accepted by
+        #: :mod:`curator.indexlist.IndexList.load_data`.
+        #: **Type:** ``dict()`` of ``set()``
+        self.data_loaded = {
+            'metadata': set(),
+            'stats': set(),
+            'segments': set(),
+            'shard_segments': set(),
+        }
+        #: Instance variable.
+        #: Indices found to have no ``creation_date``, which are never
+        #: actionable.  Shared like `data_loaded`, so that the exclusion
+        #: reaches every list which does not fetch the metadata again.
+        #: **Type:** ``set()``
+        self.no_creation_date = set()
+        #: Instance variable.
+        #: The index expression used to list indices, e.g. ``logstash-*``.
+        #: See :mod:`curator.utils.get_search_pattern`.  **Type:** ``str``
+        self.search_pattern = search_pattern
+        #: Instance variable.
+        #: A :class:`curator.session.Session`, or `None`.  If set,
+        #: `index_info`, `data_loaded` and the list of all indices are shared
+        #: with every other IndexList of the same session.
+        self.session = session
+        if session is not None:
+            self.index_info = session.index_info
+            self.data_loaded = session.data_loaded
+            self.no_creation_date = session.no_creation_date
         self.__get_indices()
 
+    @property
+    def indices(self):
+        """
+        The running list of indices which will be used by an Action class.
+        Populated at instance creation time. **Type:** ``list()``
+        """
+        if self._removed:
+            self._indices[:] = [
+                i for i in self._indices if i not in self._removed]
+            if self._members is not None:
+                self._members.difference_update(self._removed)
+            self._removed.clear()
+        return self._indices
+
+    @indices.setter
+    def indices(self, value):
+        self._removed.clear()
+        self._members = None
+        self._indices = value
+
+    def has_index(self, index):
+        """
+        Return `True` if `index` is in `indices`.  Unlike ``index in
+        indices``, this is a set lookup, not a scan of the list.
+
+        :arg index: An index name
+        :rtype: bool
+        """
+        if index in self._removed:
+            return False
+        # Also rebuilt if the list was changed in place
+        if self._members is None or len(self._members) != len(self._indices):
+            self._members = set(self._indices)
+        return index in self._members
+
+    def __contains__(self, index):
+        return self.has_index(index)
+
     def __actionable(self, idx):
         self.loggit.debug(
             'Index {0} is actionable and remains in the list.'.format(idx))
@@ -37,7 +115,7 @@ class IndexList(object):
     def __not_actionable(self, idx):
             self.loggit.debug(
                 'Index {0} is not actionable, removing from list.'.format(idx))
-            self.indices.remove(idx)
+            self._removed.add(idx)
 
     def __excludify(self, condition, exclude, index, msg=None):
         if condition == True:
@@ -63,13 +141,19 @@ class IndexList(object):
         `index_info`
         """
         self.loggit.debug('Getting all indices')
-        self.all_indices = get_indices(self.client)
+        if self.session is not None:
+            self.all_indices = self.session.get_indices(self.search_pattern)
+        else:
+            self.all_indices = get_indices(self.client, self.search_pattern)
         self.indices = self.all_indices[:]
         self.empty_list_check()
         for index in self.indices:
             self.__build_index_info(index)
-        self._get_metadata()
-        self._get_index_stats()
+        if self.lazy:
+            self.loggit.debug(
+                'Lazy mode: index metadata and stats will be fetched on demand')
+        else:
+            self.load_data('metadata', 'stats')
 
     def __build_index_info(self, index):
         """
@@ -84,6 +168,7 @@ class IndexList(object):
                 "number_of_replicas" : 0,
                 "number_of_shards" : 0,
                 "segments" : 0,
+                "shard_segments" : {},
                 "size_in_bytes" : 0,
                 "docs" : 0,
                 "state" : "",
@@ -105,13 +190,57 @@ class IndexList(object):
         }
         return methods[ft]
 
-    def _get_index_stats(self):
+    def load_data(self, *groups):
+        """
+        Ensure that each of `groups` has been fetched into `index_info` for
+        every index presently in `indices`.  Only indices which have not yet
+        been populated for a group are fetched, so repeated calls are cheap.
+
+        :arg groups: One or more of ``metadata`` (state, shard and replica
+            counts, creation date and routing settings), ``stats`` (store size
+            and doc count), ``segments`` (total segment count), or
+            ``shard_segments`` (segment count of each shard copy)
+        """
+        loaders = {
+            'metadata': self._get_metadata,
+            'stats': self._get_index_stats,
+            'segments': self._get_segmentcounts,
+            'shard_segments': self._get_shard_segmentcounts,
+        }
+        for group in groups:
+            if group not in loaders:
+                raise ValueError('Invalid data group: {0}'.format(group))
+            missing = [
+                i for i in self.indices if i not in self.data_loaded[group]]
+            if missing:
+                self.loggit.debug(
+                    'Loading "{0}" data for {1} indices'.format(
+                        group, len(missing))
+                )
+                loaders[group](missing)
+            if group == 'metadata':
+                # Metadata may have been loaded by another list
+                self._exclude_no_creation_date()
+
+    def _exclude_no_creation_date(self):
+        """
+        Remove every index in `no_creation_date` from `indices`.
+        """
+        for index in self.no_creation_date:
+            if self.has_index(index):
+                self.__not_actionable(index)
+
+    def _get_index_stats(self, indices=None):
         """
         Populate `index_info` with index `size_in_bytes` and doc count
         information for each index.
+
+        :arg indices: The indices to fetch stats for.  Defaults to `indices`
         """
         self.loggit.debug('Getting index stats')
         self.empty_list_check()
+        # Closed indices are skipped, so their state must be known first
+        self.load_data('metadata')
         # Subroutine to do the dirty work
         def iterate_over_stats(stats):
             for index in stats['indices']:
@@ -125,32 +254,75 @@ class IndexList(object):
                 self.index_info[index]['size_in_bytes'] = size
                 self.index_info[index]['docs'] = docs
 
-        working_list = self.working_list()
-        for index in self.working_list():
-            if self.index_info[index]['state'] == 'close':
-                working_list.remove(index)
+        if indices is None:
+            indices = self.working_list()
+        working_list = [
+            i for i in indices if i in self.index_info
+                and self.index_info[i]['state'] != 'close'
+        ]
+        cache = get_index_cache(self.client)
+        if working_list and cache:
+            cached, working_list = cache.get('stats', working_list)
+            iterate_over_stats({'indices': cached})
         if working_list:
             index_lists = chunk_index_list(working_list)
-            for l in index_lists:
-                iterate_over_stats(
-                    self.client.indices.stats(index=to_csv(l),
-                    metric='store,docs')
-                )
-
-    def _get_metadata(self):
+            responses = chunk_requests(
+                self.client,
+                lambda l: self.client.indices.stats(
+                    index=to_csv(l), metric='store,docs'),
+                index_lists
+            )
+            entries = {}
+            for stats in responses:
+                iterate_over_stats(stats)
+                for index, data in stats['indices'].items():
+                    entries[index] = {'total': {
+                        'store': {
+                            'size_in_bytes':
+                                data['total']['store']['size_in_bytes']
+                        },
+                        'docs': {'count': data['total']['docs']['count']},
+                    }}
+            if cache:
+                cache.put('stats', entries)
+        self.data_loaded['stats'].update(indices)
+
+    def _get_metadata(self, indices=None):
         """
-        Populate `index_info` with index `size_in_bytes` and doc count
-        information for each index.
+        Populate `index_info` with index state, creation date, shard and
+        replica counts, and routing settings for each index.
+
+        :arg indices: The indices to fetch metadata for.  Defaults to `indices`
         """
         self.loggit.debug('Getting index metadata')
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = (
-                self.client.cluster.state(
-                    index=to_csv(l),metric='metadata'
-                )['metadata']['indices']
+        if indices is None:
+            indices = self.working_list()
+        responses = []
+        cache = get_index_cache(self.client)
+        fetch = indices
+        if cache:
+            cached, fetch = cache.get('metadata', indices)
+            responses.append({'metadata': {'indices': cached}})
+        if fetch:
+            fetched = chunk_requests(
+                self.client,
+                lambda l: self.client.cluster.state(
+                    index=to_csv(l), metric='metadata',
+                    filter_path=settings.filter_paths()['index_metadata']
+                ),
+                chunk_index_list(fetch)
             )
+            responses.extend(fetched)
+            if cache:
+                entries = {}
+                for response in fetched:
+                    entries.update(
+                        response.get('metadata', {}).get('indices', {}))
+                cache.put('metadata', entries)
+        for response in responses:
+            # With filter_path, the response is empty if no indices matched
+            working_list = response.get('metadata', {}).get('indices', {})
             if working_list:
                 for index in list(working_list.keys()):
                     s = self.index_info[index]
@@ -162,7 +334,7 @@ class IndexList(object):
                             'safety, this index will be removed from the '
                             'actionable list.'.format(index)
                         )
-                        self.__not_actionable(index)
+                        self.no_creation_date.add(index)
                     else:
                         s['age']['creation_date'] = (
                             fix_epoch(wl['settings']['index']['creation_date'])
@@ -176,6 +348,8 @@ class IndexList(object):
                     s['state'] = wl['state']
                     if 'routing' in wl['settings']['index']:
                         s['routing'] = wl['settings']['index']['routing']
+        self.data_loaded['metadata'].update(indices)
+        self._exclude_no_creation_date()
 
     def empty_list_check(self):
         """Raise exception if `indices` is empty"""
@@ -183,6 +357,25 @@ class IndexList(object):
         if not self.indices:
             raise NoIndices('index_list object is empty.')
 
+    def fork(self):
+        """
+        Return a new IndexList with a copy of `indices`, which shares
+        `index_info`, `data_loaded` and `no_creation_date` with this one.
+        No requests are made, so several filter chains can be run against a
+        single fetch.  Data fetched for either list is available to both.
+
+        :rtype: :class:`curator.indexlist.IndexList`
+        """
+        self.loggit.debug(
+            'Forking index list of {0} indices'.format(len(self.indices)))
+        forked = IndexList.__new__(IndexList)
+        forked.__dict__.update(self.__dict__)
+        forked._removed = set()
+        forked._members = None
+        forked._indices = self.indices[:]
+        forked.all_indices = self.all_indices[:]
+        return forked
+
     def working_list(self):
         """
         Return the current value of `indices` as copy-by-value to prevent list
@@ -193,27 +386,76 @@ class IndexList(object):
         self.loggit.debug('Generating working list of indices')
         return self.indices[:]
 
-    def _get_segmentcounts(self):
+    def _get_segmentcounts(self, indices=None):
         """
-        Populate `index_info` with segment information for each index.
+        Populate `index_info` with the total segment count of each index.
+
+        The count comes from the ``segments`` metric of the index stats API,
+        trimmed with `filter_path` to the one number needed, rather than the
+        per-segment detail of the segments API.
+
+        :arg indices: The indices to fetch segment counts for.  Defaults to
+            `indices`
         """
         self.loggit.debug('Getting index segment counts')
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = (
-                self.client.indices.segments(index=to_csv(l))['indices']
-            )
-            if working_list:
-                for index in list(working_list.keys()):
-                    shards = working_list[index]['shards']
-                    segmentcount = 0
-                    for shardnum in shards:
-                        for shard in range(0,len(shards[shardnum])):
-                            segmentcount += (
-                                shards[shardnum][shard]['num_search_segments']
-                            )
-                    self.index_info[index]['segments'] = segmentcount
+        if indices is None:
+            indices = self.working_list()
+        index_lists = chunk_index_list(indices)
+        responses = chunk_requests(
+            self.client,
+            lambda l: self.client.indices.stats(
+                index=to_csv(l), metric='segments',
+                filter_path=settings.filter_paths()['segment_count']
+            ),
+            index_lists
+        )
+        for response in responses:
+            # With filter_path, the response is empty if no indices matched
+            working_list = response.get('indices', {})
+            for index in list(working_list.keys()):
+                self.index_info[index]['segments'] = (
+                    working_list[index]['total']['segments']['count']
+                )
+        self.data_loaded['segments'].update(indices)
+
+    def _get_shard_segmentcounts(self, indices=None):
+        """
+        Populate `index_info` with the segment count of each shard copy of each
+        index, as a dictionary of shard number to a list of counts, one per
+        copy.  The total segment count is populated at the same time.
+
+        :arg indices: The indices to fetch segment counts for.  Defaults to
+            `indices`
+        """
+        self.loggit.debug('Getting per-shard index segment counts')
+        self.empty_list_check()
+        if indices is None:
+            indices = self.working_list()
+        index_lists = chunk_index_list(indices)
+        responses = chunk_requests(
+            self.client,
+            lambda l: self.client.indices.stats(
+                index=to_csv(l), metric='segments', level='shards',
+                filter_path=settings.filter_paths()['shard_segment_count']
+            ),
+            index_lists
+        )
+        for response in responses:
+            working_list = response.get('indices', {})
+            for index in list(working_list.keys()):
+                shards = working_list[index]['shards']
+                counts = {}
+                for shardnum in shards:
+                    counts[shardnum] = [
+                        copy['segments']['count'] for copy in shards[shardnum]
+                    ]
+                self.index_info[index]['shard_segments'] = counts
+                self.index_info[index]['segments'] = (
+                    sum([sum(c) for c in counts.values()])
+                )
+        self.data_loaded['shard_segments'].update(indices)
+        self.data_loaded['segments'].update(indices)
 
     def _get_name_based_ages(self, timestring):
         """
@@ -228,6 +470,9 @@ class IndexList(object):
         self.empty_list_check()
         ts = TimestringSearch(timestring)
         for index in self.working_list():
+            # An age parsed for another timestring, perhaps by a fork of this
+            # list, must not be mistaken for a match of this one.
+            self.index_info[index]['age'].pop('name', None)
             epoch = ts.get_epoch(index)
             if epoch:
                 self.index_info[index]['age']['name'] = epoch
@@ -247,10 +492,14 @@ class IndexList(object):
         )
         self.filter_closed()
         index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = self.client.field_stats(
-                index=to_csv(l), fields=field, level='indices'
-                )['indices']
+        responses = chunk_requests(
+            self.client,
+            lambda l: self.client.field_stats(
+                index=to_csv(l), fields=field, level='indices'),
+            index_lists
+        )
+        for response in responses:
+            working_list = response['indices']
             if working_list:
                 for index in list(working_list.keys()):
                     try:
@@ -293,8 +542,9 @@ class IndexList(object):
                 )
             self._get_name_based_ages(timestring)
         elif source == 'creation_date':
-            # Nothing to do here as this comes from `get_metadata` in __init__
-            pass
+            # This comes from `_get_metadata`, which may not have run yet in
+            # lazy mode
+            self.load_data('metadata')
         elif source == 'field_stats':
             if not field:
                 raise MissingArgument(
@@ -452,7 +702,7 @@ class IndexList(object):
                 self.loggit.debug(
                     'Index "{0}" does not meet provided criteria. '
                     'Removing from list.'.format(index, source))
-                self.indices.remove(index)
+                self.__not_actionable(index)
 
     def filter_by_space(
         self, disk_space=None, reverse=True, use_age=False,
@@ -510,6 +760,7 @@ class IndexList(object):
             'Omitting any closed indices.'
         )
         self.filter_closed()
+        self.load_data('stats')
 
         # Create a copy-by-value working list
         working_list = self.working_list()
@@ -554,7 +805,8 @@ class IndexList(object):
                 ]:
                 self.__excludify(True, exclude, index)
 
-    def filter_forceMerged(self, max_num_segments=None, exclude=True):
+    def filter_forceMerged(
+        self, max_num_segments=None, exclude=True, per_shard=False):
         """
         Match any index which has `max_num_segments` per shard or fewer in the
         actionable list.
@@ -564,6 +816,10 @@ class IndexList(object):
             indices from `indices`. If `exclude` is `False`, then only matching
             indices will be kept in `indices`.
             Default is `True`
+        :arg per_shard: If `True`, an index only matches if every shard copy
+            has `max_num_segments` or fewer.  If `False`, the total segment
+            count of the index is compared with `max_num_segments` times the
+            number of shard copies.  Default is `False`
         """
         self.loggit.debug('Filtering forceMerged indices')
         if not max_num_segments:
@@ -573,7 +829,20 @@ class IndexList(object):
             'Omitting any closed indices.'
         )
         self.filter_closed()
-        self._get_segmentcounts()
+        if per_shard:
+            self.load_data('shard_segments')
+            for index in self.working_list():
+                counts = self.index_info[index]['shard_segments']
+                most = max([max(c) for c in counts.values() if c] or [0])
+                msg = (
+                    '{0} has at most {1} segments in any shard copy.'.format(
+                        index, most
+                    )
+                )
+                self.__excludify(
+                    (most <= max_num_segments), exclude, index, msg)
+            return
+        self.load_data('segments')
         for index in self.working_list():
             # Do this to reduce long lines and make it more readable...
             shards = int(self.index_info[index]['number_of_shards'])
@@ -588,7 +857,6 @@ class IndexList(object):
             expected_count = ((shards + (shards * replicas)) * max_num_segments)
             self.__excludify((segments <= expected_count), exclude, index, msg)
 
-
     def filter_closed(self, exclude=True):
         """
         Filter out closed indices from `indices`
@@ -600,6 +868,7 @@ class IndexList(object):
         """
         self.loggit.debug('Filtering closed indices')
         self.empty_list_check()
+        self.load_data('metadata')
         for index in self.working_list():
             condition = self.index_info[index]['state'] == 'close'
             self.loggit.debug('Index {0} state: {1}'.format(
@@ -619,6 +888,7 @@ class IndexList(object):
         """
         self.loggit.debug('Filtering open indices')
         self.empty_list_check()
+        self.load_data('metadata')
         for index in self.working_list():
             condition = self.index_info[index]['state'] == 'open'
             self.loggit.debug('Index {0} state: {1}'.format(
@@ -654,25 +924,32 @@ class IndexList(object):
             )
         self.empty_list_check()
         index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
-            working_list = self.client.indices.get_settings(index=to_csv(l))
-            if working_list:
-                for index in list(working_list.keys()):
-                    try:
-                        has_routing = (
-                            working_list[index]['settings']['index']['routing']['allocation'][allocation_type][key] == value
-                        )
-                    except KeyError:
-                        has_routing = False
-                    # if has_routing:
-                    msg = (
-                        '{0}: Routing (mis)match: '
-                        'index.routing.allocation.{1}.{2}={3}.'.format(
-                            index, allocation_type, key, value
-                        )
+        responses = chunk_requests(
+            self.client,
+            lambda l: self.client.indices.get_settings(
+                index=to_csv(l),
+                filter_path=settings.filter_paths()['index_routing']
+            ),
+            index_lists
+        )
+        for l, working_list in zip(index_lists, responses):
+            # Indices without routing settings are trimmed from the response
+            for index in l:
+                try:
+                    has_routing = (
+                        working_list[index]['settings']['index']['routing']['allocation'][allocation_type][key] == value
                     )
-                        # self.indices.remove(index)
-                    self.__excludify(has_routing, exclude, index, msg)
+                except KeyError:
+                    has_routing = False
+                # if has_routing:
+                msg = (
+                    '{0}: Routing (mis)match: '
+                    'index.routing.allocation.{1}.{2}={3}.'.format(
+                        index, allocation_type, key, value
+                    )
+                )
+                    # self.indices.remove(index)
+                self.__excludify(has_routing, exclude, index, msg)
 
     def filter_none(self):
         self.loggit.debug('"None" filter selected.  No filtering will be done.')
@@ -694,18 +971,21 @@ class IndexList(object):
             raise MissingArgument('No value for "aliases" provided')
         aliases = ensure_list(aliases)
         self.empty_list_check()
-        index_lists = chunk_index_list(self.indices)
-        for l in index_lists:
+        def get_alias(l):
             try:
                 # get_alias will either return {} or a NotFoundError.
-                has_alias = list(self.client.indices.get_alias(
+                return list(self.client.indices.get_alias(
                     index=to_csv(l),
                     name=to_csv(aliases)
                 ).keys())
-                self.loggit.debug('has_alias: {0}'.format(has_alias))
             except elasticsearch.exceptions.NotFoundError:
                 # if we see the NotFoundError, we need to set working_list to {}
-                has_alias = []
+                return []
+        index_lists = chunk_index_list(self.indices)
+        responses = chunk_requests(self.client, get_alias, index_lists)
+        for l, has_alias in zip(index_lists, responses):
+            self.loggit.debug('has_alias: {0}'.format(has_alias))
+            has_alias = set(has_alias)
             for index in l:
                 if index in has_alias:
                     isOrNot = 'is'
@@ -796,6 +1076,73 @@ class IndexList(object):
             self.__excludify(condition, exclude, index, msg)
             idx += 1
 
+    def _filter_cost(self, f):
+        """
+        Return the relative cost of running filter `f`, or `None` if the
+        filter is order-dependent and must not be moved.
+
+        * ``0``: Index names only.  No requests are made.
+        * ``1``: Index metadata, settings or aliases.
+        * ``2``: Index stats.
+        * ``3``: Segment counts or field_stats.
+
+        :arg f: A single filter dictionary, as found in a filter list.
+        :rtype: int
+        """
+        ft = f.get('filtertype') if isinstance(f, dict) else None
+        if ft in ['none', 'pattern', 'kibana']:
+            return 0
+        elif ft in ['closed', 'opened', 'allocated', 'alias']:
+            return 1
+        elif ft == 'age':
+            source = f.get('source', 'name')
+            if source == 'name':
+                return 0
+            elif source == 'field_stats':
+                return 3
+            return 1
+        elif ft == 'forcemerged':
+            return 3
+        # 'count', 'space' and anything unrecognized depend on the indices
+        # left by the filters before them.
+        return None
+
+    def _plan_filters(self, filter_list):
+        """
+        Reorder `filter_list` so that cheap filters run before expensive ones.
+
+        Every filter except ``count`` and ``space`` only tests each index on
+        its own merits, so filters between those barriers can be run in any
+        order without changing the result.  Within each such run, filters are
+        stably sorted by :mod:`curator.indexlist.IndexList._filter_cost`.
+
+        :arg filter_list: A list of filter dictionaries
+        :rtype: list of (original position, filter) tuples, in execution order
+        """
+        plan = []
+        segment = []
+        def flush():
+            segment.sort(key=lambda x: self._filter_cost(x[1]))
+            plan.extend(segment)
+            del segment[:]
+        for position, f in enumerate(filter_list):
+            if self._filter_cost(f) is None:
+                flush()
+                plan.append((position, f))
+            else:
+                segment.append((position, f))
+        flush()
+        if [x[0] for x in plan] != list(range(len(filter_list))):
+            self.loggit.info(
+                'Filter plan (by original position): {0}'.format(
+                    ', '.join(
+                        '{0}:{1}'.format(pos, f.get('filtertype'))
+                        for pos, f in plan
+                    )
+                )
+            )
+        return plan
+
     def iterate_filters(self, filter_dict):
         """
         Iterate over the filters defined in `config` and execute them.
@@ -823,7 +1170,25 @@ class IndexList(object):
             return
 
         self.loggit.debug('All filters: {0}'.format(filter_dict['filters']))
-        for f in filter_dict['filters']:
+        plan = self._plan_filters(filter_dict['filters'])
+        saved = 0
+        segment_chunks = None
+        for step, (position, f) in enumerate(plan):
+            cost = self._filter_cost(f)
+            if cost is None:
+                # Barriers start a new segment
+                segment_chunks = None
+            else:
+                chunks = len(chunk_index_list(self.indices)) if self.indices else 0
+                if segment_chunks is None:
+                    segment_chunks = chunks
+                # A filter that issues requests, and which the planner moved
+                # behind cheaper ones, would otherwise have run against the
+                # whole segment's starting list.  Unless lazy, metadata and
+                # stats were fetched for every index up front regardless.
+                fetched = cost > 2 or (cost > 0 and self.lazy)
+                if fetched and step > position:
+                    saved += segment_chunks - chunks
             self.loggit.debug('Top of the loop: {0}'.format(self.indices))
             self.loggit.debug('Un-parsed filter args: {0}'.format(f))
             # Make sure we got at least this much in the configuration
@@ -848,3 +1213,8 @@ class IndexList(object):
             else:
                 # Otherwise, it's a settingless filter.
                 method()
+        if saved:
+            self.loggit.info(
+                'Filter plan saved an estimated {0} request(s) to '
+                'Elasticsearch'.format(saved)
+            )
@@ -0,0 +1,209 @@
+import logging
+import fnmatch
+from .utils import *
+
+class Session(object):
+    def __init__(self, client_args):
+        """
+        Hold the client connection and a point-in-time view of index data for
+        the duration of a single Curator run, so that each action does not
+        have to reconnect and download the same cluster data again.
+
+        Index data is shared with every
+        :class:`curator.indexlist.IndexList` created by
+        :mod:`curator.session.Session.index_list`.  After an action changes
+        the cluster, :mod:`curator.session.Session.invalidate` drops only the
+        data the action could have changed, for only the affected indices.
+
+        :arg client_args: Keyword arguments for
+            :mod:`curator.utils.get_client`.  If `timeout` is included, it
+            becomes the default timeout.
+        """
+        self.loggit = logging.getLogger('curator.session')
+        #: Instance variable.
+        #: The arguments used to create `client`.
+        self.client_args = client_args.copy()
+        #: Instance variable.
+        #: The default client timeout, in seconds.
+        self.default_timeout = self.client_args.pop('timeout', 30)
+        #: Instance variable.
+        #: The timeout sent with each request, in seconds.  Set by
+        #: :mod:`curator.session.Session.set_timeout`.
+        self.timeout = self.default_timeout
+        self._timeout_transport = None
+        #: Instance variable.
+        #: The Elasticsearch Client object, created on first use by
+        #: :mod:`curator.session.Session.get_client`.
+        self.client = None
+        #: Instance variable.
+        #: Shared by each IndexList of this session.  **Type:** ``dict()``
+        self.index_info = {}
+        #: Instance variable.
+        #: Shared by each IndexList of this session.
+        #: **Type:** ``dict()`` of ``set()``
+        self.data_loaded = {
+            'metadata': set(),
+            'stats': set(),
+            'segments': set(),
+            'shard_segments': set(),
+        }
+        #: Instance variable.
+        #: Indices without a ``creation_date``, which are never actionable.
+        #: Shared by each IndexList of this session.  **Type:** ``set()``
+        self.no_creation_date = set()
+        #: Instance variable.
+        #: All indices in the cluster, or `None` if the list must be fetched
+        #: again.  **Type:** ``list()``
+        self.all_indices = None
+        #: Instance variable.
+        #: Indices listed by search pattern, for patterns other than ``_all``.
+        #: **Type:** ``dict()`` of ``list()``
+        self.listings = {}
+
+    def get_client(self, timeout=None):
+        """
+        Return the session client, creating it on first use.  Version and
+        ``master_only`` checks are only done when the client is created.
+
+        :arg timeout: Client timeout for the requests which follow, in
+            seconds.  Defaults to `default_timeout`.
+        :rtype: :class:`elasticsearch.Elasticsearch`
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        if self.client is None:
+            kwargs = self.client_args.copy()
+            kwargs['timeout'] = timeout
+            self.client = get_client(**kwargs)
+        self.set_timeout(timeout)
+        return self.client
+
+    def set_timeout(self, timeout):
+        """
+        Send `timeout` as the ``request_timeout`` of every request made by
+        `client` which does not set its own.  This works for any connection
+        class, and for connections added later by sniffing.
+
+        :arg timeout: The timeout, in seconds.
+        """
+        self.loggit.debug('Setting client timeout to {0}'.format(timeout))
+        self.timeout = timeout
+        transport = self.client.transport
+        if self._timeout_transport is transport:
+            return
+        perform = transport.perform_request
+        def perform_request(method, url, params=None, body=None):
+            params = dict(params) if params else {}
+            params.setdefault('request_timeout', self.timeout)
+            return perform(method, url, params=params, body=body)
+        transport.perform_request = perform_request
+        self._timeout_transport = transport
+
+    def index_list(self, lazy=True, search_pattern='_all'):
+        """
+        Return a new :class:`curator.indexlist.IndexList` which shares this
+        session's index data.  Ages parsed from index names are dropped.
+
+        :arg lazy: Passed to :class:`curator.indexlist.IndexList`
+        :arg search_pattern: Passed to :class:`curator.indexlist.IndexList`
+        :rtype: :class:`curator.indexlist.IndexList`
+        """
+        from .indexlist import IndexList
+        if self.client is None:
+            self.get_client()
+        # Ages parsed from index names depend on the timestring of a filter,
+        # so one action must not see those parsed by an earlier one.
+        for info in self.index_info.values():
+            info['age'].pop('name', None)
+        return IndexList(
+            self.client, lazy=lazy, session=self, search_pattern=search_pattern)
+
+    def get_indices(self, search_pattern='_all'):
+        """
+        Return a copy of the cached list of indices matching `search_pattern`,
+        fetching it first if it is unknown or stale.  If all indices have
+        already been listed, they are matched locally instead.
+
+        :arg search_pattern: An index expression.  Default is ``_all``
+        :rtype: list
+        """
+        if self.all_indices is not None:
+            self.loggit.debug('Reusing the list of indices from this session')
+            if search_pattern == '_all':
+                return self.all_indices[:]
+            patterns = search_pattern.split(',')
+            return [
+                i for i in self.all_indices
+                if any([fnmatch.fnmatchcase(i, p) for p in patterns])
+            ]
+        if search_pattern == '_all':
+            self.all_indices = get_indices(self.client)
+            return self.all_indices[:]
+        if not search_pattern in self.listings:
+            self.listings[search_pattern] = get_indices(
+                self.client, search_pattern)
+        else:
+            self.loggit.debug('Reusing the list of indices from this session')
+        return self.listings[search_pattern][:]
+
+    def reset_listing(self):
+        """
+        Forget every list of indices, so that each is fetched again on next
+        use.  Index data which is already loaded is kept.
+        """
+        self.loggit.debug('Index list is stale')
+        self.all_indices = None
+        self.listings.clear()
+
+    def invalidate(self, action, indices=None):
+        """
+        Drop any data which `action` may have changed for `indices`.
+
+        :arg action: The name of the action which was performed
+        :arg indices: The indices the action was performed on
+        :type indices: list
+        """
+        indices = ensure_list(indices) if indices else []
+        cache = get_index_cache(self.client)
+        if cache:
+            # Cached index data must be checked against the cluster again
+            cache.invalidate()
+        if action == 'delete_indices':
+            self.loggit.debug(
+                'Forgetting {0} deleted indices'.format(len(indices)))
+            for index in indices:
+                self.index_info.pop(index, None)
+                self.no_creation_date.discard(index)
+            for group in self.data_loaded:
+                self.data_loaded[group].difference_update(indices)
+            deleted = set(indices)
+            if self.all_indices is not None:
+                self.all_indices = [
+                    i for i in self.all_indices if i not in deleted]
+            for pattern in self.listings:
+                self.listings[pattern] = [
+                    i for i in self.listings[pattern] if i not in deleted]
+            return
+        groups = {
+            'allocation': ['metadata'],
+            'close': ['metadata', 'stats'],
+            'forcemerge': ['stats', 'segments', 'shard_segments'],
+            'open': ['metadata', 'stats'],
+            'replicas': ['metadata'],
+        }
+        if action in groups:
+            self.loggit.debug(
+                'Invalidating {0} data for {1} indices'.format(
+                    groups[action], len(indices))
+            )
+            for group in groups[action]:
+                self.data_loaded[group].difference_update(indices)
+        elif action == 'create_index':
+            self.reset_listing()
+        elif action == 'restore':
+            # Restored indices may be renamed, or replace existing ones
+            self.loggit.debug('All index data is stale after restore')
+            self.reset_listing()
+            self.index_info.clear()
+            self.no_creation_date.clear()
+            for group in self.data_loaded:
+                self.data_loaded[group].clear()
@@ -9,7 +9,7 @@ from .config_utils import test_config, set_logging
 from .exceptions import *
 from .utils import *
 from .indexlist import IndexList
-from .snapshotlist import SnapshotList
+from .snapshotlist import snapshot_lists
 from .actions import *
 from ._version import __version__
 
@@ -103,6 +103,21 @@ def _do_filters(list_object, filters, ignore=False):
             )
             sys.exit(1)
 
+def _snapshot_lists(client, repository, filters, ignore=False):
+    """
+    Return the filtered snapshot list of each repository matching
+    `repository`, exiting as `_do_filters` does if none have snapshots left.
+    """
+    logger = logging.getLogger(__name__)
+    slos = snapshot_lists(client, repository, filters=filters)
+    if not slos:
+        if ignore:
+            logger.info('Singleton action not performed: empty snapshot list')
+            sys.exit(0)
+        else:
+            logger.error('Singleton action failed due to empty snapshot list')
+            sys.exit(1)
+    return slos
 
 def _prune_excluded(option_dict):
     for k in list(option_dict.keys()):
@@ -157,6 +172,18 @@ def config_override(ctx, config_dict):
 @click.option(
     '--wait_for_completion', is_flag=True, help='Wait for operation to complete'
 )
+@click.option(
+    '--wait_interval', type=int,
+    help='Seconds between completion checks. Default 9, maximum 30'
+)
+@click.option(
+    '--max_wait', type=int,
+    help='Maximum seconds to wait for completion. Default: client timeout'
+)
+@click.option(
+    '--max_relocating_shards', type=int,
+    help='Move indices in rolling waves of at most this many shards'
+)
 @click.option(
     '--ignore_empty_list', is_flag=True,
     help='Do not raise exception if there are no actionable indices'
@@ -167,8 +194,8 @@ def config_override(ctx, config_dict):
 )
 @click.pass_context
 def allocation_singleton(
-    ctx, key, value, allocation_type, wait_for_completion, ignore_empty_list,
-    filter_list):
+    ctx, key, value, allocation_type, wait_for_completion, wait_interval,
+    max_wait, max_relocating_shards, ignore_empty_list, filter_list):
     """
     Shard Routing Allocation
     """
@@ -182,17 +209,21 @@ def allocation_singleton(
         'value': value,
         'allocation_type': allocation_type,
         'wait_for_completion': wait_for_completion,
+        'wait_interval': wait_interval,
+        'max_wait': max_wait,
+        'max_relocating_shards': max_relocating_shards,
     }
     logger.debug('Validating provided options: {0}'.format(raw_options))
     mykwargs = option_schema_check(action, raw_options)
-    mykwargs.update(
-        { 'timeout': c_args['timeout'] if c_args['timeout'] else 30 }
-    )
+    # Unless max_wait is set, wait no longer than the client timeout
+    mykwargs.setdefault(
+        'max_wait', c_args['timeout'] if c_args['timeout'] else 30)
     logger.debug('Validating provided filters: {0}'.format(filter_list))
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -230,7 +261,8 @@ def close_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -263,7 +295,8 @@ def delete_indices_singleton(ctx, ignore_empty_list, filter_list):
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -272,7 +305,9 @@ def delete_indices_singleton(ctx, ignore_empty_list, filter_list):
 
 @click.command(name='delete_snapshots')
 @click.option(
-    '--repository', type=str, required=True, help='Snapshot repository name'
+    '--repository', type=str, required=True,
+    help='Snapshot repository name, or a comma-separated list of names or '
+        'wildcard patterns'
 )
 @click.option(
     '--retry_count', type=int, help='Number of times to retry (max 3)'
@@ -312,14 +347,30 @@ def delete_snapshots_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    slo = SnapshotList(client, repository=repository)
-    _do_filters(slo, clean_filters, ignore_empty_list)
-    action_obj = action_class(slo, **mykwargs)
+    slos = _snapshot_lists(
+        client, repository, clean_filters, ignore_empty_list)
+    action_obj = action_class(slos, **mykwargs)
     ### Do the action
     _actionator(action, action_obj, dry_run=ctx.parent.params['dry_run'])
 
 
 @click.command(name='open')
+@click.option(
+    '--batch_size', type=int,
+    help='Number of indices to open at once, waiting for their recovery'
+)
+@click.option(
+    '--max_initializing_shards', type=int,
+    help='Open the next batch when no more shards than this are initializing'
+)
+@click.option(
+    '--wait_interval', type=int,
+    help='Seconds between recovery checks. Default 9, maximum 30'
+)
+@click.option(
+    '--max_wait', type=int,
+    help='Maximum seconds to wait for each batch. Default -1 (no limit)'
+)
 @click.option(
     '--ignore_empty_list', is_flag=True,
     help='Do not raise exception if there are no actionable indices'
@@ -330,7 +381,8 @@ def delete_snapshots_singleton(
 )
 @click.pass_context
 def open_singleton(
-    ctx, ignore_empty_list, filter_list):
+    ctx, batch_size, max_initializing_shards, wait_interval, max_wait,
+    ignore_empty_list, filter_list):
     """
     Open indices
     """
@@ -339,13 +391,22 @@ def open_singleton(
     c_args = ctx.obj['config']['client']
     client = get_client(**c_args)
     logger = logging.getLogger(__name__)
+    raw_options = {
+        'batch_size': batch_size,
+        'max_initializing_shards': max_initializing_shards,
+        'wait_interval': wait_interval,
+        'max_wait': max_wait,
+    }
+    logger.debug('Validating provided options: {0}'.format(raw_options))
+    mykwargs = option_schema_check(action, raw_options)
     logger.debug('Validating provided filters: {0}'.format(filter_list))
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
-    action_obj = action_class(ilo)
+    action_obj = action_class(ilo, **mykwargs)
     ### Do the action
     _actionator(action, action_obj, dry_run=ctx.parent.params['dry_run'])
 
@@ -359,6 +420,14 @@ def open_singleton(
     '--delay', type=float,
     help='Time in seconds to delay between operations. Default 0, maximum 3600'
 )
+@click.option(
+    '--max_concurrent_merges', type=int,
+    help='Number of indices to forceMerge at once. Default 1, maximum 64'
+)
+@click.option(
+    '--max_merges_per_node', type=int,
+    help='Number of concurrent forceMerges per node. Default 1, maximum 16'
+)
 @click.option(
     '--ignore_empty_list', is_flag=True,
     help='Do not raise exception if there are no actionable indices'
@@ -369,7 +438,8 @@ def open_singleton(
 )
 @click.pass_context
 def forcemerge_singleton(
-    ctx, max_num_segments, delay, ignore_empty_list, filter_list):
+    ctx, max_num_segments, delay, max_concurrent_merges, max_merges_per_node,
+    ignore_empty_list, filter_list):
     """
     forceMerge index/shard segments
     """
@@ -381,6 +451,8 @@ def forcemerge_singleton(
     raw_options = {
         'max_num_segments': max_num_segments,
         'delay': delay,
+        'max_concurrent_merges': max_concurrent_merges,
+        'max_merges_per_node': max_merges_per_node,
     }
     logger.debug('Validating provided options: {0}'.format(raw_options))
     mykwargs = option_schema_check(action, raw_options)
@@ -388,7 +460,8 @@ def forcemerge_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -402,6 +475,18 @@ def forcemerge_singleton(
 @click.option(
     '--wait_for_completion', is_flag=True, help='Wait for operation to complete'
 )
+@click.option(
+    '--wait_interval', type=int,
+    help='Seconds between completion checks. Default 9, maximum 30'
+)
+@click.option(
+    '--max_wait', type=int,
+    help='Maximum seconds to wait for completion. Default: client timeout'
+)
+@click.option(
+    '--batch_size', type=int,
+    help='Maximum number of indices to wait for at once'
+)
 @click.option(
     '--ignore_empty_list', is_flag=True,
     help='Do not raise exception if there are no actionable indices'
@@ -412,7 +497,8 @@ def forcemerge_singleton(
 )
 @click.pass_context
 def replicas_singleton(
-    ctx, count, wait_for_completion, ignore_empty_list, filter_list):
+    ctx, count, wait_for_completion, wait_interval, max_wait, batch_size,
+    ignore_empty_list, filter_list):
     """
     Change replica count
     """
@@ -424,14 +510,21 @@ def replicas_singleton(
     raw_options = {
         'count': count,
         'wait_for_completion': wait_for_completion,
+        'wait_interval': wait_interval,
+        'max_wait': max_wait,
+        'batch_size': batch_size,
     }
     logger.debug('Validating provided options: {0}'.format(raw_options))
     mykwargs = option_schema_check(action, raw_options)
+    # Unless max_wait is set, wait no longer than the client timeout
+    mykwargs.setdefault(
+        'max_wait', c_args['timeout'] if c_args['timeout'] else 30)
     logger.debug('Validating provided filters: {0}'.format(filter_list))
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -463,10 +556,26 @@ def replicas_singleton(
     type=bool, show_default=True, default=True,
     help='Wait for operation to complete'
 )
+@click.option(
+    '--wait_interval', type=int,
+    help='Seconds between completion checks. Default 9, maximum 30'
+)
+@click.option(
+    '--max_wait', type=int,
+    help='Maximum seconds to wait for completion. Default -1 (no limit)'
+)
 @click.option(
     '--skip_repo_fs_check', is_flag=True, expose_value=True,
     help='Skip repository filesystem access validation.'
 )
+@click.option(
+    '--retry_count', type=int,
+    help='Number of retry_interval periods to wait for a running snapshot'
+)
+@click.option(
+    '--retry_interval', type=int,
+    help='Maximum time in seconds between checks for a running snapshot'
+)
 @click.option(
     '--ignore_empty_list', is_flag=True,
     help='Do not raise exception if there are no actionable indices'
@@ -478,7 +587,8 @@ def replicas_singleton(
 @click.pass_context
 def snapshot_singleton(
     ctx, repository, name, ignore_unavailable, include_global_state, partial,
-    skip_repo_fs_check, wait_for_completion, ignore_empty_list, filter_list):
+    skip_repo_fs_check, wait_for_completion, wait_interval, max_wait,
+    retry_count, retry_interval, ignore_empty_list, filter_list):
     """
     Snapshot indices
     """
@@ -495,6 +605,10 @@ def snapshot_singleton(
         'partial': partial,
         'skip_repo_fs_check': skip_repo_fs_check,
         'wait_for_completion': wait_for_completion,
+        'wait_interval': wait_interval,
+        'max_wait': max_wait,
+        'retry_count': retry_count,
+        'retry_interval': retry_interval,
     }
     logger.debug('Validating provided options: {0}'.format(raw_options))
     mykwargs = option_schema_check(action, raw_options)
@@ -502,7 +616,8 @@ def snapshot_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
     action_obj = action_class(ilo, **mykwargs)
     ### Do the action
@@ -539,8 +654,10 @@ def show_indices_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    ilo = IndexList(client)
+    ilo = IndexList(client, lazy=True,
+        search_pattern=get_search_pattern(clean_filters['filters']))
     _do_filters(ilo, clean_filters, ignore_empty_list)
+    ilo.load_data('metadata', 'stats')
     indices = sorted(ilo.indices)
     # Do some calculations to figure out the proper column sizes
     allbytes = []
@@ -591,7 +708,9 @@ def show_indices_singleton(
 
 @click.command(name='show_snapshots')
 @click.option(
-    '--repository', type=str, required=True, help='Snapshot repository name'
+    '--repository', type=str, required=True,
+    help='Snapshot repository name, or a comma-separated list of names or '
+        'wildcard patterns'
 )
 @click.option(
     '--ignore_empty_list', is_flag=True,
@@ -615,11 +734,16 @@ def show_snapshots_singleton(
     clean_filters = {
         'filters': filter_schema_check(action, filter_list)
     }
-    slo = SnapshotList(client, repository=repository)
-    _do_filters(slo, clean_filters, ignore_empty_list)
-    snapshots = sorted(slo.snapshots)
-    for idx in snapshots:
-        click.secho('{0}'.format(idx))
+    slos = _snapshot_lists(
+        client, repository, clean_filters, ignore_empty_list)
+    # Name the repository too, if several could match
+    several = ',' in repository or '*' in repository
+    for slo in slos:
+        for idx in sorted(slo.snapshots):
+            if several:
+                click.secho('{0}/{1}'.format(slo.repository, idx))
+            else:
+                click.secho('{0}'.format(idx))
 
 
 @click.group()
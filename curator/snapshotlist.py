@@ -1,13 +1,71 @@
 from datetime import timedelta, datetime, date
+from array import array
+import copy
+import fnmatch
 import time
 import re
 import logging
+import sqlite3
 from .defaults import settings
 from .validators import SchemaCheck, filters
 from .exceptions import *
 from .utils import *
 
 
+class SnapshotRecord(object):
+    """
+    The catalog entry of one snapshot in :class:`SnapshotList`.  Fields can
+    also be read and set by key, as with the raw snapshot dictionaries, e.g.
+    ``record['state']``.  ``indices`` holds integer index ids, or `None` if
+    they have not been loaded, but ``record['indices']`` returns the index
+    names, fetching them first if needed.  See
+    :mod:`curator.snapshotlist.SnapshotList.snapshot_indices`.
+    """
+    __slots__ = (
+        'snapshot', 'state', 'start_time_in_millis', 'end_time_in_millis',
+        'age_by_name', 'indices', 'snapshot_list',
+    )
+
+    def __init__(self, snapshot, state=None, start_time_in_millis=None,
+        end_time_in_millis=None, snapshot_list=None):
+        self.snapshot = snapshot
+        self.state = state
+        self.start_time_in_millis = start_time_in_millis
+        self.end_time_in_millis = end_time_in_millis
+        self.age_by_name = None
+        self.indices = None
+        self.snapshot_list = snapshot_list
+
+    def __getitem__(self, key):
+        if key == 'indices' and self.snapshot_list is not None:
+            return self.snapshot_list.snapshot_indices(self.snapshot)
+        if key not in self or key == 'indices':
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self or key == 'indices':
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        if key == 'indices':
+            return self.snapshot_list is not None
+        return key in self.__slots__ and key != 'snapshot_list'
+
+    def get(self, key, default=None):
+        """
+        Return the value of `key`, as with :meth:`dict.get`.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return 'SnapshotRecord({0}, {1})'.format(self.snapshot, self.state)
+
+
 class SnapshotList(object):
     def __init__(self, client, repository=None):
         verify_client_object(client)
@@ -28,19 +86,86 @@ class SnapshotList(object):
         #: Instance variable.
         #: Information extracted from snapshots, such as age, etc.
         #: Populated by internal method `__get_snapshots` at instance creation
-        #: time. **Type:** ``dict()``
+        #: time. **Type:** ``dict()`` of
+        #: :class:`curator.snapshotlist.SnapshotRecord`
         self.snapshot_info = {}
         #: Instance variable.
-        #: The running list of snapshots which will be used by an Action class.
-        #: Populated by internal methods `__get_snapshots` at instance creation
-        #: time. **Type:** ``list()``
-        self.snapshots = []
+        #: The name of each index id used in
+        #: :class:`curator.snapshotlist.SnapshotRecord` ``indices``.
+        #: **Type:** ``list()``
+        self.index_names = []
+        #: Instance variable.
+        #: The id of each index name in `index_names`.  **Type:** ``dict()``
+        self.index_ids = {}
+        #: Instance variable.
+        #: The names of all snapshots, oldest first by ``start_time_in_millis``.
+        #: Positions in this list are the snapshot ids used in
+        #: `index_snapshots`.  `None` until built by `build_index_map`.
+        #: **Type:** ``list()``
+        self.snapshot_order = None
+        #: Instance variable.
+        #: The ids of the snapshots containing each index id, in ascending
+        #: order, so the last is the newest.  `None` until built by
+        #: `build_index_map`. **Type:** ``dict()`` of ``array('i')``
+        self.index_snapshots = None
         #: Instance variable.
-        #: Raw data dump of all snapshots in the repository at instance creation
-        #: time.  **Type:** ``list()`` of ``dict()`` data.
+        #: Snapshots marked not actionable, but not yet dropped from
+        #: `snapshots`.  Marking is O(1); the list is compacted in a single
+        #: pass the next time `snapshots` is read. **Type:** ``set()``
+        self._removed = set()
+        self._snapshots = []
         self.__get_snapshots()
 
 
+    @property
+    def snapshots(self):
+        """
+        The running list of snapshots which will be used by an Action class.
+        Populated by internal methods `__get_snapshots` at instance creation
+        time. **Type:** ``list()``
+        """
+        if self._removed:
+            self._snapshots[:] = [
+                s for s in self._snapshots if s not in self._removed]
+            self._removed.clear()
+        return self._snapshots
+
+    @snapshots.setter
+    def snapshots(self, value):
+        self._removed.clear()
+        self._snapshots = value
+
+    @property
+    def all_snapshots(self):
+        """
+        Deprecated.  A list of dictionaries of every snapshot in the
+        repository, oldest first, with the keys ``snapshot``, ``state``,
+        ``start_time_in_millis``, ``end_time_in_millis`` and ``indices``.  It
+        is built on each read, and loads the indices of every snapshot.  Use
+        `snapshot_info` and
+        :mod:`curator.snapshotlist.SnapshotList.snapshot_indices` instead.
+        """
+        self.loggit.warn(
+            '"all_snapshots" is deprecated.  Use "snapshot_info" and '
+            '"snapshot_indices()" instead.'
+        )
+        self.load_indices(list(self.snapshot_info.keys()))
+        order = sorted(
+            self.snapshot_info.keys(),
+            key=lambda s: (self.snapshot_info[s].start_time_in_millis or 0, s)
+        )
+        return [
+            {
+                'snapshot': s,
+                'state': self.snapshot_info[s].state,
+                'start_time_in_millis':
+                    self.snapshot_info[s].start_time_in_millis,
+                'end_time_in_millis': self.snapshot_info[s].end_time_in_millis,
+                'indices': self.snapshot_indices(s),
+            }
+            for s in order
+        ]
+
     def __actionable(self, snap):
         self.loggit.debug(
             'Snapshot {0} is actionable and remains in the list.'.format(snap))
@@ -50,7 +175,7 @@ class SnapshotList(object):
                 'Snapshot {0} is not actionable, removing from '
                 'list.'.format(snap)
             )
-            self.snapshots.remove(snap)
+            self._removed.add(snap)
 
     def __excludify(self, condition, exclude, snap, msg=None):
         if condition == True:
@@ -73,19 +198,182 @@ class SnapshotList(object):
     def __get_snapshots(self):
         """
         Pull all snapshots into `snapshots` and populate
-        `snapshot_info`
+        `snapshot_info`.  The indices of each snapshot are left out of the
+        response, and only fetched if needed.
         """
-        self.all_snapshots = get_snapshot_data(self.client, self.repository)
-        for list_item in self.all_snapshots:
+        states = {}
+        snapshots = None
+        catalog = get_snapshot_catalog(self.client)
+        if catalog:
+            try:
+                snapshots = catalog.snapshots(self.repository)
+            except (sqlite3.Error, OSError) as e:
+                self.loggit.warn(
+                    'Unable to use the snapshot catalog: {0}'.format(e))
+        if snapshots is None:
+            snapshots = get_snapshot_data(
+                self.client, self.repository,
+                filter_path=settings.filter_paths()['snapshot_catalog']
+            )
+        for list_item in snapshots:
             if 'snapshot' in list_item.keys():
-                self.snapshots.append(list_item['snapshot'])
-                self.snapshot_info[list_item['snapshot']] = list_item
+                state = list_item.get('state')
+                record = SnapshotRecord(
+                    list_item['snapshot'],
+                    state=states.setdefault(state, state),
+                    start_time_in_millis=list_item.get('start_time_in_millis'),
+                    end_time_in_millis=list_item.get('end_time_in_millis'),
+                    snapshot_list=self,
+                )
+                # Only if the server did not apply filter_path
+                if 'indices' in list_item:
+                    record.indices = self.__intern(list_item['indices'])
+                self.snapshots.append(record.snapshot)
+                self.snapshot_info[record.snapshot] = record
+        self.loggit.debug(
+            'Loaded {0} snapshots from repository {1}'.format(
+                len(self.snapshot_info), self.repository)
+        )
         self.empty_list_check()
 
+    def __intern(self, indices):
+        """
+        Return `indices` as an array of index ids, adding new names to
+        `index_names`.
+        """
+        ids = array('i')
+        for index in indices:
+            if not index in self.index_ids:
+                self.index_ids[index] = len(self.index_names)
+                self.index_names.append(index)
+            ids.append(self.index_ids[index])
+        return ids
+
+    def load_indices(self, snapshots=None):
+        """
+        Fetch the indices of each of `snapshots` which have not yet been
+        loaded.
+
+        :arg snapshots: A list of snapshot names.  Defaults to `snapshots`
+        """
+        if snapshots is None:
+            snapshots = self.snapshots
+        missing = [
+            s for s in snapshots if self.snapshot_info[s].indices is None]
+        if not missing:
+            return
+        self.loggit.debug(
+            'Loading indices of {0} snapshots'.format(len(missing)))
+        def get_indices(l):
+            return get_snapshot(
+                self.client, self.repository, to_csv(l),
+                filter_path=settings.filter_paths()['snapshot_indices']
+            ).get('snapshots', [])
+        if len(missing) == len(self.snapshot_info):
+            # One request for the whole repository, not one per chunk
+            responses = [get_indices(['_all'])]
+        else:
+            responses = chunk_requests(
+                self.client, get_indices, chunk_index_list(missing))
+        for response in responses:
+            for item in response:
+                if item.get('snapshot') in self.snapshot_info:
+                    self.snapshot_info[item['snapshot']].indices = (
+                        self.__intern(item.get('indices', [])))
+
+    def snapshot_indices(self, snapshot):
+        """
+        Return the names of the indices in `snapshot`, fetching them first if
+        needed.
+
+        :arg snapshot: The snapshot name
+        :rtype: list
+        """
+        self.load_indices([snapshot])
+        ids = self.snapshot_info[snapshot].indices or []
+        return [self.index_names[i] for i in ids]
+
+    def build_index_map(self):
+        """
+        Build `snapshot_order` and `index_snapshots`, the map from each index
+        to the snapshots which contain it, loading the indices of every
+        snapshot in the repository first.  This is only done once, so
+        later lookups only read the snapshots of the indices asked for.
+        """
+        if self.index_snapshots is not None:
+            return
+        self.load_indices(list(self.snapshot_info.keys()))
+        order = sorted(
+            self.snapshot_info.keys(),
+            key=lambda s: (self.snapshot_info[s].start_time_in_millis or 0, s)
+        )
+        index_snapshots = {}
+        for position, snapshot in enumerate(order):
+            for index_id in set(self.snapshot_info[snapshot].indices or []):
+                if not index_id in index_snapshots:
+                    index_snapshots[index_id] = array('i')
+                index_snapshots[index_id].append(position)
+        self.snapshot_order = order
+        self.index_snapshots = index_snapshots
+        self.loggit.debug(
+            'Mapped {0} indices to {1} snapshots'.format(
+                len(index_snapshots), len(order))
+        )
+
+    def matching_indices(self, indices):
+        """
+        Return the ids of the indices in any snapshot in the repository which
+        match each of `indices`, as a list of sets, one per entry.
+
+        :arg indices: A list of index names or wildcard patterns, e.g.
+            ``logstash-2017.01.*``
+        :rtype: list
+        """
+        self.build_index_map()
+        retval = []
+        for entry in ensure_list(indices):
+            if entry in self.index_ids:
+                retval.append(set([self.index_ids[entry]]))
+            else:
+                retval.append(set(
+                    self.index_ids[name] for name in
+                    fnmatch.filter(self.index_names, entry)
+                ))
+        return retval
+
+    def newest_snapshots(self, indices, states=None):
+        """
+        Return the newest snapshot in `snapshots` which contains each index
+        matching `indices`, as a dictionary of snapshot names by index name.
+        Indices which are in no such snapshot are left out.
+
+        :arg indices: A list of index names or wildcard patterns
+        :arg states: Only use snapshots in one of these states, e.g.
+            ``['SUCCESS']``.  Default is any state.
+        :rtype: dict
+        """
+        actionable = set(
+            s for s in self.snapshots
+            if states is None or self.snapshot_info[s]['state'] in states
+        )
+        matched = set()
+        for ids in self.matching_indices(indices):
+            matched.update(ids)
+        retval = {}
+        for index_id in matched:
+            # Newest first, stopping at the first usable snapshot
+            for position in reversed(self.index_snapshots.get(index_id, [])):
+                if self.snapshot_order[position] in actionable:
+                    retval[self.index_names[index_id]] = (
+                        self.snapshot_order[position])
+                    break
+        return retval
+
     def __map_method(self, ft):
         methods = {
             'age': self.filter_by_age,
             'count': self.filter_by_count,
+            'indices': self.filter_by_indices,
             'none': self.filter_none,
             'pattern': self.filter_by_regex,
             'state': self.filter_by_state,
@@ -277,7 +565,7 @@ class SnapshotList(object):
         for snapshot in self.working_list():
             if not self.snapshot_info[snapshot][self.age_keyfield]:
                 self.loggit.debug('Removing snapshot {0} for having no age')
-                self.snapshots.remove(snapshot)
+                self.__not_actionable(snapshot)
                 continue
             msg = (
                 'Snapshot "{0}" age ({1}), direction: "{2}", point of '
@@ -321,6 +609,48 @@ class SnapshotList(object):
             else:
                 self.__excludify(False, exclude, snapshot)
 
+    def filter_by_indices(self, indices=None, match='any', exclude=False):
+        """
+        Filter out snapshots which do not contain any (or all) of `indices`,
+        or in the case of exclude, filter those which do.
+
+        :arg indices: A list of index names or wildcard patterns, e.g.
+            ``logstash-2017.01.*``
+        :arg match: ``any`` to match snapshots with any of `indices`, or
+            ``all`` to match only snapshots with an index matching each entry
+            of `indices`.  Default is ``any``
+        :arg exclude: If `exclude` is `True`, this filter will remove matching
+            snapshots from `snapshots`. If `exclude` is `False`, then only
+            matching snapshots will be kept in `snapshots`.
+            Default is `False`
+        """
+        if not indices:
+            raise MissingArgument('No value for "indices" provided')
+        if match not in ['any', 'all']:
+            raise ValueError('{0}: Invalid value for match'.format(match))
+        self.empty_list_check()
+        def containing(index_ids):
+            positions = set()
+            for index_id in index_ids:
+                positions.update(self.index_snapshots.get(index_id, []))
+            return positions
+        groups = [containing(ids) for ids in self.matching_indices(indices)]
+        if match == 'any':
+            positions = set().union(*groups)
+        else:
+            # Intersect starting from the smallest set
+            groups.sort(key=len)
+            positions = groups[0]
+            for group in groups[1:]:
+                positions = positions.intersection(group)
+        matched = set(self.snapshot_order[p] for p in positions)
+        self.loggit.debug(
+            'Filter by indices: {0} snapshots contain {1} of {2}'.format(
+                len(matched), match, indices)
+        )
+        for snapshot in self.working_list():
+            self.__excludify(snapshot in matched, exclude, snapshot)
+
     def filter_none(self):
         self.loggit.debug('"None" filter selected.  No filtering will be done.')
 
@@ -435,3 +765,33 @@ class SnapshotList(object):
             logger.debug('Pre-instance: {0}'.format(self.snapshots))
             method(**f)
             logger.debug('Post-instance: {0}'.format(self.snapshots))
+
+def snapshot_lists(client, repositories, filters=None):
+    """
+    Return a :class:`curator.snapshotlist.SnapshotList` of each repository
+    matching `repositories`, as a list sorted by repository name.  The
+    repositories are listed, and `filters` applied to each, concurrently, up
+    to ``max_concurrent_requests`` at a time.  Repositories which have no
+    snapshots, or none left after filtering, are left out.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repositories: A repository name or wildcard pattern, or a list or
+        comma-separated string of them
+    :arg filters: A dictionary of filters, as passed to
+        :mod:`curator.snapshotlist.SnapshotList.iterate_filters`
+    :rtype: list
+    """
+    names = get_repositories(client, repositories)
+    def load(repository):
+        try:
+            slo = SnapshotList(client, repository=repository)
+            if filters:
+                # iterate_filters consumes its filters
+                slo.iterate_filters(copy.deepcopy(filters))
+            slo.empty_list_check()
+            return slo
+        except NoSnapshots:
+            logging.getLogger('curator.snapshotlist').info(
+                'No actionable snapshots in repository {0}'.format(repository))
+            return None
+    return [slo for slo in chunk_requests(client, load, names) if slo]
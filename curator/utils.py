@@ -2,7 +2,12 @@ from datetime import timedelta, datetime, date
 import elasticsearch
 import time
 import logging
+import threading
+import weakref
 import yaml, os, re, sys
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from voluptuous import Schema
 from .exceptions import *
 from .defaults import settings
@@ -10,6 +15,24 @@ from .validators import SchemaCheck, actions, filters, options
 from ._version import __version__
 logger = logging.getLogger(__name__)
 
+# The max_concurrent_requests setting of each client made by get_client
+_MAX_CONCURRENT_REQUESTS = weakref.WeakKeyDictionary()
+# The max_concurrent_master_requests setting of each client made by
+# get_client, with the semaphore enforcing it
+_MASTER_REQUEST_LIMITS = weakref.WeakKeyDictionary()
+_MASTER_REQUEST_LIMITS_LOCK = threading.Lock()
+# Response size counters of each client made by get_client
+_RESPONSE_SIZES = weakref.WeakKeyDictionary()
+# Version, node identity and feature flags of each client
+_CAPABILITIES = weakref.WeakKeyDictionary()
+# The on-disk index data cache of each client made by get_client
+_INDEX_CACHES = weakref.WeakKeyDictionary()
+# The on-disk snapshot catalog of each client made by get_client
+_SNAPSHOT_CATALOGS = weakref.WeakKeyDictionary()
+# Actions waiting to start a snapshot or snapshot delete, for each client
+_SNAPSHOT_QUEUES = weakref.WeakKeyDictionary()
+_SNAPSHOT_QUEUES_LOCK = threading.Lock()
+
 def read_file(myfile):
     """
     Read a file and return the resulting data.
@@ -362,17 +385,402 @@ def chunk_index_list(indices):
     chunks.append(chunk.split(','))
     return chunks
 
-def get_indices(client):
+def get_max_concurrent_requests(client):
+    """
+    Return the number of requests which may be sent concurrently with
+    `client`, as set by the ``max_concurrent_requests`` client option.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: int
+    """
+    return _MAX_CONCURRENT_REQUESTS.get(client, 1)
+
+def set_max_concurrent_requests(client, value):
+    """
+    Set the number of requests which may be sent concurrently with `client`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg value: The number of concurrent requests.  ``1`` means serial.
+    :rtype: None
+    """
+    _MAX_CONCURRENT_REQUESTS[client] = int(value)
+
+def get_index_cache(client):
+    """
+    Return the :class:`curator.cache.IndexCache` of `client`, as set by the
+    ``cache_dir`` client option, or `None` if index data is not cached.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: :class:`curator.cache.IndexCache`
+    """
+    return _INDEX_CACHES.get(client)
+
+def set_index_cache(client, cache):
+    """
+    Set the :class:`curator.cache.IndexCache` used by every IndexList of
+    `client`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg cache: A :class:`curator.cache.IndexCache`, or `None` to stop caching
+    :rtype: None
+    """
+    if cache is None:
+        _INDEX_CACHES.pop(client, None)
+    else:
+        _INDEX_CACHES[client] = cache
+
+def get_snapshot_catalog(client):
+    """
+    Return the :class:`curator.cache.SnapshotCatalog` of `client`, as set by
+    the ``cache_dir`` client option, or `None` if snapshots are not cached.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: :class:`curator.cache.SnapshotCatalog`
+    """
+    return _SNAPSHOT_CATALOGS.get(client)
+
+def set_snapshot_catalog(client, catalog):
+    """
+    Set the :class:`curator.cache.SnapshotCatalog` used by every SnapshotList
+    of `client`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg catalog: A :class:`curator.cache.SnapshotCatalog`, or `None` to stop
+        caching
+    :rtype: None
+    """
+    if catalog is None:
+        _SNAPSHOT_CATALOGS.pop(client, None)
+    else:
+        _SNAPSHOT_CATALOGS[client] = catalog
+
+def chunk_requests(client, request, chunks):
+    """
+    Call `request` once for each chunk in `chunks`, with up to
+    ``max_concurrent_requests`` calls in flight at once, and return the
+    results in the same order as `chunks`.
+
+    Results should be merged by the caller, in the calling thread, so the
+    outcome does not depend on which response arrives first.  If any call
+    raises an exception, calls which have not yet started are skipped, and
+    the exception is raised once the calls already in flight are done.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg request: A function taking one chunk, which makes the request
+    :arg chunks: A list of chunks, usually from
+        :mod:`curator.utils.chunk_index_list`
+    :rtype: list
+    """
+    workers = min(get_max_concurrent_requests(client), len(chunks))
+    if workers <= 1:
+        return [request(chunk) for chunk in chunks]
+    logger.debug(
+        'Sending {0} requests, {1} at a time'.format(len(chunks), workers))
+    cancelled = threading.Event()
+    def do_request(chunk):
+        if cancelled.is_set():
+            return None
+        try:
+            return request(chunk)
+        except Exception:
+            cancelled.set()
+            raise
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(do_request, chunks, 1)
+    finally:
+        pool.terminate()
+
+def get_max_concurrent_master_requests(client):
+    """
+    Return the number of requests which change cluster state that may be sent
+    concurrently with `client`, as set by the
+    ``max_concurrent_master_requests`` client option.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: int
+    """
+    return _MASTER_REQUEST_LIMITS.get(client, (1, None))[0]
+
+def set_max_concurrent_master_requests(client, value):
+    """
+    Set the number of requests which change cluster state that may be sent
+    concurrently with `client`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg value: The number of concurrent requests.  ``1`` means serial.
+    :rtype: None
+    """
+    value = int(value)
+    with _MASTER_REQUEST_LIMITS_LOCK:
+        _MASTER_REQUEST_LIMITS[client] = (
+            value, threading.BoundedSemaphore(value))
+
+@contextmanager
+def master_request(client):
+    """
+    Hold one of the ``max_concurrent_master_requests`` slots of `client` for
+    the body of the ``with`` statement.  Requests which are processed by the
+    elected master, such as opening, closing or deleting indices and updating
+    index settings, should be sent inside it.  Other requests sent by the same
+    :mod:`curator.utils.execute_chunks` call, such as flushes, still overlap.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    """
+    with _MASTER_REQUEST_LIMITS_LOCK:
+        if not client in _MASTER_REQUEST_LIMITS:
+            _MASTER_REQUEST_LIMITS[client] = (1, threading.BoundedSemaphore(1))
+        semaphore = _MASTER_REQUEST_LIMITS[client][1]
+    with semaphore:
+        yield
+
+def _retriable(exception):
+    """
+    Return `True` if a request which raised `exception` may succeed if sent
+    again: the connection failed, or the cluster was too busy to answer.
+    """
+    if isinstance(exception, elasticsearch.ConnectionError):
+        return True
+    if isinstance(exception, elasticsearch.TransportError):
+        return exception.status_code in [429, 503, 504]
+    return False
+
+def execute_chunks(client, request, chunks, description, retry_count=2,
+    retry_interval=1):
+    """
+    Call `request` once for each chunk in `chunks`, with up to
+    ``max_concurrent_requests`` calls in flight at once, and return the
+    results in the same order as `chunks`.
+
+    Calls which fail with a connection error, or with status 429, 503 or 504,
+    are retried up to `retry_count` times, pausing `retry_interval` seconds
+    before the first retry and doubling after each.  Unlike
+    :mod:`curator.utils.chunk_requests`, a failed chunk does not stop the
+    others.  Once every chunk has been tried, a single
+    :class:`curator.exceptions.FailedExecution` is raised listing every chunk
+    which failed, if any did.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg request: A function taking one chunk, which makes the request
+    :arg chunks: A list of chunks, usually from
+        :mod:`curator.utils.chunk_index_list`
+    :arg description: What `request` does, for log and error messages, e.g.
+        ``close``
+    :arg retry_count: Number of times to retry a failed chunk
+    :arg retry_interval: Seconds to wait before the first retry
+    :rtype: list
+    """
+    def attempt(chunk):
+        for count in range(retry_count + 1):
+            try:
+                return request(chunk), None
+            except Exception as e:
+                if count == retry_count or not _retriable(e):
+                    return None, e
+                pause = retry_interval * 2 ** count
+                logger.warn(
+                    'Retrying {0} of {1} indices in {2} seconds after error: '
+                    '{3}'.format(description, len(chunk), pause, e)
+                )
+                time.sleep(pause)
+    outcomes = chunk_requests(client, attempt, chunks)
+    failed = [
+        (chunk, outcome[1]) for chunk, outcome in zip(chunks, outcomes)
+        if outcome[1] is not None
+    ]
+    for chunk, e in failed:
+        logger.error(
+            'Failed to {0} indices {1}: {2}'.format(description, chunk, e))
+    if failed:
+        raise FailedExecution(
+            'Failed to {0} {1} of {2} index chunks ({3} indices).  Errors: '
+            '{4}'.format(
+                description, len(failed), len(chunks),
+                sum([len(chunk) for chunk, _ in failed]),
+                '; '.join(sorted(set([str(e) for _, e in failed])))
+            )
+        )
+    return [outcome[0] for outcome in outcomes]
+
+def _api_name(url):
+    """
+    Return a short name for the API called by `url`, without index names,
+    e.g. ``_cluster/state`` or ``_settings``.
+    """
+    parts = [p for p in url.split('?')[0].split('/') if p]
+    for i, part in enumerate(parts):
+        if part.startswith('_') and part != '_all':
+            if part in ['_cat', '_cluster', '_nodes'] and i + 1 < len(parts):
+                return '/'.join(parts[i:i+2])
+            return part
+    return '/'.join(parts) if parts else 'info'
+
+def count_response_sizes(client):
+    """
+    Count the requests made and response bytes received by `client`, per API
+    and per whether the request used ``filter_path``.  The counts are read
+    with :mod:`curator.utils.get_response_sizes`.
+
+    Each connection is wrapped as it is created, including connections added
+    later by sniffing.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: None
+    """
+    if client in _RESPONSE_SIZES:
+        return
+    counts = {}
+    lock = threading.Lock()
+    wrapped = weakref.WeakSet()
+    def wrap(conn):
+        if conn in wrapped:
+            return
+        perform = conn.perform_request
+        def perform_request(method, url, params=None, *args, **kwargs):
+            status, headers, data = perform(
+                method, url, params, *args, **kwargs)
+            key = (
+                _api_name(url), bool(params and 'filter_path' in params))
+            with lock:
+                if not key in counts:
+                    counts[key] = {'requests': 0, 'bytes': 0}
+                counts[key]['requests'] += 1
+                counts[key]['bytes'] += len(data) if data else 0
+            return status, headers, data
+        conn.perform_request = perform_request
+        wrapped.add(conn)
+    transport = client.transport
+    set_connections = transport.set_connections
+    def wrap_connections(hosts):
+        set_connections(hosts)
+        for conn in transport.connection_pool.connections:
+            wrap(conn)
+    transport.set_connections = wrap_connections
+    for conn in transport.connection_pool.connections:
+        wrap(conn)
+    _RESPONSE_SIZES[client] = counts
+
+def get_response_sizes(client):
+    """
+    Return the response size counters of `client`, if any, as a dictionary.
+    Keys are ``(api, filtered)`` tuples, where `filtered` is `True` if the
+    request used ``filter_path``.  Values are dictionaries with ``requests``
+    and ``bytes`` counts.  These are the bytes received, not the bytes saved
+    by ``filter_path``.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: dict
+    """
+    counts = _RESPONSE_SIZES.get(client, {})
+    return dict((k, dict(v)) for k, v in counts.items())
+
+def log_response_sizes(client):
+    """
+    Log the response size counters of `client`, largest first.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: None
+    """
+    counts = get_response_sizes(client)
+    for key in sorted(counts, key=lambda k: counts[k]['bytes'], reverse=True):
+        logger.info(
+            'Received {0} in {1} {2} response(s){3}'.format(
+                byte_size(counts[key]['bytes']), counts[key]['requests'],
+                key[0], ' requested with filter_path' if key[1] else ''
+            )
+        )
+
+def _literal_prefix(value):
+    """
+    Return the literal text every match of regex `value` must start with.
+    """
+    literal = ''
+    for i, char in enumerate(value):
+        if char in '.^$*+?{}[]\\|()':
+            # The last literal character is optional with these quantifiers
+            if char in '*?{':
+                literal = literal[:-1]
+            break
+        literal += char
+    return literal
+
+def _literal_suffix(value):
+    """
+    Return the literal text every match of regex `value` must end with.
+    """
+    literal = ''
+    for char in reversed(value):
+        if char in '.^$*+?{}[]\\|()':
+            break
+        literal = char + literal
+    return literal
+
+def get_search_pattern(filters):
+    """
+    Return an index expression which matches at least every index the given
+    filters could keep, so that indices which cannot match are never fetched.
+    If no such expression can be found, return ``_all``.
+
+    Only ``pattern`` filters of kind ``prefix``, ``suffix`` or ``timestring``
+    with `exclude` set to `False` are used, and only if they come before any
+    ``count`` or ``space`` filter, as the others do not depend on order.  The
+    expression may match more indices than the filters keep, so the filters
+    must still be run.
+
+    :arg filters: A list of filter dictionaries
+    :rtype: str
+    """
+    prefix = suffix = timestring = None
+    for f in filters:
+        if not isinstance(f, dict):
+            break
+        if f.get('filtertype') in ['count', 'space']:
+            break
+        if f.get('filtertype') != 'pattern' or f.get('exclude', False):
+            continue
+        value = f.get('value')
+        if not value or '|' in value:
+            continue
+        if f.get('kind') == 'prefix' and prefix is None:
+            prefix = _literal_prefix(value)
+        elif f.get('kind') == 'suffix' and suffix is None:
+            suffix = _literal_suffix(value)
+        elif f.get('kind') == 'timestring' and timestring is None:
+            timestring = re.sub(
+                r'%[{0}]'.format(''.join(settings.date_regex())), '*', value)
+            if re.search(r'[\^$+?{}\[\]\\|()]', timestring):
+                timestring = None
+    if prefix or suffix:
+        pattern = (prefix or '') + '*' + (suffix or '')
+    elif timestring:
+        pattern = '*' + timestring + '*'
+    else:
+        return '_all'
+    # Collapse runs of wildcards
+    pattern = re.sub(r'\*+', '*', pattern)
+    # A leading - or + would change the meaning of the index expression
+    if pattern == '*' or pattern[0] in '-+' or ',' in pattern:
+        return '_all'
+    # Make sure a leading wildcard also covers indices starting with a dot
+    if pattern.startswith('*'):
+        pattern = '{0},.{0}'.format(pattern)
+    logger.debug('Index search pattern from filters: {0}'.format(pattern))
+    return pattern
+
+def get_indices(client, search_pattern='_all'):
     """
     Get the current list of indices from the cluster.
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg search_pattern: An index expression limiting which indices are
+        listed.  Default is ``_all``
     :rtype: list
     """
     try:
         indices = list(
             client.indices.get_settings(
-            index='_all', params={'expand_wildcards': 'open,closed'})
+            index=search_pattern, params={'expand_wildcards': 'open,closed'},
+            filter_path=settings.filter_paths()['index_names'])
         )
         version_number = get_version(client)
         logger.debug(
@@ -397,6 +805,31 @@ def get_indices(client):
     except Exception as e:
         raise FailedExecution('Failed to get indices. Error: {0}'.format(e))
 
+def get_shard_nodes(client, indices):
+    """
+    Return the ids of the nodes holding a copy of any shard of each index in
+    `indices`.  Unassigned shards are not counted.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg indices: A list of indices
+    :rtype: dict of set
+    """
+    shard_nodes = dict((index, set()) for index in indices)
+    def request(l):
+        return client.cluster.state(
+            index=to_csv(l), metric='routing_table',
+            filter_path=settings.filter_paths()['shard_nodes']
+        )
+    results = chunk_requests(client, request, chunk_index_list(indices))
+    for result in results:
+        routing = result.get('routing_table', {}).get('indices', {})
+        for index in routing:
+            for copies in routing[index]['shards'].values():
+                for copy in copies:
+                    if copy.get('node'):
+                        shard_nodes[index].add(copy['node'])
+    return shard_nodes
+
 def get_version(client):
     """
     Return the ES version number as a tuple.
@@ -405,25 +838,84 @@ def get_version(client):
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :rtype: tuple
     """
-    version = client.info()['version']['number']
-    version = version.split('-')[0]
-    if len(version.split('.')) > 3:
-        version = version.split('.')[:-1]
-    else:
-       version = version.split('.')
-    return tuple(map(int, version))
+    return get_capabilities(client)['version']
+
+def get_capabilities(client):
+    """
+    Return the capabilities of the cluster `client` is connected to, as a
+    dictionary with the Elasticsearch ``version`` tuple, the ``features``
+    that version supports, and the ``cluster_uuid`` (the cluster name before
+    Elasticsearch 5.0).  These are read with a single ``GET /`` the first time
+    they are needed, normally by :mod:`curator.utils.get_client`, and cached
+    for the life of `client`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: dict
+    """
+    capabilities = _CAPABILITIES.setdefault(client, {})
+    if not 'version' in capabilities:
+        info = client.info()
+        capabilities['cluster_uuid'] = info.get(
+            'cluster_uuid', info.get('cluster_name', ''))
+        version = info['version']['number']
+        version = version.split('-')[0]
+        if len(version.split('.')) > 3:
+            version = version.split('.')[:-1]
+        else:
+           version = version.split('.')
+        version = tuple(map(int, version))
+        capabilities['version'] = version
+        capabilities['features'] = {
+            # optimize was renamed forcemerge in 2.1
+            'forcemerge': version >= (2, 1, 0),
+            # GET _snapshot with verbose=false only lists names, from 5.5
+            'snapshot_names': version >= (5, 5, 0),
+        }
+    return capabilities
+
+def has_feature(client, feature):
+    """
+    Return `True` if the cluster `client` is connected to supports `feature`.
+    See :mod:`curator.utils.get_capabilities`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg feature: The name of a feature flag, e.g. ``forcemerge``
+    :rtype: bool
+    """
+    return get_capabilities(client)['features'][feature]
+
+def get_node_info(client):
+    """
+    Return the ``node_id`` of the node `client` is connected to, and the
+    ``plugins`` installed on it.  These are fetched once, normally by
+    :mod:`curator.utils.get_client`, and cached alongside
+    :mod:`curator.utils.get_capabilities`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: dict
+    """
+    capabilities = _CAPABILITIES.setdefault(client, {})
+    if not 'node_id' in capabilities:
+        nodes = client.nodes.info('_local')['nodes']
+        node_id = list(nodes)[0]
+        node = nodes[node_id]
+        plugins = node.get('plugins', []) if isinstance(node, dict) else []
+        capabilities['node_id'] = node_id
+        capabilities['plugins'] = [p['name'] for p in plugins if 'name' in p]
+    return capabilities
 
 def is_master_node(client):
     """
     Return `True` if the connected client node is the elected master node in
-    the Elasticsearch cluster, otherwise return `False`.
+    the Elasticsearch cluster, otherwise return `False`.  The elected master
+    is read from the cluster state on each call, as it can change.
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :rtype: bool
     """
-    my_node_id = list(client.nodes.info('_local')['nodes'])[0]
-    master_node_id = client.cluster.state(metric='master_node')['master_node']
-    return my_node_id == master_node_id
+    node_id = get_node_info(client)['node_id']
+    return node_id == client.cluster.state(
+        metric='master_node')['master_node']
 
 def check_version(client):
     """
@@ -505,6 +997,13 @@ def get_client(**kwargs):
         not work if `hosts` has more than one value.**  It will raise an
         Exception in that case.
     :type master_only: bool
+    :arg max_concurrent_requests: The number of requests Curator may send
+        at once when fetching data for, or acting on, a long list of indices.
+        Default is ``1``, which sends them one at a time.
+    :type max_concurrent_requests: int
+    :arg max_concurrent_master_requests: The number of those requests which
+        change cluster state that may be in flight at once.  Default is ``1``.
+    :type max_concurrent_master_requests: int
     :rtype: :class:`elasticsearch.Elasticsearch`
     """
     if 'url_prefix' in kwargs:
@@ -534,6 +1033,20 @@ def get_client(**kwargs):
     kwargs['hosts'] = ensure_list(kwargs['hosts'])
     logger.debug("kwargs = {0}".format(kwargs))
     master_only = kwargs.pop('master_only')
+    max_concurrent_requests = (
+        kwargs.pop('max_concurrent_requests')
+        if 'max_concurrent_requests' in kwargs else 1
+    )
+    max_concurrent_master_requests = (
+        kwargs.pop('max_concurrent_master_requests')
+        if 'max_concurrent_master_requests' in kwargs else 1
+    )
+    cache_dir = kwargs.pop('cache_dir') if 'cache_dir' in kwargs else None
+    cache_stats_ttl = (
+        kwargs.pop('cache_stats_ttl') if 'cache_stats_ttl' in kwargs else 300)
+    # Each concurrent request needs its own pooled connection
+    if max_concurrent_requests > 10 and not 'maxsize' in kwargs:
+        kwargs['maxsize'] = max_concurrent_requests
     if kwargs['use_ssl']:
         if kwargs['ssl_no_validate']:
             kwargs['verify_certs'] = False # Not needed, but explicitly defined
@@ -592,8 +1105,19 @@ def get_client(**kwargs):
             )
     try:
         client = elasticsearch.Elasticsearch(**kwargs)
+        set_max_concurrent_requests(client, max_concurrent_requests)
+        set_max_concurrent_master_requests(
+            client, max_concurrent_master_requests)
+        count_response_sizes(client)
+        if cache_dir:
+            from .cache import IndexCache, SnapshotCatalog
+            set_index_cache(
+                client, IndexCache(client, cache_dir, cache_stats_ttl))
+            set_snapshot_catalog(client, SnapshotCatalog(client, cache_dir))
         # Verify the version is acceptable.
         check_version(client)
+        # Complete the capability record while connecting
+        get_node_info(client)
         # Verify "master_only" status, if applicable
         check_master(client, master_only=master_only)
         return client
@@ -638,6 +1162,8 @@ def show_dry_run(ilo, action, **kwargs):
         '(CLOSED) indices may be shown that may not be acted on by '
         'action "{0}".'.format(action)
     )
+    # Index state may not have been fetched yet if `ilo` is lazy
+    ilo.load_data('metadata')
     indices = sorted(ilo.indices)
     for idx in indices:
             index_closed = ilo.index_info[idx]['state'] == 'close'
@@ -662,7 +1188,28 @@ def get_repository(client, repository=''):
         logger.error("Repository {0} not found.".format(repository))
         return False
 
-def get_snapshot(client, repository=None, snapshot=''):
+def get_repositories(client, repositories=None):
+    """
+    Return the sorted names of the repositories matching `repositories`, in a
+    single request.  Raise :class:`curator.exceptions.FailedExecution` if
+    none match.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repositories: A repository name or wildcard pattern, e.g.
+        ``backups-*``, or a list or comma-separated string of them
+    :rtype: list
+    """
+    if not repositories:
+        raise MissingArgument('No value for "repository" provided')
+    if not isinstance(repositories, list):
+        repositories = repositories.split(',')
+    result = get_repository(client, to_csv(repositories))
+    if not result:
+        raise FailedExecution(
+            'No repositories match {0}'.format(to_csv(repositories)))
+    return sorted(result.keys())
+
+def get_snapshot(client, repository=None, snapshot='', filter_path=None):
     """
     Return information about a snapshot (or a comma-separated list of snapshots)
     If no snapshot specified, it will return all snapshots.  If none exist, an
@@ -671,32 +1218,39 @@ def get_snapshot(client, repository=None, snapshot=''):
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :arg repository: The Elasticsearch snapshot repository to use
     :arg snapshot: The snapshot name, or a comma-separated list of snapshots
+    :arg filter_path: If set, only these fields of each snapshot are returned
     :rtype: dict
     """
     if not repository:
         raise MissingArgument('No value for "repository" provided')
     snapname = '_all' if snapshot == '' else snapshot
+    kwargs = {'filter_path': filter_path} if filter_path else {}
     try:
-        return client.snapshot.get(repository=repository, snapshot=snapshot)
+        return client.snapshot.get(
+            repository=repository, snapshot=snapshot, **kwargs)
     except (elasticsearch.TransportError, elasticsearch.NotFoundError) as e:
         raise FailedExecution(
             'Unable to get information about snapshot {0} from repository: '
             '{1}.  Error: {2}'.format(snapname, repository, e)
         )
 
-def get_snapshot_data(client, repository=None):
+def get_snapshot_data(client, repository=None, filter_path=None):
     """
     Get ``_all`` snapshots from repository and return a list.
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :arg repository: The Elasticsearch snapshot repository to use
+    :arg filter_path: If set, only these fields of each snapshot are returned
     :rtype: list
     """
     if not repository:
         raise MissingArgument('No value for "repository" provided')
+    kwargs = {'filter_path': filter_path} if filter_path else {}
     try:
+        # With filter_path, an empty repository returns an empty response
         return client.snapshot.get(
-            repository=repository, snapshot="_all")['snapshots']
+            repository=repository, snapshot="_all", **kwargs
+        ).get('snapshots', [])
     except (elasticsearch.TransportError, elasticsearch.NotFoundError) as e:
         raise FailedExecution(
             'Unable to get snapshot information from repository: {0}.  '
@@ -713,7 +1267,10 @@ def snapshot_in_progress(client, repository=None, snapshot=None):
     :arg repository: The Elasticsearch snapshot repository to use
     :arg snapshot: The snapshot name
     """
-    allsnaps = get_snapshot_data(client, repository=repository)
+    allsnaps = get_snapshot_data(
+        client, repository=repository,
+        filter_path=settings.filter_paths()['snapshot_catalog']
+    )
     inprogress = (
         [snap['snapshot'] for snap in allsnaps if 'state' in snap.keys() \
             and snap['state'] == 'IN_PROGRESS']
@@ -730,36 +1287,113 @@ def snapshot_in_progress(client, repository=None, snapshot=None):
                 'More than 1 snapshot in progress: {0}'.format(inprogress)
             )
 
+def wait_for_snapshots(client, max_wait=-1, max_interval=120):
+    """
+    Wait until no snapshot is running in the cluster, checking the
+    ``_snapshot/_status`` endpoint after 1 second, then at doubling intervals
+    of up to `max_interval` seconds.  Raise
+    :class:`curator.exceptions.ActionTimeout` if a snapshot is still running
+    after `max_wait` seconds.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg max_wait: Maximum number of seconds to wait, or ``-1`` to wait
+        indefinitely
+    :arg max_interval: Maximum number of seconds between checks
+    :rtype: None
+    """
+    wait_for_it(
+        lambda: not snapshot_running(client), 'running snapshots to finish',
+        wait_interval=min(1, max_interval), max_wait=max_wait,
+        max_interval=max_interval
+    )
+
+def concurrent_snapshot_error(exception):
+    """
+    Return `True` if `exception` is Elasticsearch refusing a snapshot request
+    because another snapshot, restore or snapshot deletion is running.
+
+    :arg exception: The exception raised by the request
+    :rtype: bool
+    """
+    if not isinstance(exception, elasticsearch.TransportError):
+        return False
+    return 'concurrent_snapshot_execution_exception' in '{0} {1}'.format(
+        exception.error, exception.info)
+
 def safe_to_snap(client, repository=None, retry_interval=120, retry_count=3):
     """
-    Ensure there are no snapshots in progress.  Pause and retry accordingly
+    Ensure there are no snapshots in progress, waiting up to `retry_count`
+    times `retry_interval` seconds for them to finish.
 
     :arg client: An :class:`elasticsearch.Elasticsearch` client object
     :arg repository: The Elasticsearch snapshot repository to use
-    :arg retry_interval: Number of seconds to delay betwen retries. Default:
+    :arg retry_interval: Maximum number of seconds between checks. Default:
         120 (seconds)
-    :arg retry_count: Number of attempts to make. Default: 3
+    :arg retry_count: Number of intervals to wait. Default: 3
     :rtype: bool
     """
     if not repository:
         raise MissingArgument('No value for "repository" provided')
-    for count in range(1, retry_count+1):
-        in_progress = snapshot_in_progress(
-            client, repository=repository
+    try:
+        wait_for_snapshots(
+            client, max_wait=retry_interval * retry_count,
+            max_interval=retry_interval
         )
-        if in_progress:
-            logger.info(
-                'Snapshot already in progress: {0}'.format(in_progress))
+        return True
+    except ActionTimeout:
+        return False
+
+@contextmanager
+def snapshot_queue(client, max_wait=-1, max_interval=120):
+    """
+    Wait in line until no snapshot is running and no earlier caller is
+    waiting, then run the body of the ``with`` statement.  Callers using the
+    same `client` are let through in the order they arrived, so an action
+    which has waited longest starts the next snapshot or snapshot delete.  The
+    next caller starts checking as soon as the body is done.
+
+    Raise :class:`curator.exceptions.ActionTimeout` if the body has not
+    started after `max_wait` seconds.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg max_wait: Maximum number of seconds to wait, or ``-1`` to wait
+        indefinitely
+    :arg max_interval: Maximum number of seconds between checks
+    """
+    with _SNAPSHOT_QUEUES_LOCK:
+        if not client in _SNAPSHOT_QUEUES:
+            _SNAPSHOT_QUEUES[client] = (deque(), threading.Condition())
+        waiting, turn = _SNAPSHOT_QUEUES[client]
+    ticket = object()
+    start = time.time()
+    with turn:
+        waiting.append(ticket)
+        if len(waiting) > 1:
             logger.info(
-                'Pausing {0} seconds before retrying...'.format(
-                    retry_interval)
+                'Waiting behind {0} queued snapshot operations'.format(
+                    len(waiting) - 1)
             )
-            time.sleep(retry_interval)
-            logger.info('Retry {0} of {1}'.format(count, retry_count))
-        else:
-            return True
-    return False
-
+    try:
+        with turn:
+            while waiting[0] is not ticket:
+                remaining = None
+                if max_wait != -1:
+                    remaining = max_wait - (time.time() - start)
+                    if remaining <= 0:
+                        raise ActionTimeout(
+                            'Waited longer than max_wait ({0} seconds) for '
+                            'queued snapshot operations'.format(max_wait)
+                        )
+                turn.wait(remaining)
+        remaining = max_wait
+        if max_wait != -1:
+            remaining = max(0, max_wait - (time.time() - start))
+        wait_for_snapshots(client, max_wait=remaining, max_interval=max_interval)
+        yield
+    finally:
+        with turn:
+            waiting.remove(ticket)
+            turn.notify_all()
 
 def create_snapshot_body(indices, ignore_unavailable=False,
                          include_global_state=True, partial=False):
@@ -999,6 +1633,220 @@ def snapshot_running(client):
     # suspect.
     return False if status == [] else True
 
+def health_check(client, **kwargs):
+    """
+    Return `True` if every value in `kwargs` matches the same key in the
+    cluster health response, otherwise `False`.  ``index`` is passed to the
+    health request instead of being compared.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :rtype: bool
+    """
+    index = kwargs.pop('index', None)
+    health = client.cluster.health(index=index, level='cluster')
+    for key in kwargs:
+        if health[key] != kwargs[key]:
+            logger.debug(
+                'Cluster health {0} is {1}, waiting for {2}'.format(
+                    key, health[key], kwargs[key])
+            )
+            return False
+    return True
+
+def snapshot_check(client, repository=None, snapshot=None):
+    """
+    Return `True` once `snapshot` is no longer ``IN_PROGRESS``, logging its
+    final state, otherwise `False`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg repository: The Elasticsearch snapshot repository to use
+    :arg snapshot: The snapshot name
+    :rtype: bool
+    """
+    state = client.snapshot.get(
+        repository=repository, snapshot=snapshot)['snapshots'][0]['state']
+    if state == 'IN_PROGRESS':
+        return False
+    if state == 'SUCCESS':
+        logger.info('Snapshot {0} successfully completed.'.format(snapshot))
+    else:
+        logger.warn(
+            'Snapshot {0} completed with state: {1}'.format(snapshot, state))
+    return True
+
+def failed_restores(client, indices):
+    """
+    Return those of `indices` with a primary shard which Elasticsearch has
+    stopped trying to allocate, so its restore can never finish.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg indices: A list of the indices being restored
+    :rtype: list
+    """
+    def request(l):
+        return client.cluster.state(
+            index=to_csv(l), metric='routing_table',
+            filter_path=settings.filter_paths()['shard_unassigned']
+        )
+    failed = []
+    for result in chunk_requests(client, request, chunk_index_list(indices)):
+        routing = result.get('routing_table', {}).get('indices', {})
+        for index in routing:
+            for copies in routing[index]['shards'].values():
+                if any([
+                        copy.get('primary') and
+                        copy.get('unassigned_info', {}).get('reason') ==
+                        'ALLOCATION_FAILED'
+                        for copy in copies
+                    ]):
+                    failed.append(index)
+                    break
+    return sorted(failed)
+
+def restore_check(client, indices):
+    """
+    Return `True` once every shard of every index in `indices` has finished
+    recovering, otherwise `False`.  Indices which do not exist yet have not
+    started recovering.
+
+    Indices which are still recovering are checked with
+    :mod:`curator.utils.failed_restores`, and
+    :class:`curator.exceptions.FailedRestore` is raised if any primary shard
+    has failed to restore.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg indices: A list of the indices being restored
+    :rtype: bool
+    """
+    def request(l):
+        return client.indices.recovery(
+            index=to_csv(l), params={'ignore_unavailable': 'true'})
+    response = {}
+    for result in chunk_requests(client, request, chunk_index_list(indices)):
+        response.update(result)
+    done = True
+    recovering = []
+    for index in indices:
+        if not index in response:
+            logger.debug('Index {0} is not yet restored'.format(index))
+            done = False
+            continue
+        for shard in response[index]['shards']:
+            if shard['stage'] != 'DONE':
+                logger.debug(
+                    'Index {0} is still recovering, stage: {1}'.format(
+                        index, shard['stage'])
+                )
+                recovering.append(index)
+                break
+    if recovering:
+        # A shard whose restore failed never reaches the DONE stage
+        failed = failed_restores(client, recovering)
+        if failed:
+            raise FailedRestore(
+                'Failed to restore a primary shard of indices: '
+                '{0}'.format(failed)
+            )
+        return False
+    return done
+
+def segment_check(client, index, max_num_segments):
+    """
+    Return `True` once no shard of `index` has more than `max_num_segments`
+    segments, otherwise `False`.
+
+    :arg client: An :class:`elasticsearch.Elasticsearch` client object
+    :arg index: The index being forceMerged
+    :arg max_num_segments: The target number of segments per shard
+    :rtype: bool
+    """
+    shards = client.indices.stats(
+        index=index, metric='segments', level='shards',
+        filter_path=settings.filter_paths()['shard_segment_count']
+    )['indices'][index]['shards']
+    for copies in shards.values():
+        for copy in copies:
+            if copy['segments']['count'] > max_num_segments:
+                return False
+    return True
+
+def wait_limit(max_wait=None, timeout=None):
+    """
+    Return the maximum number of seconds an action may wait for completion:
+    `max_wait` if set, or else the deprecated `timeout`, or else ``30``, the
+    former default of `timeout`.
+
+    :arg max_wait: Maximum number of seconds to wait, or ``-1`` to wait
+        indefinitely
+    :arg timeout: Deprecated name for `max_wait`
+    :rtype: int
+    """
+    if timeout is not None:
+        logger.warn('"timeout" is deprecated.  Use "max_wait" instead.')
+        if max_wait is None:
+            return timeout
+    return 30 if max_wait is None else max_wait
+
+def wait_for_it(check, description, wait_interval=9, max_wait=-1,
+    cancel=None, max_interval=None):
+    """
+    Call `check` until it returns `True`.  The first pause between calls is
+    `wait_interval` seconds, doubling after each call up to `max_interval`,
+    which defaults to the larger of `wait_interval` and 60 seconds.
+
+    Connection errors raised by `check` are logged and the next call is made
+    as usual, so a run survives a node restart or a dropped connection while
+    waiting.  If `max_wait` seconds pass first, `cancel` is called, if
+    provided, and :class:`curator.exceptions.ActionTimeout` is raised.
+
+    :arg check: A function returning `True` when the wait is over
+    :arg description: What is being waited for, used in log messages
+    :arg wait_interval: Seconds to wait before the first retry
+    :arg max_wait: Maximum number of seconds to wait, or ``-1`` to wait
+        indefinitely
+    :arg cancel: A function to call if `max_wait` is exceeded
+    :arg max_interval: Maximum number of seconds between calls
+    :rtype: None
+    """
+    if max_interval is None:
+        max_interval = max(wait_interval, 60)
+    start = time.time()
+    interval = wait_interval
+    while True:
+        try:
+            if check():
+                logger.debug(
+                    'Finished waiting for {0} after {1:.1f} seconds'.format(
+                        description, time.time() - start)
+                )
+                return
+        except elasticsearch.ConnectionError as e:
+            logger.warn(
+                'Connection error while waiting for {0}: {1}.  The operation '
+                'continues in the cluster, retrying.'.format(description, e)
+            )
+        elapsed = time.time() - start
+        if max_wait != -1 and elapsed >= max_wait:
+            logger.error(
+                'Gave up waiting for {0} after {1:.1f} seconds'.format(
+                    description, elapsed)
+            )
+            if cancel:
+                cancel()
+            raise ActionTimeout(
+                'Waited longer than max_wait ({0} seconds) for '
+                '{1}'.format(max_wait, description)
+            )
+        pause = interval
+        if max_wait != -1:
+            pause = min(pause, max_wait - elapsed)
+        logger.debug(
+            'Still waiting for {0}.  Checking again in {1:.1f} '
+            'seconds'.format(description, pause)
+        )
+        time.sleep(pause)
+        interval = min(interval * 2, max_interval)
+
 def parse_date_pattern(name):
     """
     Scan and parse `name` for :py:func:`time.strftime` strings, replacing them
@@ -20,6 +20,13 @@ def config_client():
         Optional('timeout', default=30): All(
             Coerce(int), Range(min=1, max=86400)),
         Optional('master_only', default=False): Boolean(),
+        Optional('max_concurrent_requests', default=1): All(
+            Coerce(int), Range(min=1, max=64)),
+        Optional('max_concurrent_master_requests', default=1): All(
+            Coerce(int), Range(min=1, max=16)),
+        Optional('cache_dir', default=None): Any(None, str, unicode),
+        Optional('cache_stats_ttl', default=300): All(
+            Coerce(int), Range(min=0, max=86400)),
     }
 
 # Configuration file: logging
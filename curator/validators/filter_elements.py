@@ -42,6 +42,10 @@ def field(**kwargs):
     else:
         return { Optional('field'): Any(str, unicode) }
 
+def indices(**kwargs):
+    # This setting is only used with the indices filtertype and is required
+    return { Required('indices'): Any(str, [str], unicode, [unicode]) }
+
 def key(**kwargs):
     # This setting is only used with the allocated filtertype.
     return { Required('key'): Any(str, unicode) }
@@ -52,11 +56,19 @@ def kind(**kwargs):
         Required('kind'): Any('prefix', 'suffix', 'timestring', 'regex')
     }
 
+def match(**kwargs):
+    # This setting is only used with the indices filtertype.
+    return { Optional('match', default='any'): Any('any', 'all') }
+
 def max_num_segments(**kwargs):
     return {
         Required('max_num_segments'): All(Coerce(int), Range(min=1))
     }
 
+def per_shard(**kwargs):
+    # This setting is only used with the forcemerged filtertype.
+    return { Optional('per_shard', default=False): Boolean() }
+
 def reverse(**kwargs):
     # Only used with space filtertype
     # Should be ignored if `use_age` is True
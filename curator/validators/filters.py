@@ -27,9 +27,12 @@ def structure():
         Optional('epoch'): Any(Coerce(int), None),
         Optional('exclude'): Any(int, str, unicode, bool, None),
         Optional('field'): Any(str, unicode, None),
+        Optional('indices'): Any(str, [str], unicode, [unicode]),
         Optional('key'): Any(str, unicode),
         Optional('kind'): Any(str, unicode),
+        Optional('match'): Any(str, unicode),
         Optional('max_num_segments'): Coerce(int),
+        Optional('per_shard'): Boolean(),
         Optional('reverse'): Any(int, str, unicode, bool, None),
         Optional('source'): Any(str, unicode),
         Optional('state'): Any(str, unicode),
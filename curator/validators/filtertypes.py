@@ -78,9 +78,17 @@ def count(action, config):
 def forcemerged(action, config):
     return [
         filter_elements.max_num_segments(),
+        filter_elements.per_shard(),
         filter_elements.exclude(exclude=True),
     ]
 
+def indices(action, config):
+    return [
+        filter_elements.indices(),
+        filter_elements.match(),
+        filter_elements.exclude(),
+    ]
+
 def kibana(action, config):
     return [ filter_elements.exclude(exclude=True) ]
 
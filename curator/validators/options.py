@@ -7,6 +7,13 @@ def allocation_type():
     return { Optional('allocation_type', default='require'): All(
         Any(str, unicode), Any('require', 'include', 'exclude')) }
 
+def batch_size():
+    return {
+        Optional('batch_size', default=None): Any(
+                None, All(Coerce(int), Range(min=1, max=10000))
+            )
+    }
+
 def continue_if_exception():
     return { Optional('continue_if_exception', default=False): Boolean() }
 
@@ -47,6 +54,55 @@ def indices():
 def key():
     return { Required('key'): Any(str, unicode) }
 
+def max_actions():
+    return {
+        Optional('max_actions', default=1000): All(
+                Coerce(int), Range(min=1, max=100000)
+            )
+    }
+
+def max_concurrent_merges():
+    return {
+        Optional('max_concurrent_merges', default=1): All(
+                Coerce(int), Range(min=1, max=64)
+            )
+    }
+
+def max_merges_per_node():
+    return {
+        Optional('max_merges_per_node', default=1): All(
+                Coerce(int), Range(min=1, max=16)
+            )
+    }
+
+def max_wait(action):
+    if action in ['allocation', 'cluster_routing', 'replicas']:
+        # No default here, so the wait is bounded by the client timeout
+        return { Optional('max_wait'): All(Coerce(int), Range(min=-1)) }
+    if action == 'restore':
+        # A restore which cannot finish should not hold up a run forever
+        return {
+            Optional('max_wait', default=86400): All(
+                Coerce(int), Range(min=-1))
+        }
+    return {
+        Optional('max_wait', default=-1): All(Coerce(int), Range(min=-1))
+    }
+
+def max_initializing_shards():
+    return {
+        Optional('max_initializing_shards', default=0): All(
+                Coerce(int), Range(min=0)
+            )
+    }
+
+def max_relocating_shards():
+    return {
+        Optional('max_relocating_shards', default=None): Any(
+                None, All(Coerce(int), Range(min=1))
+            )
+    }
+
 def max_num_segments():
     return {
         Required('max_num_segments'): All(Coerce(int), Range(min=1, max=32768))
@@ -62,6 +118,9 @@ def name(action):
     elif action == 'restore':
         return { Optional('name'): Any(str, unicode) }
 
+def newest_per_index():
+    return { Optional('newest_per_index', default=False): Boolean() }
+
 def partial():
     return { Optional('partial', default=False): Boolean() }
 
@@ -71,7 +130,12 @@ def rename_pattern():
 def rename_replacement():
     return { Optional('rename_replacement'): Any(str, unicode) }
 
-def repository():
+def repository(action):
+    if action == 'delete_snapshots':
+        # Several repositories, or wildcard patterns, may be given
+        return {
+            Required('repository'): Any(str, unicode, [str], [unicode])
+        }
     return { Required('repository'): Any(str, unicode) }
 
 def retry_count():
@@ -128,6 +192,13 @@ def wait_for_completion(action):
     elif action in ['restore', 'snapshot']:
         return { Optional('wait_for_completion', default=True): Boolean() }
 
+def wait_interval():
+    return {
+        Optional('wait_interval', default=9): All(
+                Coerce(int), Range(min=1, max=30)
+            )
+    }
+
 def warn_if_no_indices():
     return { Optional('warn_if_no_indices', default=False): Boolean() }
 
@@ -138,12 +209,16 @@ def action_specific(action):
             name(action),
             warn_if_no_indices(),
             extra_settings(),
+            max_actions(),
         ],
         'allocation' : [
             key(),
             value(),
             allocation_type(),
             wait_for_completion(action),
+            wait_interval(),
+            max_wait(action),
+            max_relocating_shards(),
         ],
         'close' : [ delete_aliases() ],
         'cluster_routing' : [
@@ -151,6 +226,8 @@ def action_specific(action):
             cluster_routing_setting(),
             cluster_routing_value(),
             wait_for_completion(action),
+            wait_interval(),
+            max_wait(action),
         ],
         'create_index' : [
             name(action),
@@ -158,23 +235,36 @@ def action_specific(action):
         ],
         'delete_indices' : [],
         'delete_snapshots' : [
-            repository(),
+            repository(action),
             retry_interval(),
             retry_count(),
         ],
         'forcemerge' : [
             delay(),
             max_num_segments(),
+            max_concurrent_merges(),
+            max_merges_per_node(),
+            wait_interval(),
+            max_wait(action),
+        ],
+        'open' : [
+            batch_size(),
+            max_initializing_shards(),
+            wait_interval(),
+            max_wait(action),
         ],
-        'open' : [],
         'replicas' : [
             count(),
             wait_for_completion(action),
+            wait_interval(),
+            max_wait(action),
+            batch_size(),
         ],
         'restore' : [
-            repository(),
+            repository(action),
             name(action),
             indices(),
+            newest_per_index(),
             ignore_unavailable(),
             include_aliases(),
             include_global_state(),
@@ -183,16 +273,22 @@ def action_specific(action):
             rename_replacement(),
             extra_settings(),
             wait_for_completion(action),
+            wait_interval(),
+            max_wait(action),
             skip_repo_fs_check(),
         ],
         'snapshot' : [
-            repository(),
+            repository(action),
             name(action),
             ignore_unavailable(),
             include_global_state(),
             partial(),
             wait_for_completion(action),
+            wait_interval(),
+            max_wait(action),
             skip_repo_fs_check(),
+            retry_interval(),
+            retry_count(),
         ],
     }
     return options[action]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for removing indices from the actionable list.
+
+A ``pattern`` filter which drops every other index is run against an
+IndexList of 10k, 100k and 1M names, built from a mocked client.  The same
+removals are also timed with ``list.remove``, which is how the actionable
+list used to be maintained.  That approach is quadratic, so by default it is
+only timed up to 100k names.
+
+    python test/benchmarks/actionable_set.py [--legacy-max N] [SIZE ...]
+"""
+from __future__ import print_function
+
+import sys
+import time
+import logging
+from os.path import dirname, abspath
+
+from mock import Mock
+
+sys.path.insert(0, dirname(dirname(dirname(abspath(__file__)))))
+import curator
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+def names(size):
+    return [
+        '{0}-{1:07d}'.format('logstash' if i % 2 else 'other', i)
+        for i in range(size)
+    ]
+
+def index_list(size):
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'} }
+    client.indices.get_settings.return_value = dict(
+        (name, {}) for name in names(size))
+    return curator.IndexList(client, lazy=True)
+
+def time_filter(size):
+    ilo = index_list(size)
+    start = time.time()
+    ilo.filter_by_regex(kind='prefix', value='logstash-')
+    remaining = len(ilo.indices)
+    return time.time() - start, remaining
+
+def time_legacy(size):
+    actionable = names(size)
+    start = time.time()
+    for name in actionable[:]:
+        if not name.startswith('logstash-'):
+            actionable.remove(name)
+    return time.time() - start, len(actionable)
+
+def main(argv):
+    legacy_max = 100000
+    if '--legacy-max' in argv:
+        pos = argv.index('--legacy-max')
+        legacy_max = int(argv[pos + 1])
+        del argv[pos:pos + 2]
+    sizes = [int(x) for x in argv] or DEFAULT_SIZES
+    # Per-index debug logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+    print('{0:>10} {1:>12} {2:>12} {3:>9}'.format(
+        'names', 'list.remove', 'mark+compact', 'speedup'))
+    for size in sizes:
+        elapsed, remaining = time_filter(size)
+        if size <= legacy_max:
+            legacy, legacy_remaining = time_legacy(size)
+            assert legacy_remaining == remaining
+            print('{0:>10} {1:>11.3f}s {2:>11.3f}s {3:>8.1f}x'.format(
+                size, legacy, elapsed, legacy / elapsed))
+        else:
+            print('{0:>10} {1:>12} {2:>11.3f}s {3:>9}'.format(
+                size, 'skipped', elapsed, '-'))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -8,6 +8,9 @@ from . import testvars as testvars
 class TestActionAlias(TestCase):
     def test_init_raise(self):
         self.assertRaises(curator.MissingArgument, curator.Alias)
+    def test_init_raise_bad_max_actions(self):
+        self.assertRaises(
+            ValueError, curator.Alias, name='alias', max_actions=0)
     def test_add_raises_on_missing_parameter(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -32,6 +35,7 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {}
         ilo = curator.IndexList(client)
         ao = curator.Alias(name='alias')
         ao.add(ilo)
@@ -42,6 +46,7 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {}
         ilo = curator.IndexList(client)
         esd = {
             'filter' : { 'term' : { 'user' : 'kimchy' } }
@@ -66,6 +71,7 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_two
         client.cluster.state.return_value = testvars.clu_state_two
         client.indices.stats.return_value = testvars.stats_two
+        client.indices.get_alias.return_value = {}
         ilo = curator.IndexList(client)
         ao = curator.Alias(name='alias')
         ao.add(ilo)
@@ -98,6 +104,7 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {}
         client.indices.update_aliases.return_value = testvars.alias_success
         ilo = curator.IndexList(client)
         ao = curator.Alias(name='alias')
@@ -109,6 +116,7 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {}
         client.indices.update_aliases.return_value = testvars.alias_success
         ilo = curator.IndexList(client)
         ao = curator.Alias(name='alias')
@@ -120,9 +128,80 @@ class TestActionAlias(TestCase):
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {}
         client.indices.update_aliases.return_value = testvars.alias_success
         client.indices.update_aliases.side_effect = testvars.four_oh_one
         ilo = curator.IndexList(client)
         ao = curator.Alias(name='alias')
         ao.add(ilo)
         self.assertRaises(curator.FailedExecution, ao.do_action)
+    def test_add_skips_members(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.get_alias.return_value = {
+            'index-2016.03.03': { 'aliases' : { 'my_alias' : { } } },
+        }
+        ilo = curator.IndexList(client)
+        ao = curator.Alias(name='my_alias')
+        ao.add(ilo)
+        client.indices.get_alias.assert_called_once_with(name='my_alias')
+        self.assertEqual(
+            [{'add': {'alias': 'my_alias', 'index': 'index-2016.03.04'}}],
+            ao.actions
+        )
+    def test_add_changed_settings(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = {
+            testvars.named_index: { 'aliases' : { 'alias' : { } } },
+        }
+        ilo = curator.IndexList(client)
+        ao = curator.Alias(name='alias', extra_settings={'routing': 1})
+        ao.add(ilo)
+        self.assertEqual(1, len(ao.actions))
+    def test_do_action_up_to_date(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        client.indices.get_alias.return_value = testvars.settings_1_get_aliases
+        ilo = curator.IndexList(client)
+        ao = curator.Alias(name='my_alias')
+        ao.add(ilo)
+        self.assertIsNone(ao.do_action())
+        self.assertFalse(client.indices.update_aliases.called)
+    def test_do_action_split(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.get_alias.return_value = {}
+        ilo = curator.IndexList(client)
+        ao = curator.Alias(name='alias', max_actions=1)
+        ao.add(ilo)
+        self.assertIsNone(ao.do_action())
+        self.assertEqual(2, client.indices.update_aliases.call_count)
+    def test_do_action_split_failure_logs_applied(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.get_alias.return_value = {}
+        client.indices.update_aliases.side_effect = [None, testvars.fake_fail]
+        ilo = curator.IndexList(client)
+        ao = curator.Alias(name='alias', max_actions=1)
+        ao.add(ilo)
+        with patch.object(ao.loggit, 'error') as error:
+            self.assertRaises(curator.FailedExecution, ao.do_action)
+        message = error.call_args_list[-1][0][0]
+        self.assertIn('1 of the requests updating alias alias', message)
+        self.assertIn("Added: ['index-2016.03.03']", message)
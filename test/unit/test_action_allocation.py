@@ -1,3 +1,4 @@
+import sys
 from unittest import TestCase
 from mock import Mock, patch
 import elasticsearch
@@ -18,6 +19,27 @@ class TestActionAllocation(TestCase):
         ao = curator.Allocation(ilo, key='key', value='value')
         self.assertEqual(ilo, ao.index_list)
         self.assertEqual(client, ao.client)
+    def test_max_wait_default(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        ilo = curator.IndexList(client)
+        ao = curator.Allocation(ilo, key='key', value='value')
+        self.assertEqual(30, ao.max_wait)
+    def test_deprecated_timeout(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        ilo = curator.IndexList(client)
+        ao = curator.Allocation(ilo, key='key', value='value', timeout=120)
+        self.assertEqual(120, ao.max_wait)
+        ao = curator.Allocation(
+            ilo, key='key', value='value', timeout=120, max_wait=600)
+        self.assertEqual(600, ao.max_wait)
     def test_create_body_no_key(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -94,7 +116,7 @@ class TestActionAllocation(TestCase):
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
         client.indices.put_settings.return_value = None
-        client.cluster.health.return_value = None
+        client.cluster.health.return_value = testvars.cluster_health
         ilo = curator.IndexList(client)
         ao = curator.Allocation(
             ilo, key='key', value='value', wait_for_completion=True)
@@ -106,8 +128,121 @@ class TestActionAllocation(TestCase):
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
         client.indices.put_settings.return_value = None
-        client.cluster.health.return_value = None
+        client.cluster.health.return_value = testvars.cluster_health
         ilo = curator.IndexList(client)
         ao = curator.Allocation(
             ilo, key='key', value='value', wait_for_completion=True)
         self.assertIsNone(ao.do_action())
+    def test_do_action_rolling(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.put_settings.return_value = None
+        ilo = curator.IndexList(client)
+        ilo.filter_closed()
+        ilo.load_data('stats')
+        # a is largest with 10 shards, b and d have 4 shards each
+        ilo.index_info['a-2016.03.03']['size_in_bytes'] = 300
+        ilo.index_info['b-2016.03.04']['size_in_bytes'] = 200
+        ilo.index_info['d-2016.03.06']['size_in_bytes'] = 100
+        for index in ['b-2016.03.04', 'd-2016.03.06']:
+            ilo.index_info[index]['number_of_shards'] = 2
+        def health(index, relocating):
+            return {'indices': dict(
+                (i, {'relocating_shards': relocating, 'initializing_shards': 0})
+                for i in index.split(',')
+            )}
+        client.nodes.info.return_value = testvars.allocation_nodes
+        client.cluster.health.side_effect = [
+            # Room for b, but not yet for d
+            health('a-2016.03.03', 2),
+            health('a-2016.03.03,b-2016.03.04', 0),
+            health('d-2016.03.06', 0),
+        ]
+        ao = curator.Allocation(
+            ilo, key='key', value='value', max_relocating_shards=6)
+        with patch('curator.utils.time.sleep'):
+            self.assertIsNone(ao.do_action())
+        self.assertEqual(
+            ['a-2016.03.03', 'b-2016.03.04', 'd-2016.03.06'],
+            [c[1]['index'] for c in client.indices.put_settings.call_args_list]
+        )
+    def test_do_action_rolling_deadline(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        ilo = curator.IndexList(client)
+        ilo.filter_closed()
+        ao = curator.Allocation(
+            ilo, key='key', value='value', max_relocating_shards=1,
+            max_wait=100)
+        ao._relocating = Mock(side_effect=lambda l: dict((i, 0) for i in l))
+        ao._misplaced = Mock(
+            side_effect=lambda l, eligible: dict((i, 0) for i in l))
+        ao._eligible_nodes = Mock(return_value=set(['new_node']))
+        with patch('curator.utils.time.time') as now:
+            now.return_value = 1000
+            def wait(check, description, **kwargs):
+                # Each wave takes 40 seconds
+                now.return_value += 40
+                check()
+            actions = sys.modules['curator.actions']
+            with patch.object(actions, 'wait_for_it') as wait_for_it:
+                wait_for_it.side_effect = wait
+                ao._rolling()
+        self.assertEqual(
+            [100, 60, 20],
+            [c[1]['max_wait'] for c in wait_for_it.call_args_list]
+        )
+    def test_do_action_rolling_waits_for_placement(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.nodes.info.return_value = testvars.allocation_nodes
+        events = []
+        polls = {}
+        def state(**kwargs):
+            if kwargs.get('metric') != 'routing_table':
+                return testvars.clu_state_four
+            indices = {}
+            for index in kwargs['index'].split(','):
+                events.append(('poll', index))
+                polls[index] = polls.get(index, 0) + 1
+                # Throttled on the first poll: nothing has started to move
+                node = 'new_node' if polls[index] > 1 else 'old_node'
+                indices[index] = {'shards': {'0': [
+                    {'node': node, 'state': 'STARTED'}]}}
+            return {'routing_table': {'indices': indices}}
+        def put_settings(index=None, body=None):
+            events.append(('put', index))
+        client.cluster.state.side_effect = state
+        client.indices.put_settings.side_effect = put_settings
+        client.cluster.health.side_effect = lambda index, level: {
+            'indices': dict(
+                (i, {'relocating_shards': 0, 'initializing_shards': 0})
+                for i in index.split(',')
+            )
+        }
+        ilo = curator.IndexList(client)
+        ilo.filter_closed()
+        ao = curator.Allocation(
+            ilo, key='key', value='value', max_relocating_shards=1,
+            max_wait=-1)
+        with patch('curator.utils.time.sleep'):
+            self.assertIsNone(ao.do_action())
+        moved = [index for event, index in events if event == 'put']
+        self.assertEqual(
+            ['a-2016.03.03', 'b-2016.03.04', 'd-2016.03.06'], sorted(moved))
+        # Each wave is only released once the previous one is placed
+        self.assertEqual(
+            [
+                (event, index) for index in moved
+                for event in ['put', 'poll', 'poll']
+            ],
+            events
+        )
@@ -51,6 +51,16 @@ class TestActionAllocation(TestCase):
             value='all'
         )
         self.assertIsNone(cro.do_dry_run())
+    def test_deprecated_timeout(self):
+        client = Mock()
+        cro = curator.ClusterRouting(
+            client,
+            routing_type='allocation',
+            setting='enable',
+            value='all',
+            timeout=45
+        )
+        self.assertEqual(45, cro.max_wait)
     def test_do_action_raise_on_put_settings(self):
         client = Mock()
         client.cluster.put_settings.return_value = None
@@ -64,8 +74,9 @@ class TestActionAllocation(TestCase):
         self.assertRaises(Exception, cro.do_action)
     def test_do_action_wait(self):
         client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
         client.cluster.put_settings.return_value = None
-        client.cluster.health.return_value = None
+        client.cluster.health.return_value = testvars.cluster_health
         cro = curator.ClusterRouting(
             client,
             routing_type='allocation',
@@ -74,3 +85,35 @@ class TestActionAllocation(TestCase):
             wait_for_completion=True
         )
         self.assertIsNone(cro.do_action())
+    def test_do_action_wait_polls(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.1.1'} }
+        client.cluster.put_settings.return_value = None
+        client.cluster.health.side_effect = [
+            testvars.relocating, testvars.relocating, testvars.cluster_health]
+        cro = curator.ClusterRouting(
+            client,
+            routing_type='allocation',
+            setting='enable',
+            value='all',
+            wait_for_completion=True
+        )
+        with patch('curator.utils.time.sleep') as sleep:
+            cro.do_action()
+            self.assertEqual(2, sleep.call_count)
+        self.assertEqual(3, client.cluster.health.call_count)
+    def test_do_action_max_wait(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.1.1'} }
+        client.cluster.put_settings.return_value = None
+        client.cluster.health.return_value = testvars.relocating
+        cro = curator.ClusterRouting(
+            client,
+            routing_type='allocation',
+            setting='enable',
+            value='all',
+            wait_for_completion=True,
+            wait_interval=1,
+            max_wait=0
+        )
+        self.assertRaises(curator.FailedExecution, cro.do_action)
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from mock import Mock, patch
+import sys
 import elasticsearch
 import curator
 # Get test variables and constants from a single source
@@ -77,3 +78,71 @@ class TestActionDeleteIndices(TestCase):
         ilo = curator.IndexList(client)
         do = curator.DeleteIndices(ilo)
         self.assertTrue(do._verify_result([],2))
+    def test_verify_is_targeted(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.delete.return_value = None
+        ilo = curator.IndexList(client)
+        client.cluster.state.return_value = {}
+        do = curator.DeleteIndices(ilo)
+        do.do_action()
+        self.assertEqual(1, client.indices.get_settings.call_count)
+        self.assertEqual(1, client.indices.delete.call_count)
+        client.cluster.state.assert_called_with(
+            index='a-2016.03.03,b-2016.03.04,c-2016.03.05,d-2016.03.06',
+            metric='metadata', filter_path='metadata.indices.*.state',
+            ignore_unavailable=True, expand_wildcards='open,closed'
+        )
+    def test_retry_only_remaining(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        client.indices.delete.return_value = None
+        ilo = curator.IndexList(client)
+        client.cluster.state.side_effect = [
+            {'metadata': {'indices': {'b-2016.03.04': {'state': 'open'}}}},
+            {},
+        ]
+        do = curator.DeleteIndices(ilo)
+        do.do_action()
+        self.assertEqual(2, client.indices.delete.call_count)
+        client.indices.delete.assert_called_with(
+            index='b-2016.03.04', master_timeout='30s')
+    def test_failed_chunk_retried(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        ilo = curator.IndexList(client)
+        existing = set(ilo.indices)
+        failures = [
+            elasticsearch.TransportError(503, 'unavailable', {})]
+        def delete(index=None, master_timeout=None):
+            if index == 'b-2016.03.04' and failures:
+                raise failures.pop()
+            existing.difference_update(index.split(','))
+        def state(index=None, **kwargs):
+            found = dict(
+                (i, {'state': 'open'}) for i in index.split(',')
+                if i in existing
+            )
+            return {'metadata': {'indices': found}} if found else {}
+        client.indices.delete.side_effect = delete
+        client.cluster.state.side_effect = state
+        do = curator.DeleteIndices(ilo)
+        # One index per chunk, so only the failed chunk is sent again
+        with patch.object(sys.modules['curator.actions'], 'chunk_index_list',
+                lambda l: [[i] for i in l]):
+            with patch('curator.utils.time.sleep') as sleep:
+                do.do_action()
+        # Resent after the existence check, not by execute_chunks
+        self.assertFalse(sleep.called)
+        self.assertEqual(5, client.indices.delete.call_count)
+        self.assertEqual(sorted(ilo.indices), sorted(do.deleted))
+        self.assertEqual(set(), existing)
@@ -21,6 +21,7 @@ class TestActionDeleteSnapshots(TestCase):
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
         client.snapshot.delete.return_value = None
+        client.snapshot.status.return_value = testvars.nosnap_running
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo)
         self.assertIsNone(do.do_dry_run())
@@ -29,6 +30,7 @@ class TestActionDeleteSnapshots(TestCase):
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
         client.snapshot.delete.return_value = None
+        client.snapshot.status.return_value = testvars.nosnap_running
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo)
         self.assertIsNone(do.do_action())
@@ -37,6 +39,7 @@ class TestActionDeleteSnapshots(TestCase):
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
         client.snapshot.delete.return_value = None
+        client.snapshot.status.return_value = testvars.nosnap_running
         client.snapshot.delete.side_effect = testvars.fake_fail
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo)
@@ -45,6 +48,72 @@ class TestActionDeleteSnapshots(TestCase):
         client = Mock()
         client.snapshot.get.return_value = testvars.inprogress
         client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.snap_running
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         do = curator.DeleteSnapshots(slo, retry_interval=0, retry_count=1)
         self.assertRaises(curator.FailedExecution, do.do_action)
+        self.assertFalse(client.snapshot.delete.called)
+    def test_waits_for_running_snapshot(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.side_effect = [
+            testvars.snap_running, testvars.snap_running,
+            testvars.nosnap_running
+        ]
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        do = curator.DeleteSnapshots(slo)
+        with patch('curator.utils.time.sleep') as sleep:
+            do.do_action()
+            self.assertEqual(
+                [1, 2], [c[0][0] for c in sleep.call_args_list])
+        self.assertEqual(2, client.snapshot.delete.call_count)
+    def test_retries_concurrent_snapshot_execution(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.delete.side_effect = [
+            elasticsearch.TransportError(
+                503, 'concurrent_snapshot_execution_exception', {}),
+            None, None
+        ]
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        do = curator.DeleteSnapshots(slo)
+        with patch('curator.utils.time.sleep') as sleep:
+            do.do_action()
+            self.assertEqual(1, sleep.call_count)
+            self.assertTrue(0.5 <= sleep.call_args[0][0] <= 1)
+        self.assertEqual(3, client.snapshot.delete.call_count)
+    def test_other_errors_not_retried(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.delete.side_effect = elasticsearch.TransportError(
+            500, 'repository_exception', {})
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        do = curator.DeleteSnapshots(slo)
+        self.assertRaises(curator.FailedExecution, do.do_action)
+        self.assertEqual(1, client.snapshot.delete.call_count)
+    def test_several_repositories(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = {
+            'repo-a': {'type': 'fs'}, 'repo-b': {'type': 'fs'} }
+        client.snapshot.status.return_value = testvars.nosnap_running
+        slos = curator.snapshot_lists(client, 'repo-*')
+        do = curator.DeleteSnapshots(slos)
+        do.do_action()
+        self.assertEqual(
+            [
+                ('repo-a', 'snap_name'), ('repo-a', 'snapshot-2015.03.01'),
+                ('repo-b', 'snap_name'), ('repo-b', 'snapshot-2015.03.01'),
+            ],
+            [
+                (c[1]['repository'], c[1]['snapshot'])
+                for c in client.snapshot.delete.call_args_list
+            ]
+        )
+        self.assertEqual(1, client.snapshot.status.call_count)
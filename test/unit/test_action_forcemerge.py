@@ -1,5 +1,7 @@
 from unittest import TestCase
 from mock import Mock, patch
+import threading
+import time
 import elasticsearch
 import curator
 # Get test variables and constants from a single source
@@ -14,18 +16,38 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         ilo = curator.IndexList(client)
         self.assertRaises(
             curator.MissingArgument, curator.ForceMerge, ilo)
+    def test_init_raise_bad_merges_per_node(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.seg_stats
+        ilo = curator.IndexList(client)
+        self.assertRaises(
+            ValueError, curator.ForceMerge, ilo, max_num_segments=2,
+            max_concurrent_merges=2, max_merges_per_node=0
+        )
+    def test_init_raise_bad_concurrent_merges(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.seg_stats
+        ilo = curator.IndexList(client)
+        self.assertRaises(
+            ValueError, curator.ForceMerge, ilo, max_num_segments=2,
+            max_concurrent_merges=0
+        )
     def test_init(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         ilo = curator.IndexList(client)
         fmo = curator.ForceMerge(ilo, max_num_segments=2)
         self.assertEqual(ilo, fmo.index_list)
@@ -35,8 +57,7 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         client.indices.forcemerge.return_value = None
         client.indices.optimize.return_value = None
         ilo = curator.IndexList(client)
@@ -47,8 +68,7 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         client.info.return_value = {'version': {'number': '2.3.2'} }
         client.indices.optimize.return_value = None
         ilo = curator.IndexList(client)
@@ -59,8 +79,7 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.forcemerge.return_value = None
         ilo = curator.IndexList(client)
@@ -71,8 +90,7 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         client.info.return_value = {'version': {'number': '5.0.0'} }
         client.indices.forcemerge.return_value = None
         ilo = curator.IndexList(client)
@@ -83,8 +101,7 @@ class TestActionForceMerge(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         client.indices.forcemerge.return_value = None
         client.indices.optimize.return_value = None
         client.indices.forcemerge.side_effect = testvars.fake_fail
@@ -92,3 +109,115 @@ class TestActionForceMerge(TestCase):
         ilo = curator.IndexList(client)
         fmo = curator.ForceMerge(ilo, max_num_segments=2)
         self.assertRaises(curator.FailedExecution, fmo.do_action)
+    def test_version_checked_once(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.forcemerge.return_value = None
+        ilo = curator.IndexList(client)
+        ilo.index_info['index-2016.03.03']['segments'] = 100
+        ilo.index_info['index-2016.03.04']['segments'] = 100
+        ilo.data_loaded['segments'].update(ilo.indices)
+        fmo = curator.ForceMerge(ilo, max_num_segments=2)
+        fmo.do_action()
+        self.assertEqual(2, client.indices.forcemerge.call_count)
+        self.assertEqual(1, client.info.call_count)
+
+def routing(node_map):
+    return {
+        'routing_table': { 'indices': dict(
+            (index, { 'shards': { '0': [ { 'node': node } ] } })
+            for index, node in node_map.items()
+        ) }
+    }
+
+class TestForceMergeScheduler(TestCase):
+    def merging_client(self, node_map):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        ilo = curator.IndexList(client)
+        for index in ilo.indices:
+            ilo.index_info[index]['segments'] = 100
+        ilo.data_loaded['segments'].update(ilo.indices)
+        client.cluster.state.return_value = routing(node_map)
+        lock = threading.Lock()
+        both = threading.Event()
+        self.active = []
+        self.peak = 0
+        def forcemerge(index=None, max_num_segments=None):
+            with lock:
+                self.active.append(index)
+                self.peak = max(self.peak, len(self.active))
+                if len(self.active) == 2:
+                    both.set()
+            both.wait(0.2)
+            with lock:
+                self.active.remove(index)
+        client.indices.forcemerge.side_effect = forcemerge
+        return ilo
+    def test_different_nodes_run_together(self):
+        ilo = self.merging_client(
+            {'index-2016.03.03': 'node1', 'index-2016.03.04': 'node2'})
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_concurrent_merges=2)
+        fmo.do_action()
+        self.assertEqual(2, ilo.client.indices.forcemerge.call_count)
+        self.assertEqual(2, self.peak)
+    def test_per_node_limit(self):
+        ilo = self.merging_client(
+            {'index-2016.03.03': 'node1', 'index-2016.03.04': 'node1'})
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_concurrent_merges=2)
+        fmo.do_action()
+        self.assertEqual(2, ilo.client.indices.forcemerge.call_count)
+        self.assertEqual(1, self.peak)
+    def test_raises_exception(self):
+        ilo = self.merging_client(
+            {'index-2016.03.03': 'node1', 'index-2016.03.04': 'node1'})
+        ilo.client.indices.forcemerge.side_effect = testvars.fake_fail
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_concurrent_merges=2)
+        self.assertRaises(curator.FailedExecution, fmo.do_action)
+        self.assertEqual(1, ilo.client.indices.forcemerge.call_count)
+    def test_unschedulable_indices_raise(self):
+        ilo = self.merging_client(
+            {'index-2016.03.03': 'node1', 'index-2016.03.04': 'node2'})
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, max_concurrent_merges=2)
+        fmo.max_merges_per_node = 0
+        self.assertRaises(curator.FailedExecution, fmo.do_action)
+        self.assertEqual(0, ilo.client.indices.forcemerge.call_count)
+    def test_delay_per_node(self):
+        ilo = self.merging_client(
+            {'index-2016.03.03': 'node1', 'index-2016.03.04': 'node1'})
+        spans = []
+        def forcemerge(index=None, max_num_segments=None):
+            spans.append(time.time())
+        ilo.client.indices.forcemerge.side_effect = forcemerge
+        fmo = curator.ForceMerge(
+            ilo, max_num_segments=2, delay=0.1, max_concurrent_merges=2)
+        fmo.do_action()
+        self.assertEqual(2, len(spans))
+        self.assertGreaterEqual(spans[1] - spans[0], 0.1)
+    def test_lost_connection_tracks_segments(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.seg_stats
+        client.indices.forcemerge.side_effect = elasticsearch.ConnectionTimeout(
+            'TIMEOUT', 'timed out', None)
+        ilo = curator.IndexList(client)
+        ilo.filter_forceMerged(max_num_segments=2)
+        fmo = curator.ForceMerge(ilo, max_num_segments=2)
+        client.indices.stats.return_value = testvars.fm_shard_seg_stats
+        self.assertIsNone(fmo.do_action())
+        client.indices.stats.assert_called_with(
+            index=testvars.named_index, metric='segments', level='shards',
+            filter_path=curator.settings.filter_paths()['shard_segment_count']
+        )
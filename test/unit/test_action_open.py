@@ -53,3 +53,29 @@ class TestActionOpen(TestCase):
         ilo = curator.IndexList(client)
         oo = curator.Open(ilo)
         self.assertRaises(curator.FailedExecution, oo.do_action)
+    def test_do_action_batches(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_2_closed
+        client.cluster.state.return_value = testvars.cs_two_closed
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.open.return_value = None
+        recovering = { 'status': 'red', 'initializing_shards': 5 }
+        replicating = { 'status': 'yellow', 'initializing_shards': 5 }
+        recovered = { 'status': 'yellow', 'initializing_shards': 0 }
+        client.cluster.health.side_effect = [
+            # first batch: primaries, then replicas still initializing
+            recovering, replicating, replicating, recovered, recovered,
+            # second batch
+            recovered, recovered,
+        ]
+        ilo = curator.IndexList(client)
+        oo = curator.Open(ilo, batch_size=1)
+        with patch('curator.utils.time.sleep') as sleep:
+            oo.do_action()
+            self.assertEqual(2, sleep.call_count)
+        self.assertEqual(
+            [ilo.indices[0], ilo.indices[1]],
+            [c[1]['index'] for c in client.indices.open.call_args_list]
+        )
+        self.assertEqual(7, client.cluster.health.call_count)
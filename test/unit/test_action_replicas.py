@@ -29,6 +29,15 @@ class TestActionReplicas(TestCase):
         ro = curator.Replicas(ilo, count=2)
         self.assertEqual(ilo, ro.index_list)
         self.assertEqual(client, ro.client)
+    def test_deprecated_timeout(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        ilo = curator.IndexList(client)
+        ro = curator.Replicas(ilo, count=2, timeout=90)
+        self.assertEqual(90, ro.max_wait)
     def test_do_dry_run(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -56,10 +65,46 @@ class TestActionReplicas(TestCase):
         client.cluster.state.return_value = testvars.clu_state_one
         client.indices.stats.return_value = testvars.stats_one
         client.indices.put_settings.return_value = None
-        client.cluster.health.return_value = None
+        client.cluster.health.return_value = {
+            'indices': {
+                testvars.named_index: {
+                    'status': 'green', 'number_of_shards': 2,
+                    'number_of_replicas': 1, 'active_shards': 4,
+                }
+            }
+        }
         ilo = curator.IndexList(client)
         ro = curator.Replicas(ilo, count=1, wait_for_completion=True)
         self.assertIsNone(ro.do_action())
+        client.cluster.health.assert_called_once_with(
+            index=testvars.named_index, level='indices')
+    def test_do_action_batches(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        client.indices.put_settings.return_value = None
+        def health(index, status, active):
+            return {'indices': {
+                index: {
+                    'status': status, 'number_of_shards': 5,
+                    'number_of_replicas': 1, 'active_shards': active,
+                }
+            }}
+        client.cluster.health.side_effect = [
+            health('index-2016.03.03', 'yellow', 7),
+            health('index-2016.03.03', 'green', 10),
+            health('index-2016.03.04', 'green', 10),
+        ]
+        ilo = curator.IndexList(client)
+        ro = curator.Replicas(ilo, count=1, batch_size=1, max_wait=600)
+        with patch('curator.utils.time.sleep'):
+            self.assertIsNone(ro.do_action())
+        self.assertEqual(
+            ['index-2016.03.03', 'index-2016.03.04'],
+            [c[1]['index'] for c in client.indices.put_settings.call_args_list]
+        )
     def test_do_action_raises_exception(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -119,9 +119,43 @@ class TestActionRestore(TestCase):
         client.snapshot.status.return_value = testvars.nosnap_running
         client.snapshot.verify_repository.return_value = testvars.verified_nodes
         client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.return_value = testvars.recovery_done
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         ro = curator.Restore(slo)
         self.assertIsNone(ro.do_action())
+    def test_do_action_polls_recovery(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.side_effect = [
+            {}, testvars.recovery_busy, testvars.recovery_done]
+        client.cluster.state.return_value = testvars.routing_restoring
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(slo)
+        with patch('curator.utils.time.sleep'):
+            ro.do_action()
+        self.assertEqual(3, client.indices.recovery.call_count)
+        self.assertFalse(
+            client.snapshot.restore.call_args[1]['wait_for_completion'])
+    def test_do_action_failed_shard(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.get_settings.return_value = testvars.settings_named
+        client.indices.recovery.return_value = testvars.recovery_busy
+        client.cluster.state.return_value = testvars.routing_restore_failed
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(slo)
+        with patch('curator.utils.time.sleep') as sleep:
+            self.assertRaises(curator.FailedRestore, ro.do_action)
+        self.assertFalse(sleep.called)
     def test_do_action_snap_in_progress(self):
         client = Mock()
         client.snapshot.get.return_value = testvars.snapshots
@@ -142,6 +176,47 @@ class TestActionRestore(TestCase):
         slo = curator.SnapshotList(client, repository=testvars.repo_name)
         ro = curator.Restore(slo, wait_for_completion=False)
         self.assertIsNone(ro.do_action())
+    def test_newest_per_index(self):
+        client = Mock()
+        client.snapshot.get.return_value = {'snapshots': [
+            {
+                'snapshot': name, 'state': 'SUCCESS', 'indices': indices,
+                'start_time_in_millis': start,
+            }
+            for name, start, indices in [
+                ('old', 1422748800000, ['a', 'b']),
+                ('new', 1425168002000, ['b']),
+            ]
+        ]}
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        client.indices.recovery.return_value = dict(
+            (index, { 'shards': [ { 'stage': 'DONE' } ] })
+            for index in ['a', 'b']
+        )
+        client.indices.get_settings.return_value = {'a': {}, 'b': {}}
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        ro = curator.Restore(slo, indices=['*'], newest_per_index=True)
+        self.assertEqual([('old', ['a']), ('new', ['b'])], ro.restores)
+        ro.do_action()
+        self.assertEqual(
+            [('old', ['a']), ('new', ['b'])],
+            [
+                (c[1]['snapshot'], c[1]['body']['indices'])
+                for c in client.snapshot.restore.call_args_list
+            ]
+        )
+    def test_newest_per_index_with_name(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        slo = curator.SnapshotList(client, repository=testvars.repo_name)
+        self.assertRaises(
+            curator.ConfigurationError, curator.Restore, slo,
+            name=testvars.snap_name, indices=['*'], newest_per_index=True
+        )
     def test_do_action_report_on_failure(self):
         client = Mock()
         client.snapshot.get.return_value = testvars.snapshots
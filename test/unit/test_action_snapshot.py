@@ -129,6 +129,22 @@ class TestActionSnapshot(TestCase):
         so = curator.Snapshot(ilo, repository=testvars.repo_name,
             name=testvars.snap_name)
         self.assertIsNone(so.do_action())
+    def test_do_action_max_wait_aborts(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.stats_one
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.get.return_value = testvars.highly_unlikely
+        client.snapshot.status.return_value = testvars.nosnap_running
+        client.snapshot.verify_repository.return_value = testvars.verified_nodes
+        ilo = curator.IndexList(client)
+        so = curator.Snapshot(ilo, repository=testvars.repo_name,
+            name=testvars.snap_name, max_wait=0)
+        self.assertRaises(curator.FailedExecution, so.do_action)
+        client.snapshot.delete.assert_called_once_with(
+            repository=testvars.repo_name, snapshot=testvars.snap_name)
     def test_do_action_raise_snap_in_progress(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -142,8 +158,9 @@ class TestActionSnapshot(TestCase):
         client.snapshot.verify_repository.return_value = testvars.verified_nodes
         ilo = curator.IndexList(client)
         so = curator.Snapshot(ilo, repository=testvars.repo_name,
-            name=testvars.snap_name)
+            name=testvars.snap_name, retry_count=0)
         self.assertRaises(curator.SnapshotInProgress, so.do_action)
+        self.assertFalse(client.snapshot.create.called)
     def test_do_action_no_wait_for_completion(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
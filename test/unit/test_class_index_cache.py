@@ -0,0 +1,163 @@
+from unittest import TestCase
+from mock import Mock, patch
+import os
+import shutil
+import tempfile
+import curator
+# Get test variables and constants from a single source
+from . import testvars as testvars
+
+def versions(state_uuid, changed=None):
+    indices = dict(
+        (index, {'version': 2 if index == changed else 1})
+        for index in testvars.settings_four
+    )
+    return {
+        'version': 10, 'state_uuid': state_uuid,
+        'metadata': {'cluster_uuid': 'cluster', 'indices': indices}
+    }
+
+def cached_client(path, state_uuid='state', changed=None, stats_ttl=300):
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'} }
+    client.indices.get_settings.return_value = testvars.settings_four
+    client.indices.stats.return_value = testvars.stats_four
+    def state(**kwargs):
+        if kwargs['metric'] == 'version,metadata':
+            return versions(state_uuid, changed)
+        return testvars.clu_state_four
+    client.cluster.state.side_effect = state
+    curator.set_index_cache(
+        client, curator.IndexCache(client, path, stats_ttl=stats_ttl))
+    return client
+
+def metadata_calls(client):
+    return [
+        c for c in client.cluster.state.call_args_list
+        if c[1]['metric'] == 'metadata'
+    ]
+
+def validation_calls(client):
+    return [
+        c for c in client.cluster.state.call_args_list
+        if c[1]['metric'] == 'version,metadata'
+    ]
+
+class TestIndexCache(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+    def tearDown(self):
+        shutil.rmtree(self.path)
+    def test_second_run_uses_cache(self):
+        first = cached_client(self.path)
+        curator.IndexList(first)
+        self.assertEqual(1, len(metadata_calls(first)))
+        self.assertEqual(1, first.indices.stats.call_count)
+        second = cached_client(self.path)
+        ilo = curator.IndexList(second)
+        self.assertEqual([], metadata_calls(second))
+        self.assertEqual(0, second.indices.stats.call_count)
+        self.assertEqual(
+            'close', ilo.index_info['c-2016.03.05']['state'])
+        self.assertEqual(
+            testvars.stats_four['indices']['a-2016.03.03']['total']['docs'][
+                'count'],
+            ilo.index_info['a-2016.03.03']['docs']
+        )
+    def test_changed_index_fetched(self):
+        curator.IndexList(cached_client(self.path))
+        second = cached_client(
+            self.path, state_uuid='new', changed='b-2016.03.04')
+        curator.IndexList(second)
+        calls = metadata_calls(second)
+        self.assertEqual(1, len(calls))
+        self.assertEqual('b-2016.03.04', calls[0][1]['index'])
+    def test_stats_expire(self):
+        curator.IndexList(cached_client(self.path, stats_ttl=60))
+        second = cached_client(self.path, stats_ttl=60)
+        with patch('curator.cache.time.time') as now:
+            now.return_value = 2000000000
+            curator.IndexList(second)
+        self.assertEqual([], metadata_calls(second))
+        self.assertEqual(1, second.indices.stats.call_count)
+    def test_no_cluster_uuid(self):
+        client = cached_client(self.path)
+        client.cluster.state.side_effect = None
+        client.cluster.state.return_value = testvars.clu_state_four
+        curator.IndexList(client)
+        self.assertEqual(1, len(metadata_calls(client)))
+        self.assertEqual([], os.listdir(self.path))
+    def test_validated_once(self):
+        client = cached_client(self.path)
+        session = curator.Session({})
+        session.client = client
+        session.index_list(lazy=False)
+        session.index_list().load_data('stats')
+        self.assertEqual(1, len(validation_calls(client)))
+        session.invalidate('close', ['a-2016.03.03'])
+        session.index_list().load_data('metadata')
+        self.assertEqual(2, len(validation_calls(client)))
+
+def snapshot_client(names, running=(), uuid='uuid'):
+    client = Mock()
+    client.info.return_value = {
+        'version': {'number': '5.5.0'}, 'cluster_uuid': 'cluster' }
+    client.snapshot.get_repository.return_value = testvars.test_repo
+    def get(**kwargs):
+        if kwargs['snapshot'] == '_all':
+            return {'snapshots': [
+                {'snapshot': n, 'uuid': uuid + n} for n in names]}
+        return {'snapshots': [
+            {
+                'snapshot': n, 'uuid': uuid + n,
+                'start_time_in_millis': 1422748800000,
+                'end_time_in_millis': 1422748801000,
+                'state': 'IN_PROGRESS' if n in running else 'SUCCESS',
+            }
+            for n in kwargs['snapshot'].split(',')
+        ]}
+    client.snapshot.get.side_effect = get
+    return client
+
+def fetched(client):
+    return [
+        c[1]['snapshot'] for c in client.snapshot.get.call_args_list
+        if c[1]['snapshot'] != '_all'
+    ]
+
+class TestSnapshotCatalog(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+    def tearDown(self):
+        shutil.rmtree(self.path)
+    def snapshot_list(self, client):
+        curator.set_snapshot_catalog(
+            client, curator.SnapshotCatalog(client, self.path))
+        return curator.SnapshotList(client, repository=testvars.repo_name)
+    def test_incremental_sync(self):
+        first = snapshot_client(['snap-1', 'snap-2'])
+        self.snapshot_list(first)
+        self.assertEqual(['snap-1,snap-2'], fetched(first))
+        second = snapshot_client(['snap-2', 'snap-3'])
+        sl = self.snapshot_list(second)
+        self.assertEqual(['snap-3'], fetched(second))
+        self.assertEqual(['snap-2', 'snap-3'], sl.snapshots)
+        self.assertEqual('SUCCESS', sl.snapshot_info['snap-2']['state'])
+    def test_running_snapshot_fetched_again(self):
+        self.snapshot_list(snapshot_client(['snap-1'], running=['snap-1']))
+        second = snapshot_client(['snap-1'])
+        sl = self.snapshot_list(second)
+        self.assertEqual(['snap-1'], fetched(second))
+        self.assertEqual('SUCCESS', sl.snapshot_info['snap-1']['state'])
+    def test_replaced_snapshot_fetched_again(self):
+        self.snapshot_list(snapshot_client(['snap-1', 'snap-2']))
+        second = snapshot_client(['snap-1', 'snap-2'], uuid='new')
+        sl = self.snapshot_list(second)
+        self.assertEqual(['snap-1,snap-2'], fetched(second))
+        self.assertEqual(['snap-1', 'snap-2'], sl.snapshots)
+    def test_no_cluster_uuid(self):
+        client = snapshot_client(['snap-1'])
+        client.info.return_value = {'version': {'number': '5.5.0'} }
+        sl = self.snapshot_list(client)
+        self.assertEqual(['snap-1'], sl.snapshots)
+        self.assertEqual([], os.listdir(self.path))
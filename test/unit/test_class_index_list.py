@@ -64,11 +64,76 @@ class TestIndexListOtherMethods(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         il = curator.IndexList(client)
         il._get_segmentcounts()
         self.assertEqual(71, il.index_info[testvars.named_index]['segments'])
+    def test_has_index(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        il = curator.IndexList(client, lazy=True)
+        self.assertTrue(il.has_index('c-2016.03.05'))
+        il.filter_closed()
+        self.assertFalse(il.has_index('c-2016.03.05'))
+        self.assertNotIn('c-2016.03.05', il)
+        self.assertIn('a-2016.03.03', il)
+        il.indices = ['c-2016.03.05']
+        self.assertTrue(il.has_index('c-2016.03.05'))
+        self.assertFalse(il.has_index('a-2016.03.03'))
+
+class TestIndexListFork(TestCase):
+    def test_fork_shares_data(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        il = curator.IndexList(client, lazy=True)
+        adds = il.fork()
+        removes = il.fork()
+        adds.filter_by_regex(kind='prefix', value='a-')
+        removes.filter_closed()
+        self.assertEqual(['a-2016.03.03'], adds.indices)
+        self.assertEqual(3, len(removes.indices))
+        self.assertEqual(4, len(il.indices))
+        adds.load_data('metadata')
+        self.assertIs(il.index_info, removes.index_info)
+        self.assertEqual(1, client.indices.get_settings.call_count)
+        self.assertEqual(1, client.cluster.state.call_count)
+    def test_fork_name_ages_do_not_leak(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_ts
+        client.cluster.state.return_value = testvars.clu_state_ts
+        il = curator.IndexList(client, lazy=True)
+        dots = il.fork()
+        dashes = il.fork()
+        dots.filter_by_age(source='name', direction='older',
+            timestring='%Y.%m.%d', unit='days', unit_count=1,
+            epoch=1500000000)
+        dashes.filter_by_age(source='name', direction='older',
+            timestring='%Y-%m-%d', unit='days', unit_count=1,
+            epoch=1500000000)
+        self.assertEqual(['logs-2017.01.01'], dots.indices)
+        self.assertEqual(['logs-2017-01-01'], dashes.indices)
+    def test_fork_no_creation_date(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two_no_cd
+        client.cluster.state.return_value = testvars.clu_state_two_no_cd
+        il = curator.IndexList(client, lazy=True)
+        adds = il.fork()
+        removes = il.fork()
+        adds.filter_closed()
+        removes.filter_closed()
+        il.load_data('metadata')
+        self.assertEqual(['index-2016.03.03'], adds.indices)
+        self.assertEqual(['index-2016.03.03'], removes.indices)
+        self.assertEqual(['index-2016.03.03'], il.indices)
+        self.assertEqual(1, client.cluster.state.call_count)
 
 class TestIndexListAgeFilterName(TestCase):
     def test_get_name_based_ages_match(self):
@@ -727,8 +792,7 @@ class TestIndexListFilterForceMerged(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         il = curator.IndexList(client)
         self.assertRaises(curator.MissingArgument, il.filter_forceMerged)
     def test_filter_forcemerge_positive(self):
@@ -736,8 +800,7 @@ class TestIndexListFilterForceMerged(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         il = curator.IndexList(client)
         il.filter_forceMerged(max_num_segments=2)
         self.assertEqual([testvars.named_index], il.indices)
@@ -746,11 +809,42 @@ class TestIndexListFilterForceMerged(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.fm_shards
+        client.indices.stats.return_value = testvars.fm_seg_stats
         il = curator.IndexList(client)
         il.filter_forceMerged(max_num_segments=2)
         self.assertEqual([], il.indices)
+    def test_filter_forcemerge_uses_stats(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.seg_stats
+        il = curator.IndexList(client, lazy=True)
+        il.filter_forceMerged(max_num_segments=2)
+        client.indices.stats.assert_called_once_with(
+            index=testvars.named_index, metric='segments',
+            filter_path='indices.*.total.segments.count'
+        )
+        self.assertFalse(client.indices.segments.called)
+    def test_filter_forcemerge_per_shard_positive(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.shard_seg_stats
+        il = curator.IndexList(client, lazy=True)
+        il.filter_forceMerged(max_num_segments=2, per_shard=True)
+        self.assertEqual([testvars.named_index], il.indices)
+        self.assertEqual(38, il.index_info[testvars.named_index]['segments'])
+    def test_filter_forcemerge_per_shard_negative(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.fm_shard_seg_stats
+        il = curator.IndexList(client, lazy=True)
+        il.filter_forceMerged(max_num_segments=2, per_shard=True)
+        self.assertEqual([], il.indices)
 
 class TestIndexListFilterOpened(TestCase):
     def test_filter_opened(self):
@@ -888,12 +982,23 @@ class TestIterateFiltersIndex(TestCase):
         client.info.return_value = {'version': {'number': '2.4.1'} }
         client.indices.get_settings.return_value = testvars.settings_one
         client.cluster.state.return_value = testvars.clu_state_one
-        client.indices.stats.return_value = testvars.stats_one
-        client.indices.segments.return_value = testvars.shards
+        client.indices.stats.return_value = testvars.seg_stats
         ilo = curator.IndexList(client)
         config = yaml.load(testvars.forcemerge_ft)['actions'][1]
         ilo.iterate_filters(config)
         self.assertEqual([testvars.named_index], ilo.indices)
+    def test_validated_forcemerge_filtertype(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.4.1'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        client.cluster.state.return_value = testvars.clu_state_one
+        client.indices.stats.return_value = testvars.seg_stats
+        ilo = curator.IndexList(client)
+        config = curator.validate_actions(
+            yaml.load(testvars.forcemerge_ft))['actions'][1]
+        self.assertFalse(config['filters'][0]['per_shard'])
+        ilo.iterate_filters(config)
+        self.assertEqual([testvars.named_index], ilo.indices)
     def test_allocated_filtertype(self):
         client = Mock()
         client.info.return_value = {'version': {'number': '2.4.1'} }
@@ -1074,3 +1179,144 @@ class TestIndexListFilterCount(TestCase):
             reverse=False
         )
         self.assertEqual([u'index-2016.03.04'], il.indices)
+
+class TestIndexListLazy(TestCase):
+    def test_init_does_not_fetch(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        client.cluster.state.return_value = testvars.clu_state_two
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, lazy=True)
+        self.assertEqual(
+            ['index-2016.03.03','index-2016.03.04'], sorted(il.indices))
+        self.assertFalse(client.cluster.state.called)
+        self.assertFalse(client.indices.stats.called)
+    def test_metadata_on_demand(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_2_closed
+        client.cluster.state.return_value = testvars.cs_two_closed
+        client.indices.stats.return_value = testvars.stats_two
+        il = curator.IndexList(client, lazy=True)
+        il.filter_closed()
+        self.assertEqual(['index-2016.03.04'], il.indices)
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertFalse(client.indices.stats.called)
+        # A second read does not fetch again
+        il.filter_opened(exclude=False)
+        self.assertEqual(1, client.cluster.state.call_count)
+    def test_only_remaining_indices_fetched(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        il = curator.IndexList(client, lazy=True)
+        il.filter_by_regex(kind='prefix', value='a-')
+        il.load_data('stats')
+        client.cluster.state.assert_called_once_with(
+            index='a-2016.03.03', metric='metadata',
+            filter_path=curator.settings.filter_paths()['index_metadata'])
+        client.indices.stats.assert_called_once_with(
+            index='a-2016.03.03', metric='store,docs')
+        self.assertEqual(
+            testvars.stats_four['indices']['a-2016.03.03']['total']['store']['size_in_bytes'],
+            il.index_info['a-2016.03.03']['size_in_bytes']
+        )
+    def test_load_data_invalid_group(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two
+        il = curator.IndexList(client, lazy=True)
+        self.assertRaises(ValueError, il.load_data, 'not_a_group')
+
+class TestIndexListFilterPlan(TestCase):
+    def test_cheap_filters_first(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        ilo = curator.IndexList(client, lazy=True)
+        filters = [
+            {'filtertype':'forcemerged', 'max_num_segments':2},
+            {'filtertype':'age', 'source':'creation_date'},
+            {'filtertype':'pattern', 'kind':'prefix', 'value':'a'},
+            {'filtertype':'count', 'count':2},
+            {'filtertype':'closed'},
+            {'filtertype':'kibana'},
+        ]
+        self.assertEqual(
+            [2, 1, 0, 3, 5, 4],
+            [pos for pos, f in ilo._plan_filters(filters)]
+        )
+    def test_space_is_a_barrier(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        ilo = curator.IndexList(client, lazy=True)
+        filters = [
+            {'filtertype':'closed'},
+            {'filtertype':'space', 'disk_space':1},
+            {'filtertype':'pattern', 'kind':'prefix', 'value':'a'},
+        ]
+        self.assertEqual(
+            [0, 1, 2], [pos for pos, f in ilo._plan_filters(filters)])
+    def test_pattern_runs_before_closed(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        ilo = curator.IndexList(client, lazy=True)
+        config = {
+            'filters': [
+                {'filtertype':'closed'},
+                {'filtertype':'pattern', 'kind':'prefix', 'value':'a-'},
+            ]
+        }
+        ilo.iterate_filters(config)
+        self.assertEqual(['a-2016.03.03'], ilo.indices)
+        client.cluster.state.assert_called_once_with(
+            index='a-2016.03.03', metric='metadata',
+            filter_path=curator.settings.filter_paths()['index_metadata'])
+    def saved_log(self, lazy):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_four
+        client.cluster.state.return_value = testvars.clu_state_four
+        client.indices.stats.return_value = testvars.stats_four
+        ilo = curator.IndexList(client, lazy=lazy)
+        ilo.loggit = Mock()
+        config = {
+            'filters': [
+                {'filtertype':'closed'},
+                {'filtertype':'pattern', 'kind':'prefix', 'value':'a-'},
+            ]
+        }
+        # One index per chunk, so each index dropped saves a request
+        with patch('curator.indexlist.chunk_index_list',
+                lambda l: [[i] for i in l]):
+            ilo.iterate_filters(config)
+        self.assertEqual(['a-2016.03.03'], ilo.indices)
+        return [
+            c[0][0] for c in ilo.loggit.info.call_args_list
+            if 'saved' in c[0][0]
+        ]
+    def test_savings_when_lazy(self):
+        self.assertEqual(
+            ['Filter plan saved an estimated 3 request(s) to Elasticsearch'],
+            self.saved_log(True)
+        )
+    def test_no_savings_claimed_when_not_lazy(self):
+        self.assertEqual([], self.saved_log(False))
+
+class TestIndexListSearchPattern(TestCase):
+    def test_pattern_is_listed(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_one
+        il = curator.IndexList(client, lazy=True, search_pattern='index-*')
+        self.assertEqual([testvars.named_index], il.indices)
+        client.indices.get_settings.assert_called_once_with(
+            index='index-*', params={'expand_wildcards': 'open,closed'},
+            filter_path=curator.settings.filter_paths()['index_names']
+        )
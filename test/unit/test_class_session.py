@@ -0,0 +1,264 @@
+from unittest import TestCase
+from mock import Mock, patch
+import elasticsearch
+import curator
+from curator.cli import process_action
+# Get test variables and constants from a single source
+from . import testvars as testvars
+
+def four_index_client():
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'} }
+    client.indices.get_settings.return_value = testvars.settings_four
+    client.cluster.state.return_value = testvars.clu_state_four
+    client.indices.stats.return_value = testvars.stats_four
+    return client
+
+class TestSessionIndexList(TestCase):
+    def test_listing_is_shared(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list()
+        session.index_list()
+        self.assertEqual(1, client.indices.get_settings.call_count)
+    def test_metadata_is_shared(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        first = session.index_list()
+        first.load_data('metadata')
+        second = session.index_list()
+        second.load_data('metadata')
+        self.assertEqual(1, client.cluster.state.call_count)
+        self.assertIs(first.index_info, second.index_info)
+    def test_not_lazy(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        ilo = session.index_list(lazy=False)
+        self.assertEqual(
+            testvars.stats_four['indices']['a-2016.03.03']['total']['docs']['count'],
+            ilo.index_info['a-2016.03.03']['docs']
+        )
+
+    def test_pattern_matched_locally(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list()
+        ilo = session.index_list(search_pattern='a-*,.a-*')
+        self.assertEqual(['a-2016.03.03'], ilo.indices)
+        self.assertEqual(1, client.indices.get_settings.call_count)
+    def test_pattern_listing_cached(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list(search_pattern='a-*')
+        session.index_list(search_pattern='a-*')
+        self.assertEqual(1, client.indices.get_settings.call_count)
+
+class TestSessionInvalidate(TestCase):
+    def test_delete_indices(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list().load_data('metadata')
+        session.invalidate('delete_indices', ['a-2016.03.03'])
+        self.assertNotIn('a-2016.03.03', session.index_info)
+        self.assertNotIn('a-2016.03.03', session.data_loaded['metadata'])
+        self.assertEqual(
+            ['b-2016.03.04', 'c-2016.03.05', 'd-2016.03.06'],
+            sorted(session.index_list().indices)
+        )
+        self.assertEqual(1, client.indices.get_settings.call_count)
+    def test_only_affected_indices_reloaded(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list().load_data('metadata')
+        session.invalidate('close', ['a-2016.03.03'])
+        self.assertEqual(
+            set(['b-2016.03.04', 'c-2016.03.05', 'd-2016.03.06']),
+            session.data_loaded['metadata']
+        )
+        session.index_list().load_data('metadata')
+        client.cluster.state.assert_called_with(
+            index='a-2016.03.03', metric='metadata',
+            filter_path=curator.settings.filter_paths()['index_metadata'])
+    def test_create_index(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list()
+        session.invalidate('create_index')
+        session.index_list()
+        self.assertEqual(2, client.indices.get_settings.call_count)
+    def test_restore(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list().load_data('metadata')
+        session.invalidate('restore', ['a-2016.03.03'])
+        self.assertEqual({}, session.index_info)
+        self.assertIsNone(session.all_indices)
+    def test_snapshot_changes_nothing(self):
+        client = four_index_client()
+        session = curator.Session({})
+        session.client = client
+        session.index_list().load_data('metadata')
+        session.invalidate('snapshot', ['a-2016.03.03'])
+        self.assertEqual(4, len(session.data_loaded['metadata']))
+
+class TestSessionClient(TestCase):
+    def test_client_created_once(self):
+        with patch('curator.session.get_client') as get_client:
+            get_client.return_value = Mock()
+            get_client.return_value.transport.connection_pool.connections = []
+            session = curator.Session({'hosts': ['localhost'], 'timeout': 30})
+            session.get_client()
+            session.get_client(timeout=120)
+            get_client.assert_called_once_with(hosts=['localhost'], timeout=30)
+    def test_set_timeout(self):
+        client = Mock()
+        perform = client.transport.perform_request
+        session = curator.Session({})
+        session.client = client
+        session.get_client(timeout=120)
+        client.transport.perform_request('GET', '/', {'filter_path': 'x'})
+        perform.assert_called_with(
+            'GET', '/', params={'filter_path': 'x', 'request_timeout': 120},
+            body=None
+        )
+        session.get_client(timeout=30)
+        client.transport.perform_request('GET', '/')
+        perform.assert_called_with(
+            'GET', '/', params={'request_timeout': 30}, body=None)
+        client.transport.perform_request('GET', '/', {'request_timeout': 5})
+        perform.assert_called_with(
+            'GET', '/', params={'request_timeout': 5}, body=None)
+    def test_timeout_reaches_sniffed_connections(self):
+        timeouts = []
+        class Connection(elasticsearch.Connection):
+            def perform_request(self, method, url, params=None, body=None,
+                    timeout=None, ignore=()):
+                timeouts.append((self.host, timeout))
+                return 200, {}, '{}'
+        client = elasticsearch.Elasticsearch(
+            [{'host': 'a'}], connection_class=Connection)
+        session = curator.Session({})
+        session.client = client
+        session.get_client(timeout=120)
+        client.transport.set_connections([{'host': 'b'}])
+        client.info()
+        self.assertEqual([('http://b:9200', 120)], timeouts)
+
+class TestSessionProcessAction(TestCase):
+    def delete_config(self):
+        return {
+            'action': 'delete_indices',
+            'options': {},
+            'filters': [],
+        }
+    def remaining(self, names):
+        def state(**kwargs):
+            if kwargs.get('filter_path') == \
+                    curator.settings.filter_paths()['index_state']:
+                found = dict((i, {'state': 'open'}) for i in names)
+                return {'metadata': {'indices': found}} if found else {}
+            return testvars.clu_state_four
+        return state
+    def test_partial_delete(self):
+        client = four_index_client()
+        client.cluster.state.side_effect = self.remaining(['a-2016.03.03'])
+        session = curator.Session({})
+        session.client = client
+        with patch('curator.IndexList.iterate_filters') as iterate:
+            iterate.side_effect = lambda config: None
+            process_action(
+                client, self.delete_config(), session=session)
+        self.assertEqual(3, client.indices.delete.call_count)
+        self.assertEqual(
+            ['a-2016.03.03'], sorted(session.index_list().indices))
+        self.assertEqual(1, client.indices.get_settings.call_count)
+    def test_failed_delete(self):
+        client = four_index_client()
+        client.indices.delete.side_effect = Exception('failed')
+        session = curator.Session({})
+        session.client = client
+        with patch('curator.IndexList.iterate_filters') as iterate:
+            iterate.side_effect = lambda config: None
+            self.assertRaises(
+                curator.FailedExecution,
+                process_action,
+                client, self.delete_config(), session=session
+            )
+        self.assertEqual(4, len(session.index_list().indices))
+        self.assertEqual(2, client.indices.get_settings.call_count)
+    def close_config(self, timestring):
+        return {
+            'action': 'close',
+            'options': {},
+            'filters': [
+                {
+                    'filtertype': 'age', 'source': 'name',
+                    'direction': 'older', 'timestring': timestring,
+                    'unit': 'days', 'unit_count': 1, 'epoch': 1500000000,
+                },
+            ],
+        }
+    def test_name_ages_not_shared(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_ts
+        client.cluster.state.return_value = testvars.clu_state_ts
+        session = curator.Session({})
+        session.client = client
+        with patch('curator.Close.do_dry_run', autospec=True) as dry_run:
+            process_action(
+                client, self.close_config('%Y.%m.%d'), session=session,
+                dry_run=True
+            )
+            process_action(
+                client, self.close_config('%Y-%m-%d'), session=session,
+                dry_run=True
+            )
+        self.assertEqual(
+            ['logs-2017.01.01'], dry_run.call_args_list[0][0][0].index_list.indices)
+        self.assertEqual(
+            ['logs-2017-01-01'], dry_run.call_args_list[1][0][0].index_list.indices)
+        session.index_list()
+        self.assertNotIn('name', session.index_info['logs-2017-01-01']['age'])
+    def test_no_creation_date_excluded_by_every_action(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two_no_cd
+        client.cluster.state.return_value = testvars.clu_state_two_no_cd
+        session = curator.Session({})
+        session.client = client
+        def config():
+            return {
+                'action': 'close',
+                'options': {},
+                'filters': [{'filtertype': 'closed'}],
+            }
+        with patch('curator.Close.do_dry_run', autospec=True) as dry_run:
+            process_action(client, config(), session=session, dry_run=True)
+            process_action(client, config(), session=session, dry_run=True)
+        for call in dry_run.call_args_list:
+            self.assertEqual(
+                ['index-2016.03.03'], call[0][0].index_list.indices)
+        self.assertEqual(1, client.cluster.state.call_count)
+    def test_no_creation_date_excluded_from_fork(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.indices.get_settings.return_value = testvars.settings_two_no_cd
+        client.cluster.state.return_value = testvars.clu_state_two_no_cd
+        session = curator.Session({})
+        session.client = client
+        first = session.index_list()
+        forked = first.fork()
+        first.load_data('metadata')
+        forked.load_data('metadata')
+        self.assertEqual(['index-2016.03.03'], forked.indices)
+        self.assertEqual(1, client.cluster.state.call_count)
@@ -27,11 +27,87 @@ class TestSnapshotListClientAndInit(TestCase):
         client.snapshot.get.return_value = testvars.snapshots
         client.snapshot.get_repository.return_value = testvars.test_repo
         sl = curator.SnapshotList(client, repository=testvars.repo_name)
-        self.assertEqual(testvars.snapshots['snapshots'],sl.all_snapshots)
+        self.assertEqual('SUCCESS', sl.snapshot_info['snap_name']['state'])
         self.assertEqual(
             ['snap_name','snapshot-2015.03.01'], sorted(sl.snapshots)
         )
 
+class TestSnapshotListCatalog(TestCase):
+    def catalog(self):
+        return {'snapshots': [
+            dict(
+                (k, v) for k, v in snap.items()
+                if k in ['snapshot', 'state', 'start_time_in_millis',
+                    'end_time_in_millis']
+            )
+            for snap in testvars.snapshots['snapshots']
+        ]}
+    def test_indices_not_fetched(self):
+        client = Mock()
+        client.snapshot.get.return_value = self.catalog()
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        client.snapshot.get.assert_called_once_with(
+            repository=testvars.repo_name, snapshot='_all',
+            filter_path=curator.settings.filter_paths()['snapshot_catalog']
+        )
+        self.assertIsNone(sl.snapshot_info['snap_name'].indices)
+        self.assertIn('indices', sl.snapshot_info['snap_name'])
+        self.assertEqual(1, client.snapshot.get.call_count)
+    def test_raw_keys(self):
+        client = Mock()
+        client.snapshot.get.return_value = self.catalog()
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        client.snapshot.get.return_value = {'snapshots': [
+            {'snapshot': 'snap_name', 'indices': testvars.named_indices}]}
+        record = sl.snapshot_info['snap_name']
+        self.assertEqual('SUCCESS', record['state'])
+        self.assertEqual(1422748800, record['start_time_in_millis'])
+        self.assertEqual(testvars.named_indices, record['indices'])
+        self.assertEqual(testvars.named_indices, record.get('indices'))
+        self.assertIsNone(record.get('uuid'))
+        self.assertRaises(KeyError, lambda: record['snapshot_list'])
+    def test_snapshot_indices_lazy(self):
+        client = Mock()
+        client.snapshot.get.return_value = self.catalog()
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        client.snapshot.get.return_value = {'snapshots': [
+            {'snapshot': 'snap_name', 'indices': testvars.named_indices}]}
+        self.assertEqual(
+            testvars.named_indices, sl.snapshot_indices('snap_name'))
+        self.assertEqual(
+            testvars.named_indices, sl.snapshot_indices('snap_name'))
+        self.assertEqual(2, client.snapshot.get.call_count)
+    def test_index_names_interned(self):
+        client = Mock()
+        client.snapshot.get.return_value = testvars.snapshots
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        self.assertEqual(sorted(testvars.named_indices), sorted(sl.index_names))
+        self.assertEqual(
+            list(sl.snapshot_info['snap_name'].indices),
+            list(sl.snapshot_info['snapshot-2015.03.01'].indices)
+        )
+    def test_all_snapshots(self):
+        client = Mock()
+        client.snapshot.get.return_value = self.catalog()
+        client.snapshot.get_repository.return_value = testvars.test_repo
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        client.snapshot.get.return_value = testvars.snapshots
+        self.assertEqual(
+            [
+                dict(
+                    (k, v) for k, v in snap.items()
+                    if k in ['snapshot', 'state', 'start_time_in_millis',
+                        'end_time_in_millis', 'indices']
+                )
+                for snap in testvars.snapshots['snapshots']
+            ],
+            sl.all_snapshots
+        )
+
 class TestSnapshotListOtherMethods(TestCase):
     def test_empty_list(self):
         client = Mock()
@@ -91,6 +167,63 @@ class TestSnapshotListStateFilter(TestCase):
         sl = curator.SnapshotList(client, repository=testvars.repo_name)
         self.assertRaises(ValueError, sl.filter_by_state, state='invalid')
 
+def indexed_client():
+    client = Mock()
+    client.snapshot.get_repository.return_value = testvars.test_repo
+    client.snapshot.get.return_value = {'snapshots': [
+        {
+            'snapshot': 'snap-{0}'.format(n), 'state': 'SUCCESS',
+            'start_time_in_millis': 1422748800000 + n,
+            'indices': indices,
+        }
+        for n, indices in enumerate([
+            ['logs-1', 'metrics-1'], ['logs-1', 'logs-2'], ['metrics-2'],
+        ])
+    ]}
+    return client
+
+class TestSnapshotListIndicesFilter(TestCase):
+    def test_any(self):
+        sl = curator.SnapshotList(indexed_client(), repository=testvars.repo_name)
+        sl.filter_by_indices(indices=['logs-2', 'metrics-*'])
+        self.assertEqual(['snap-0', 'snap-1', 'snap-2'], sorted(sl.snapshots))
+    def test_all(self):
+        sl = curator.SnapshotList(indexed_client(), repository=testvars.repo_name)
+        sl.filter_by_indices(indices=['logs-*', 'metrics-1'], match='all')
+        self.assertEqual(['snap-0'], sl.snapshots)
+    def test_exclude(self):
+        sl = curator.SnapshotList(indexed_client(), repository=testvars.repo_name)
+        sl.filter_by_indices(indices='logs-1', exclude=True)
+        self.assertEqual(['snap-2'], sl.snapshots)
+    def test_no_indices(self):
+        sl = curator.SnapshotList(indexed_client(), repository=testvars.repo_name)
+        self.assertRaises(curator.MissingArgument, sl.filter_by_indices)
+    def test_index_map_loaded_once(self):
+        client = indexed_client()
+        client.snapshot.get.return_value = {'snapshots': [
+            dict((k, v) for k, v in s.items() if k != 'indices')
+            for s in client.snapshot.get.return_value['snapshots']
+        ]}
+        sl = curator.SnapshotList(client, repository=testvars.repo_name)
+        client.snapshot.get.return_value = indexed_client().snapshot.get(
+            repository=testvars.repo_name, snapshot='_all')
+        sl.filter_by_indices(indices=['logs-1'])
+        sl.filter_by_indices(indices=['logs-2'])
+        self.assertEqual(['snap-1'], sl.snapshots)
+        self.assertEqual(2, client.snapshot.get.call_count)
+        client.snapshot.get.assert_called_with(
+            repository=testvars.repo_name, snapshot='_all',
+            filter_path=curator.settings.filter_paths()['snapshot_indices']
+        )
+    def test_newest_snapshots(self):
+        sl = curator.SnapshotList(indexed_client(), repository=testvars.repo_name)
+        self.assertEqual(
+            {'logs-1': 'snap-1', 'logs-2': 'snap-1'},
+            sl.newest_snapshots(['logs-*'])
+        )
+        sl.snapshots = ['snap-0', 'snap-2']
+        self.assertEqual({'logs-1': 'snap-0'}, sl.newest_snapshots(['logs-*']))
+
 class TestSnapshotListRegexFilters(TestCase):
     def test_filter_by_regex_prefix(self):
         client = Mock()
@@ -385,4 +518,42 @@ class TestSnapshotListFilterCount(TestCase):
         slo.age_keyfield = 'invalid'
         snaps = slo.snapshots
         slo._sort_by_age(snaps)
-        self.assertEqual(['snapshot-2015.03.01'], slo.snapshots)
+        self.assertEqual([], slo.snapshots)
+
+def repositories_client():
+    client = Mock()
+    client.info.return_value = {'version': {'number': '5.0.0'} }
+    client.snapshot.get_repository.return_value = {
+        'repo-a': {'type': 'fs'}, 'repo-b': {'type': 'fs'},
+        'repo-c': {'type': 'fs'},
+    }
+    def get(**kwargs):
+        if kwargs['repository'] == 'repo-c':
+            return {'snapshots': []}
+        return testvars.snapshots
+    client.snapshot.get.side_effect = get
+    return client
+
+class TestSnapshotLists(TestCase):
+    def test_per_repository(self):
+        client = repositories_client()
+        slos = curator.snapshot_lists(client, 'repo-*')
+        client.snapshot.get_repository.assert_any_call(repository='repo-*')
+        self.assertEqual(['repo-a', 'repo-b'], [s.repository for s in slos])
+        self.assertEqual(
+            ['snap_name', 'snapshot-2015.03.01'], sorted(slos[0].snapshots))
+    def test_filters_per_repository(self):
+        client = repositories_client()
+        filters = {'filters': [
+            {'filtertype': 'pattern', 'kind': 'prefix', 'value': 'snap_'}]}
+        with patch('curator.SnapshotList.iterate_filters') as iterate:
+            curator.snapshot_lists(client, ['repo-a', 'repo-b'], filters)
+        self.assertEqual(2, iterate.call_count)
+        for c in iterate.call_args_list:
+            self.assertEqual(filters, c[0][0])
+            self.assertIsNot(filters, c[0][0])
+    def test_no_repositories(self):
+        client = repositories_client()
+        client.snapshot.get_repository.return_value = {}
+        self.assertRaises(
+            curator.FailedExecution, curator.snapshot_lists, client, 'none-*')
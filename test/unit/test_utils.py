@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
 from unittest import TestCase
-from mock import Mock
+from mock import Mock, patch
 import elasticsearch
+import threading
+import time
 import yaml
 from . import testvars as testvars
 
@@ -76,6 +78,72 @@ class TestGetVersion(TestCase):
         version = curator.get_version(client)
         self.assertEqual(version, (9,9,9))
 
+class TestGetCapabilities(TestCase):
+    def test_version_cached(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.1.1'} }
+        for _ in range(5):
+            self.assertEqual((5,1,1), curator.get_version(client))
+        self.assertEqual(1, client.info.call_count)
+    def test_features(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '2.0.2'} }
+        self.assertFalse(curator.has_feature(client, 'forcemerge'))
+    def test_node_info_cached(self):
+        client = Mock()
+        client.nodes.info.return_value = {
+            'nodes': { "foo" : { 'plugins': [ { 'name': 'repository-s3' } ] } }
+        }
+        client.cluster.state.return_value = { "master_node" : "foo" }
+        curator.is_master_node(client)
+        info = curator.get_node_info(client)
+        self.assertEqual(['repository-s3'], info['plugins'])
+        self.assertEqual(1, client.nodes.info.call_count)
+    def test_master_node_read_again(self):
+        client = Mock()
+        client.nodes.info.return_value = { 'nodes': { "foo" : {} } }
+        client.cluster.state.return_value = { "master_node" : "foo" }
+        self.assertTrue(curator.is_master_node(client))
+        client.cluster.state.return_value = { "master_node" : "bar" }
+        self.assertFalse(curator.is_master_node(client))
+        self.assertEqual(1, client.nodes.info.call_count)
+    def test_filled_by_get_client(self):
+        client = Mock()
+        client.info.return_value = {'version': {'number': '5.0.0'} }
+        client.nodes.info.return_value = { 'nodes': { "foo" : {} } }
+        client.transport.connection_pool.connections = []
+        with patch('curator.utils.elasticsearch.Elasticsearch') as es:
+            es.return_value = client
+            curator.get_client(hosts=['localhost'])
+        info = curator.get_capabilities(client)
+        self.assertEqual((5,0,0), info['version'])
+        self.assertEqual('foo', info['node_id'])
+        self.assertEqual([], info['plugins'])
+        self.assertFalse(client.cluster.state.called)
+
+class TestWaitForIt(TestCase):
+    def test_connection_error_retried(self):
+        check = Mock(side_effect=[
+            elasticsearch.ConnectionError('N/A', 'dropped', None), True])
+        with patch('curator.utils.time.sleep') as sleep:
+            curator.wait_for_it(check, 'test', wait_interval=5)
+            sleep.assert_called_once_with(5)
+        self.assertEqual(2, check.call_count)
+    def test_backoff(self):
+        check = Mock(side_effect=[False, False, False, False, True])
+        with patch('curator.utils.time.sleep') as sleep:
+            curator.wait_for_it(check, 'test', wait_interval=20)
+            self.assertEqual(
+                [20, 40, 60, 60], [c[0][0] for c in sleep.call_args_list])
+    def test_max_wait_cancels(self):
+        check = Mock(return_value=False)
+        cancel = Mock()
+        self.assertRaises(
+            curator.ActionTimeout, curator.wait_for_it, check, 'test',
+            wait_interval=1, max_wait=0, cancel=cancel
+        )
+        cancel.assert_called_once_with()
+
 class TestIsMasterNode(TestCase):
     def test_positive(self):
         client = Mock()
@@ -171,6 +239,174 @@ class TestChunkIndexList(TestCase):
     def test_small_list(self):
         self.assertEqual(1, len(curator.chunk_index_list(['short','list','of','indices'])))
 
+class TestChunkRequests(TestCase):
+    def test_default_is_serial(self):
+        client = Mock()
+        self.assertEqual(1, curator.get_max_concurrent_requests(client))
+        self.assertEqual(
+            ['a', 'b'], curator.chunk_requests(client, lambda l: l[0], [['a'], ['b']]))
+    def test_concurrent_keeps_order(self):
+        client = Mock()
+        curator.set_max_concurrent_requests(client, 4)
+        chunks = [[str(x)] for x in range(20)]
+        self.assertEqual(
+            [str(x) for x in range(20)],
+            curator.chunk_requests(client, lambda l: l[0], chunks)
+        )
+    def test_error_cancels_remaining(self):
+        client = Mock()
+        curator.set_max_concurrent_requests(client, 2)
+        calls = []
+        def request(l):
+            calls.append(l[0])
+            if l[0] == 0:
+                raise elasticsearch.TransportError(500, 'boom')
+            return l[0]
+        self.assertRaises(
+            elasticsearch.TransportError,
+            curator.chunk_requests, client, request, [[x] for x in range(50)]
+        )
+        self.assertTrue(len(calls) < 50)
+
+class TestExecuteChunks(TestCase):
+    def test_retries_busy_chunk(self):
+        client = Mock()
+        request = Mock(side_effect=[
+            elasticsearch.TransportError(503, 'busy'), 'a', 'b'])
+        with patch('curator.utils.time.sleep') as sleep:
+            self.assertEqual(
+                ['a', 'b'],
+                curator.execute_chunks(client, request, [['a'], ['b']], 'test')
+            )
+            sleep.assert_called_once_with(1)
+    def test_errors_aggregated(self):
+        client = Mock()
+        curator.set_max_concurrent_requests(client, 2)
+        calls = []
+        def request(l):
+            calls.append(l[0])
+            if l[0] % 10 == 0:
+                raise elasticsearch.TransportError(400, 'bad request')
+            return l[0]
+        try:
+            curator.execute_chunks(
+                client, request, [[x] for x in range(50)], 'test')
+            self.fail('FailedExecution not raised')
+        except curator.FailedExecution as e:
+            self.assertIn('5 of 50', str(e))
+        self.assertEqual(50, len(calls))
+    def test_master_requests_serialized(self):
+        client = Mock()
+        curator.set_max_concurrent_requests(client, 4)
+        lock = threading.Lock()
+        active = []
+        peak = []
+        def request(l):
+            with curator.master_request(client):
+                with lock:
+                    active.append(l)
+                    peak.append(len(active))
+                time.sleep(0.01)
+                with lock:
+                    active.remove(l)
+        curator.execute_chunks(client, request, [[x] for x in range(8)], 'test')
+        self.assertEqual(1, max(peak))
+
+class TestResponseSizes(TestCase):
+    def test_api_name(self):
+        self.assertEqual(
+            '_cluster/state', curator.utils._api_name(
+                '/_cluster/state/metadata/index-1,index-2'))
+        self.assertEqual('_settings', curator.utils._api_name('/index-1/_settings'))
+        self.assertEqual('info', curator.utils._api_name('/'))
+    def test_counts(self):
+        conn = Mock()
+        conn.perform_request.return_value = (200, {}, '{"a":1}')
+        client = Mock()
+        client.transport.connection_pool.connections = [conn]
+        curator.count_response_sizes(client)
+        conn.perform_request('GET', '/_all/_settings', {'filter_path': 'x'}, None)
+        conn.perform_request('GET', '/_all/_settings', {'filter_path': 'x'}, None)
+        conn.perform_request('GET', '/_cluster/state/metadata', {}, None)
+        counts = curator.get_response_sizes(client)
+        self.assertEqual(
+            {'requests': 2, 'bytes': 14}, counts[('_settings', True)])
+        self.assertEqual(
+            {'requests': 1, 'bytes': 7}, counts[('_cluster/state', False)])
+    def test_sniffed_connections_counted(self):
+        class Connection(elasticsearch.Connection):
+            def perform_request(self, method, url, params=None, body=None,
+                    timeout=None, ignore=()):
+                return 200, {}, '{"a":1}'
+        client = elasticsearch.Elasticsearch(
+            [{'host': 'a'}], connection_class=Connection)
+        curator.count_response_sizes(client)
+        client.info()
+        client.transport.set_connections([{'host': 'a'}, {'host': 'b'}])
+        for _ in range(4):
+            client.info()
+        self.assertEqual(
+            {('info', False): {'requests': 5, 'bytes': 35}},
+            curator.get_response_sizes(client)
+        )
+    def test_log_does_not_claim_savings(self):
+        conn = Mock()
+        conn.perform_request.return_value = (200, {}, '{"a":1}')
+        client = Mock()
+        client.transport.connection_pool.connections = [conn]
+        curator.count_response_sizes(client)
+        conn.perform_request('GET', '/_all/_settings', {'filter_path': 'x'}, None)
+        with patch.object(curator.utils.logger, 'info') as info:
+            curator.log_response_sizes(client)
+        info.assert_called_once_with(
+            'Received 7.0B in 1 _settings response(s) requested with '
+            'filter_path'
+        )
+    def test_no_counters(self):
+        self.assertEqual({}, curator.get_response_sizes(Mock()))
+
+class TestGetSearchPattern(TestCase):
+    def test_no_filters(self):
+        self.assertEqual('_all', curator.get_search_pattern([]))
+    def test_prefix(self):
+        f = [{'filtertype':'pattern', 'kind':'prefix', 'value':'logstash-'}]
+        self.assertEqual('logstash-*', curator.get_search_pattern(f))
+    def test_prefix_stops_at_regex(self):
+        f = [{'filtertype':'pattern', 'kind':'prefix', 'value':'logs?tash'}]
+        self.assertEqual('log*', curator.get_search_pattern(f))
+    def test_prefix_and_suffix(self):
+        f = [
+            {'filtertype':'age', 'source':'creation_date'},
+            {'filtertype':'pattern', 'kind':'suffix', 'value':'-prod'},
+            {'filtertype':'pattern', 'kind':'prefix', 'value':'app-'},
+        ]
+        self.assertEqual('app-*-prod', curator.get_search_pattern(f))
+    def test_suffix_covers_dot_indices(self):
+        f = [{'filtertype':'pattern', 'kind':'suffix', 'value':'-prod'}]
+        self.assertEqual('*-prod,.*-prod', curator.get_search_pattern(f))
+    def test_timestring(self):
+        f = [{'filtertype':'pattern', 'kind':'timestring', 'value':'%Y.%m.%d'}]
+        self.assertEqual('*.*.*,.*.*.*', curator.get_search_pattern(f))
+    def test_exclude_not_pushed(self):
+        f = [{'filtertype':'pattern', 'kind':'prefix', 'value':'a-',
+            'exclude':True}]
+        self.assertEqual('_all', curator.get_search_pattern(f))
+    def test_regex_not_pushed(self):
+        f = [{'filtertype':'pattern', 'kind':'regex', 'value':'^a-.*$'}]
+        self.assertEqual('_all', curator.get_search_pattern(f))
+    def test_alternation_not_pushed(self):
+        f = [{'filtertype':'pattern', 'kind':'prefix', 'value':'a-|b-'}]
+        self.assertEqual('_all', curator.get_search_pattern(f))
+    def test_not_past_count(self):
+        f = [
+            {'filtertype':'count', 'count':2},
+            {'filtertype':'pattern', 'kind':'prefix', 'value':'a-'},
+        ]
+        self.assertEqual('_all', curator.get_search_pattern(f))
+    def test_leading_dash(self):
+        f = [{'filtertype':'pattern', 'kind':'prefix', 'value':'-a'}]
+        self.assertEqual('_all', curator.get_search_pattern(f))
+
 class TestGetIndices(TestCase):
     def test_client_exception(self):
         client = Mock()
@@ -545,8 +781,7 @@ class TestSafeToSnap(TestCase):
         )
     def test_in_progress_fail(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.inprogress
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.snap_running
         self.assertFalse(
             curator.safe_to_snap(
                 client, repository=testvars.repo_name,
@@ -555,8 +790,7 @@ class TestSafeToSnap(TestCase):
         )
     def test_in_progress_pass(self):
         client = Mock()
-        client.snapshot.get.return_value = testvars.snapshots
-        client.snapshot.get_repository.return_value = testvars.test_repo
+        client.snapshot.status.return_value = testvars.nosnap_running
         self.assertTrue(
             curator.safe_to_snap(
                 client, repository=testvars.repo_name,
@@ -564,6 +798,30 @@ class TestSafeToSnap(TestCase):
             )
         )
 
+class TestSnapshotQueue(TestCase):
+    def test_first_in_first_out(self):
+        client = Mock()
+        client.snapshot.status.return_value = testvars.nosnap_running
+        order = []
+        def second():
+            with curator.snapshot_queue(client):
+                order.append('second')
+        with curator.snapshot_queue(client):
+            waiter = threading.Thread(target=second)
+            waiter.start()
+            # The second caller is queued behind the first
+            waiter.join(0.1)
+            order.append('first')
+        waiter.join()
+        self.assertEqual(['first', 'second'], order)
+    def test_max_wait(self):
+        client = Mock()
+        client.snapshot.status.return_value = testvars.snap_running
+        def enter():
+            with curator.snapshot_queue(client, max_wait=0):
+                pass
+        self.assertRaises(curator.ActionTimeout, enter)
+
 class TestSnapshotRunning(TestCase):
     def test_true(self):
         client = Mock()
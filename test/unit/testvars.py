@@ -54,6 +54,31 @@ test_repos     = {'TESTING': {'type': 'fs', 'settings': {'compress': 'true', 'lo
                   repo_name: {'type': 'fs', 'settings': {'compress': 'true', 'location': '/rmp/repos/repo_name'}}}
 snap_running   = { 'snapshots': ['running'] }
 nosnap_running = { 'snapshots': [] }
+cluster_health = { 'status': 'green', 'relocating_shards': 0 }
+relocating     = { 'status': 'green', 'relocating_shards': 2 }
+allocation_nodes = { 'nodes': {
+    'old_node': { 'name': 'old', 'attributes': { 'key': 'other' } },
+    'new_node': { 'name': 'new', 'attributes': { 'key': 'value' } },
+} }
+recovery_done  = dict(
+    (index, { 'shards': [ { 'stage': 'DONE' } ] }) for index in named_indices)
+recovery_busy  = dict(
+    (index, { 'shards': [ { 'stage': 'INDEX' } ] }) for index in named_indices)
+routing_restoring = { 'routing_table': { 'indices': dict(
+    (index, { 'shards': { '0': [ { 'primary': True } ] } })
+    for index in named_indices) } }
+routing_restore_failed = { 'routing_table': { 'indices': {
+    named_indices[0]: { 'shards': { '0': [
+        { 'primary': True },
+        { 'primary': False, 'unassigned_info': { 'reason': 'NODE_LEFT' } },
+    ] } },
+    named_indices[1]: { 'shards': { '0': [
+        {
+            'primary': True,
+            'unassigned_info': { 'reason': 'ALLOCATION_FAILED' }
+        },
+    ] } },
+} } }
 snapshot       = { 'snapshots': [
                     {
                         'duration_in_millis': 60000, 'start_time': '2015-02-01T00:00:00.000Z',
@@ -387,6 +412,38 @@ clu_state_four = {
     }
 }
 
+settings_ts    = {
+    u'logs-2017.01.01': {
+        u'state': u'open',
+        u'aliases': [],
+        u'mappings': {},
+        u'settings': {
+            u'index': {
+                u'number_of_replicas': u'1', u'uuid': u'random_uuid_string_here',
+                u'number_of_shards': u'5', u'creation_date': u'1483228800172',
+                u'version': {u'created': u'2020099'}, u'refresh_interval': u'5s'
+            }
+        }
+    },
+    u'logs-2017-01-01': {
+        u'state': u'open',
+        u'aliases': [],
+        u'mappings': {},
+        u'settings': {
+            u'index': {
+                u'number_of_replicas': u'1', u'uuid': u'another_random_uuid_string',
+                u'number_of_shards': u'5', u'creation_date': u'1483228800812',
+                u'version': {u'created': u'2020099'}, u'refresh_interval': u'5s'
+            }
+        }
+    }
+}
+clu_state_ts   = {
+    u'metadata': {
+        u'indices': settings_ts
+    }
+}
+
 stats_one      = {
     u'indices': {
         named_index : {
@@ -549,6 +606,18 @@ shards         = { 'indices': { named_index: { 'shards': {
 fm_shards      = { 'indices': { named_index: { 'shards': {
         '0': [ { 'num_search_segments' : 1 }, { 'num_search_segments' : 1 } ],
         '1': [ { 'num_search_segments' : 1 }, { 'num_search_segments' : 1 } ] }}}}
+seg_stats      = { 'indices': { named_index: { 'total': {
+        'docs': {'count': 6374962}, 'store': {'size_in_bytes': 1115219663},
+        'segments': {'count': 71} }}}}
+fm_seg_stats   = { 'indices': { named_index: { 'total': {
+        'docs': {'count': 6374962}, 'store': {'size_in_bytes': 1115219663},
+        'segments': {'count': 4} }}}}
+shard_seg_stats = { 'indices': { named_index: { 'shards': {
+        '0': [ { 'segments': {'count': 15} }, { 'segments': {'count': 21} } ],
+        '1': [ { 'segments': {'count': 1} }, { 'segments': {'count': 1} } ] }}}}
+fm_shard_seg_stats = { 'indices': { named_index: { 'shards': {
+        '0': [ { 'segments': {'count': 1} }, { 'segments': {'count': 2} } ],
+        '1': [ { 'segments': {'count': 1} }, { 'segments': {'count': 1} } ] }}}}
 
 loginfo        =    {   "loglevel": "INFO",
                         "logfile": None,